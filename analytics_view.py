@@ -0,0 +1,151 @@
+"""
+Widget de visualización de métricas del grafo
+"""
+import html
+from typing import List
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLabel,
+    QScrollArea,
+)
+
+# Cantidad máxima de elementos a listar en cada sección
+MAX_LISTED_ITEMS = 15
+
+
+# -----------------------
+# AnalyticsWidget
+# -----------------------
+class AnalyticsWidget(QWidget):
+    """Panel que muestra grados, componentes, orden topológico y PageRank del grafo"""
+
+    def __init__(self, scene, analytics, parent=None):
+        super().__init__(parent)
+        self.scene = scene  # Referencia a la escena del grafo
+        self.analytics = analytics  # Servicio de métricas con caché
+        self.layout = QVBoxLayout(self)
+
+        # Fila de controles
+        hl = QHBoxLayout()
+        self.btn_refresh = QPushButton("Recalcular")
+        hl.addWidget(self.btn_refresh); hl.addStretch()
+        self.layout.addLayout(hl)
+
+        # Texto con los resultados dentro de un área desplazable
+        self.results_label = QLabel()
+        self.results_label.setTextFormat(Qt.RichText)
+        self.results_label.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.results_label.setWordWrap(True)
+        self.results_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.results_label.setStyleSheet("QLabel { padding: 10px; font-family: 'Segoe UI', Arial; font-size: 12px; color: #2c3e50; }")
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.results_label)
+        self.layout.addWidget(scroll)
+
+        # Agrupar cambios seguidos del grafo en un solo recálculo
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        self.btn_refresh.clicked.connect(self.refresh)
+        scene.graph_changed.connect(self._schedule_refresh)
+        analytics.result_ready.connect(self._on_result_ready)
+
+    def showEvent(self, event):
+        """Actualiza los resultados al mostrar la pestaña"""
+        super().showEvent(event)
+        self.refresh()
+
+    def _schedule_refresh(self):
+        """Programa un recálculo solo si el panel está visible"""
+        if self.isVisible():
+            self._refresh_timer.start()
+
+    def _on_result_ready(self, metric: str, arg):
+        """Redibuja cuando llega una métrica calculada en segundo plano"""
+        if arg is None and self.isVisible():
+            self._render()
+
+    def refresh(self):
+        """Solicita todas las métricas (las que falten se calculan en segundo plano)"""
+        for metric in ("degree", "scc", "topological", "pagerank"):
+            self.analytics.request(metric)
+        self._render()
+
+    def _node_text(self, nid) -> str:
+        """Formato 'id (etiqueta)' para listar nodos"""
+        node = self.scene.node_items.get(nid)
+        return f"{nid} ({node.label})" if node is not None else str(nid)
+
+    def _pending_text(self, metric: str) -> str:
+        """Texto de una métrica sin resultado: el error si el cálculo falló, si no 'calculando...'"""
+        exc = self.analytics.error(metric)
+        if exc is None:
+            return "<i>calculando...</i>"
+        return f"<div style='color: #c0392b;'>Error al calcular: {html.escape(str(exc) or type(exc).__name__)}</div>"
+
+    def _render(self):
+        """Construye el HTML con los resultados disponibles"""
+        G = self.scene.G
+        lines: List[str] = [
+            f"<div style='font-size: 14px; margin-bottom: 8px;'><b>Nodos:</b> {G.number_of_nodes()} — "
+            f"<b>Aristas:</b> {G.number_of_edges()}</div>"
+        ]
+
+        # Distribución de grados
+        deg = self.analytics.cached("degree")
+        lines.append("<h3>Distribución de grados</h3>")
+        if deg is None:
+            lines.append(self._pending_text("degree"))
+        else:
+            lines.append(f"<div>Grado medio: {deg['mean']:.3f} — Máx. entrada: {deg['max_in']} — Máx. salida: {deg['max_out']}</div>")
+            rows = "".join(
+                f"<tr><td align='center'>{d}</td><td align='center'>{deg['in'].get(d, 0)}</td><td align='center'>{deg['out'].get(d, 0)}</td></tr>"
+                for d in sorted(set(deg["in"]) | set(deg["out"]))[:MAX_LISTED_ITEMS]
+            )
+            lines.append("<table cellspacing='0' cellpadding='3' border='1'><tr><th>Grado</th><th>Nodos (entrada)</th>"
+                         f"<th>Nodos (salida)</th></tr>{rows}</table>")
+
+        # Componentes fuertemente conexas
+        scc = self.analytics.cached("scc")
+        lines.append("<h3>Componentes fuertemente conexas</h3>")
+        if scc is None:
+            lines.append(self._pending_text("scc"))
+        else:
+            nontrivial = [c for c in scc if len(c) > 1]
+            lines.append(f"<div>Total: {len(scc)} — No triviales: {len(nontrivial)} — Mayor: {len(scc[0]) if scc else 0} nodos</div>")
+            for comp in nontrivial[:MAX_LISTED_ITEMS]:
+                shown = ", ".join(self._node_text(v) for v in comp[:MAX_LISTED_ITEMS])
+                more = "…" if len(comp) > MAX_LISTED_ITEMS else ""
+                lines.append(f"<div style='margin-left: 8px;'>• {{{shown}{more}}}</div>")
+
+        # Orden topológico
+        topo = self.analytics.cached("topological")
+        lines.append("<h3>Orden topológico</h3>")
+        if topo is None:
+            lines.append(self._pending_text("topological"))
+        elif not topo[0]:
+            lines.append("<div>No existe: el grafo tiene ciclos.</div>")
+        else:
+            topo = topo[1]
+            more = " → …" if len(topo) > MAX_LISTED_ITEMS else ""
+            lines.append("<div>" + " → ".join(self._node_text(v) for v in topo[:MAX_LISTED_ITEMS]) + more + "</div>")
+
+        # PageRank
+        pr = self.analytics.cached("pagerank")
+        lines.append("<h3>PageRank (principales)</h3>")
+        if pr is None:
+            lines.append(self._pending_text("pagerank"))
+        else:
+            top = sorted(pr.items(), key=lambda kv: kv[1], reverse=True)[:MAX_LISTED_ITEMS]
+            for v, score in top:
+                lines.append(f"<div style='margin-left: 8px;'>{self._node_text(v)}: {score:.4f}</div>")
+
+        self.results_label.setText("".join(lines))
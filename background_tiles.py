@@ -0,0 +1,318 @@
+"""
+Imagen de fondo dividida en mosaicos con pirámide de resoluciones (mipmaps)
+"""
+import math
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from PyQt5.QtCore import (Qt, QObject, QPoint, QRect, QRectF, QRunnable, QSize, QTemporaryDir,
+                          QThreadPool, pyqtSignal)
+from PyQt5.QtGui import QColor, QImage, QImageIOHandler, QImageReader, QPainter
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+
+# Lado de cada mosaico en píxeles
+TILE_SIZE = 512
+
+# Niveles con más píxeles que esto (64 MiB en ARGB32) no se guardan en memoria: se leen por mosaico bajo demanda
+MAX_RESIDENT_PIXELS = 4096 * 4096
+
+# Mosaicos leídos bajo demanda que se mantienen en memoria (64 x 1 MiB); el resto se relee del disco
+CACHED_TILES = 64
+
+# Un nivel de la pirámide: (col, fila) -> mosaico (vacío si el nivel se lee bajo demanda)
+TileLevel = Dict[Tuple[int, int], QImage]
+
+# Mosaico de un nivel no residente: (nivel, col, fila)
+TileKey = Tuple[int, int, int]
+
+
+def read_image_size(path: str) -> QSize:
+    """Lee solo el encabezado de la imagen para conocer su tamaño (QSize vacío si no es legible)"""
+    reader = QImageReader(path)
+    return reader.size() if reader.canRead() else QSize()
+
+
+def supports_clip_rect(path: str) -> bool:
+    """Indica si el formato decodifica un recorte (también reducido) sin leer la imagen completa (JPEG sí, PNG no)"""
+    reader = QImageReader(path)
+    return reader.supportsOption(QImageIOHandler.ClipRect) and reader.supportsOption(QImageIOHandler.ScaledClipRect)
+
+
+def level_sizes(size: QSize, tile_size: int = TILE_SIZE) -> List[QSize]:
+    """Tamaño de cada nivel de la pirámide: se divide a la mitad hasta caber en un solo mosaico"""
+    sizes = [QSize(size)]
+    while max(sizes[-1].width(), sizes[-1].height()) > tile_size:
+        last = sizes[-1]
+        sizes.append(QSize(max(1, last.width() // 2), max(1, last.height() // 2)))
+    return sizes
+
+
+def is_resident(size: QSize) -> bool:
+    """Indica si un nivel de ese tamaño se guarda completo en memoria"""
+    return size.width() * size.height() <= MAX_RESIDENT_PIXELS
+
+
+def split_tiles(image: QImage, tile_size: int = TILE_SIZE) -> TileLevel:
+    """Corta una imagen en mosaicos de tile_size x tile_size (los del borde pueden ser menores)"""
+    tiles: TileLevel = {}
+    for row in range(math.ceil(image.height() / tile_size)):
+        for col in range(math.ceil(image.width() / tile_size)):
+            tiles[(col, row)] = image.copy(col * tile_size, row * tile_size, tile_size, tile_size)
+    return tiles
+
+
+def spilled_tile_path(spill_dir: str, level: int, col: int, row: int) -> str:
+    """Archivo donde se guarda un mosaico volcado a disco"""
+    return os.path.join(spill_dir, f"{level}_{col}_{row}.png")
+
+
+def spill_tiles(image: QImage, spill_dir: str, level: int, tile_size: int = TILE_SIZE):
+    """Guarda en disco los mosaicos de un nivel de a uno: cada recorte se libera antes de hacer el siguiente"""
+    for row in range(math.ceil(image.height() / tile_size)):
+        for col in range(math.ceil(image.width() / tile_size)):
+            tile = image.copy(col * tile_size, row * tile_size, tile_size, tile_size)
+            if not tile.save(spilled_tile_path(spill_dir, level, col, row), "PNG", 100):  # 100 = sin compresión
+                raise ValueError("No se pudo guardar un mosaico temporal de la imagen de fondo.")
+
+
+def read_tile(path: str, level: int, col: int, row: int, level_size: QSize, tile_size: int = TILE_SIZE,
+              spill_dir: Optional[str] = None) -> QImage:
+    """
+    Lee un mosaico de un nivel no residente: del volcado en disco, o de la imagen original con
+    setClipRect / setScaledClipRect (el lector decodifica solo ese recorte, ya reducido al tamaño del nivel)
+    """
+    if spill_dir is not None:
+        image = QImage(spilled_tile_path(spill_dir, level, col, row))
+    else:
+        reader = QImageReader(path)
+        rect = QRect(col * tile_size, row * tile_size, tile_size, tile_size).intersected(QRect(QPoint(0, 0), level_size))
+        if level_size == reader.size():
+            reader.setClipRect(rect)
+        else:
+            reader.setScaledSize(level_size)
+            reader.setScaledClipRect(rect)
+        image = reader.read()
+    if image.isNull():
+        raise ValueError(f"No se pudo leer el mosaico ({col}, {row}) del nivel {level}.")
+    return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+
+def build_pyramid(path: str, tile_size: int = TILE_SIZE, spill_dir: Optional[str] = None) -> List[TileLevel]:
+    """
+    Construye la pirámide: el nivel k tiene la mitad de resolución que el k-1 y el último cabe en un mosaico
+    Los niveles que superan MAX_RESIDENT_PIXELS quedan vacíos y se leen por mosaico con read_tile.
+    El primer nivel residente se decodifica directamente reducido (setScaledSize); si el formato no admite
+    recortes (spill_dir dado), la única lectura completa vuelca antes a spill_dir, mosaico a mosaico,
+    los niveles no residentes
+    """
+    reader = QImageReader(path)
+    size = reader.size()
+    if not reader.canRead() or size.isEmpty():
+        raise ValueError("No se pudo leer la imagen (formato inválido).")
+    sizes = level_sizes(size, tile_size)
+    first = next(k for k, level_size in enumerate(sizes) if is_resident(level_size))
+    if spill_dir is None or first == 0:
+        if first > 0: reader.setScaledSize(sizes[first])
+        image = reader.read()
+    else:
+        image = reader.read()
+        for k in range(first):
+            if image.isNull(): break
+            spill_tiles(image, spill_dir, k, tile_size)
+            image = image.scaled(sizes[k + 1], Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    if image.isNull():
+        raise ValueError("No se pudo leer la imagen (formato inválido).")
+
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    levels: List[TileLevel] = [{} for _ in range(first)] + [split_tiles(image, tile_size)]
+    for level_size in sizes[first + 1:]:
+        image = image.scaled(level_size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        levels.append(split_tiles(image, tile_size))
+    return levels
+
+
+class _PyramidSignals(QObject):
+    """Señales de las tareas de carga (QRunnable no es QObject)"""
+    finished = pyqtSignal(object)  # List[TileLevel] o la excepción; (clave, QImage o excepción) por mosaico
+
+
+class _PyramidTask(QRunnable):
+    """Construye la pirámide de mosaicos en el pool de hilos"""
+
+    def __init__(self, path: str, spill_dir: Optional[str]):
+        super().__init__()
+        self.path = path
+        self.spill_dir = spill_dir
+        self.signals = _PyramidSignals()
+
+    def run(self):
+        try:
+            result = build_pyramid(self.path, spill_dir=self.spill_dir)
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(result)
+
+
+class _TileTask(QRunnable):
+    """Lee un mosaico de un nivel no residente en el pool de hilos"""
+
+    def __init__(self, path: str, key: TileKey, level_size: QSize, spill_dir: Optional[str]):
+        super().__init__()
+        self.path = path
+        self.key = key
+        self.level_size = level_size
+        self.spill_dir = spill_dir
+        self.signals = _PyramidSignals()
+
+    def run(self):
+        try:
+            tile = read_tile(self.path, *self.key, self.level_size, spill_dir=self.spill_dir)
+        except Exception as exc:
+            tile = exc
+        self.signals.finished.emit((self.key, tile))
+
+
+# -----------------------
+# TiledBackgroundItem
+# -----------------------
+class TiledBackgroundItem(QGraphicsItem):
+    """
+    Fondo que dibuja solo los mosaicos visibles del nivel de la pirámide acorde al zoom
+    La pirámide se construye en segundo plano; mientras tanto se muestra un marcador gris
+    Los mosaicos de los niveles no residentes se leen bajo demanda y solo se conservan CACHED_TILES;
+    mientras llegan se dibuja en su lugar la parte correspondiente del primer nivel residente
+    """
+
+    def __init__(self, path: str, size: QSize, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.image_size = size  # Tamaño a resolución completa (= coordenadas del elemento)
+        self.level_sizes = level_sizes(size)
+        self.levels: List[TileLevel] = []
+        self.load_error: Optional[Exception] = None
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)  # Necesario para option.exposedRect
+        self._task: Optional[_PyramidTask] = None
+        # Sin soporte de recortes los niveles no residentes se vuelcan a un directorio temporal (se borra con el elemento)
+        self._spill_dir: Optional[QTemporaryDir] = None if supports_clip_rect(path) else QTemporaryDir()
+        self._tile_cache: "OrderedDict[TileKey, QImage]" = OrderedDict()  # Mosaicos leídos bajo demanda, orden LRU
+        self._pending_tiles: Set[TileKey] = set()
+        self._tile_tasks: Dict[TileKey, _TileTask] = {}  # Mantiene vivas las señales de cada tarea
+
+    @property
+    def spill_dir(self) -> Optional[str]:
+        """Directorio con los mosaicos volcados a disco (None si se leen de la imagen original)"""
+        return self._spill_dir.path() if self._spill_dir is not None else None
+
+    def start_loading(self, on_finished=None):
+        """Lanza la construcción de la pirámide; on_finished(item) se llama en el hilo de la GUI"""
+        self._task = _PyramidTask(self.path, self.spill_dir)
+        self._task.signals.finished.connect(lambda result: self._on_pyramid_ready(result, on_finished))
+        QThreadPool.globalInstance().start(self._task)
+
+    def _on_pyramid_ready(self, result, on_finished):
+        """Recibe la pirámide (o el error) y redibuja"""
+        self._task = None
+        if isinstance(result, Exception):
+            self.load_error = result
+        else:
+            self.levels = result
+        self.update()
+        if on_finished is not None:
+            on_finished(self)
+
+    def _request_tile(self, key: TileKey):
+        """Encola la lectura de un mosaico (una sola vez mientras está pendiente)"""
+        if key in self._pending_tiles:
+            return
+        self._pending_tiles.add(key)
+        task = _TileTask(self.path, key, self.level_sizes[key[0]], self.spill_dir)
+        task.signals.finished.connect(self._on_tile_ready)
+        self._tile_tasks[key] = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_tile_ready(self, result):
+        """Guarda el mosaico leído en la caché (descartando el menos usado) y redibuja su zona"""
+        key, tile = result
+        self._pending_tiles.discard(key)
+        self._tile_tasks.pop(key, None)
+        if isinstance(tile, Exception):
+            return  # Se vuelve a pedir en el próximo dibujo; mientras, se dibuja el nivel residente
+        self._tile_cache[key] = tile
+        while len(self._tile_cache) > CACHED_TILES:
+            self._tile_cache.popitem(last=False)
+        level, col, row = key
+        span = TILE_SIZE * 2 ** level
+        self.update(QRectF(col * span, row * span, span, span))
+
+    def _lazy_tile(self, key: TileKey) -> Optional[QImage]:
+        """Mosaico de un nivel no residente desde la caché; si falta, pide leerlo"""
+        level, col, row = key
+        size = self.level_sizes[level]
+        if col * TILE_SIZE >= size.width() or row * TILE_SIZE >= size.height():
+            return None
+        tile = self._tile_cache.get(key)
+        if tile is not None:
+            self._tile_cache.move_to_end(key)
+            return tile
+        self._request_tile(key)
+        return None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Indica si la pirámide ya está disponible"""
+        return bool(self.levels)
+
+    def boundingRect(self) -> QRectF:
+        """Rectángulo de la imagen a resolución completa"""
+        return QRectF(0, 0, self.image_size.width(), self.image_size.height())
+
+    def level_for_scale(self, scale: float) -> int:
+        """Nivel cuyo píxel mide aproximadamente un píxel de pantalla para la escala dada"""
+        if not self.levels or scale <= 0:
+            return 0
+        level = int(math.floor(math.log2(1.0 / scale))) if scale < 1.0 else 0
+        return max(0, min(level, len(self.levels) - 1))
+
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None):
+        """Dibuja los mosaicos que intersectan la región expuesta"""
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+        if not self.levels:
+            painter.fillRect(exposed, QColor(235, 235, 235))
+            return
+
+        level = self.level_for_scale(option.levelOfDetailFromTransform(painter.worldTransform()))
+        tiles = self.levels[level]  # Vacío: nivel no residente
+        factor = 2 ** level  # Unidades de escena por píxel del nivel
+        span = TILE_SIZE * factor  # Unidades de escena cubiertas por un mosaico
+        first_col, last_col = int(exposed.left() // span), int(exposed.right() // span)
+        first_row, last_row = int(exposed.top() // span), int(exposed.bottom() // span)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                tile = tiles.get((col, row)) if tiles else self._lazy_tile((level, col, row))
+                if tile is None:
+                    if not tiles:
+                        self._paint_fallback(painter, level, col, row)
+                    continue
+                target = QRectF(col * span, row * span, tile.width() * factor, tile.height() * factor)
+                painter.drawImage(target, tile)
+
+    def _paint_fallback(self, painter: QPainter, level: int, col: int, row: int):
+        """Dibuja la zona de un mosaico que aún no llega con la parte que le toca del primer nivel residente"""
+        coarse = next((k for k in range(level + 1, len(self.levels)) if self.levels[k]), None)
+        if coarse is None:
+            return
+        step = 2 ** (coarse - level)  # Mosaicos del nivel pedido por lado de un mosaico del residente
+        parent = self.levels[coarse].get((col // step, row // step))
+        if parent is None:
+            return
+        part = TILE_SIZE / step
+        source = QRectF((col % step) * part, (row % step) * part, part, part).intersected(
+            QRectF(0, 0, parent.width(), parent.height()))
+        if source.isEmpty():
+            return
+        factor, span = 2 ** coarse, TILE_SIZE * 2 ** level
+        painter.drawImage(QRectF(col * span, row * span, source.width() * factor, source.height() * factor),
+                          parent, source)
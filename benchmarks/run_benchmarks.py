@@ -0,0 +1,278 @@
+"""
+Benchmarks de las rutas críticas de Grafo Drawer
+
+Se ejecuta sin ventana (plataforma Qt 'offscreen') sobre grafos sintéticos y escribe
+los tiempos en JSON para comparar entre versiones:
+
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 --output resultados.json
+    python benchmarks/run_benchmarks.py --compare resultados_anteriores.json
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication
+
+import networkx as nx
+
+from graph_widgets import EdgeItem, GraphScene, GraphView
+from matrix_view import MatrixWidget
+
+# Forma de los grafos sintéticos disponibles
+GRAPH_KINDS = ("random", "hub", "dense", "reverse")
+
+# Rutas medidas, en el orden en que se ejecutan
+BENCH_PATHS = (
+    "load_graph_from_data",
+    "create_edge",
+    "search",
+    "groups",
+    "update_position",
+    "update_positions",
+    "get_graph_data_json",
+    "to_matrix",
+    "refresh_matrix",
+    "export_image",
+    "delete_node",
+    "delete_nodes",
+    "clear_scene",
+)
+
+# Nodos borrados uno por uno (delete_node) y de una sola vez (delete_nodes)
+DELETE_ONE_MAX = 20
+DELETE_BATCH_MAX = 10000
+
+
+# -----------------------
+# Grafos sintéticos
+# -----------------------
+def make_graph_data(kind: str, n: int, seed: int = 0) -> dict:
+    """
+    Genera un grafo en el formato de archivo del proyecto
+    random: ~2 aristas por nodo; hub: pocos nodos concentran las aristas;
+    dense: ~16 aristas por nodo; reverse: la mitad de las aristas tiene su inversa
+    """
+    rnd = random.Random(seed)
+    edges = set()
+    if kind == "random" or kind == "reverse":
+        target = 2 * n
+        while len(edges) < min(target, n * (n - 1)):
+            a, b = rnd.randrange(n), rnd.randrange(n)
+            if a != b:
+                edges.add((a, b))
+        if kind == "reverse":
+            edges |= {(b, a) for a, b in list(edges)[: len(edges) // 2]}
+    elif kind == "hub":
+        # Preferencial: cada nodo nuevo se conecta a nodos ya populares
+        for a, b in nx.barabasi_albert_graph(n, min(2, n - 1), seed=seed).edges():
+            edges.add((a, b) if rnd.random() < 0.5 else (b, a))
+    elif kind == "dense":
+        target = min(16 * n, n * (n - 1))
+        while len(edges) < target:
+            a, b = rnd.randrange(n), rnd.randrange(n)
+            if a != b:
+                edges.add((a, b))
+    else:
+        raise ValueError(f"Tipo de grafo desconocido: {kind}")
+
+    # Posiciones aleatorias dentro del área de trabajo
+    span = min(7000.0, 60.0 * n ** 0.5)
+    nodes = [{"id": i, "label": str(i), "x": rnd.uniform(-span, span), "y": rnd.uniform(-span, span), "radius": 40}
+             for i in range(n)]
+    return {
+        "nodes": nodes,
+        "edges": [{"a": a, "b": b, "weight": str(rnd.randint(1, 99))} for a, b in edges],
+        "background": None,
+    }
+
+
+# -----------------------
+# Medición
+# -----------------------
+def _measure(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+    """Ejecuta fn varias veces y retorna los tiempos en segundos (setup no se mide)"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run_case(app: QApplication, kind: str, n: int, repeat: int, limits: Dict[str, int], skip: List[str]) -> List[dict]:
+    """Mide todas las rutas para un grafo de un tipo y tamaño"""
+    data = make_graph_data(kind, n)
+    scene = GraphScene()
+    view = GraphView(scene)  # create_edge necesita una vista asociada
+    results = []
+
+    def record(path: str, runs: List[float]):
+        results.append({
+            "path": path, "kind": kind, "nodes": n, "edges": len(data["edges"]),
+            "seconds": statistics.median(runs), "min": min(runs), "runs": runs,
+        })
+        print(f"  {path:<22} {kind:<8} n={n:<7} {statistics.median(runs) * 1000:10.2f} ms")
+
+    def enabled(path: str) -> bool:
+        return path not in skip and n <= limits.get(path, n)
+
+    if enabled("load_graph_from_data"):
+        record("load_graph_from_data", _measure(lambda: scene.load_graph_from_data(data, view=view), repeat))
+    else:
+        scene.load_graph_from_data(data, view=view)
+    app.processEvents()
+
+    if enabled("create_edge"):
+        # Agregar de nuevo las aristas sobre los nodos ya cargados
+        edges = [(e["a"], e["b"], e["weight"]) for e in data["edges"]]
+
+        def strip_edges():
+            scene.delete_items((), list(scene.edge_items))
+
+        def add_edges():
+            nodes = scene.node_items
+            for a, b, w in edges:
+                scene.create_edge(nodes[a], nodes[b], w)
+
+        record("create_edge", _measure(add_edges, repeat, setup=strip_edges))
+
+    if enabled("search"):
+        # Consultas típicas mientras se escribe: prefijos crecientes, subcadenas y rangos de peso
+        queries = ["1", "12", "123", "1234", "23", "w>5", "w<=3", "w:2..8"]
+        record("search", _measure(lambda: [scene.search(q) for q in queries], repeat))
+
+    if enabled("groups"):
+        # Contraer y volver a expandir todas las comunidades (se detectan una sola vez, fuera de la medición)
+        scene.group_communities(collapse=False, seed=1)
+        record("groups", _measure(lambda: (scene.collapse_all_groups(), scene.expand_all_groups()), repeat))
+        scene.remove_all_groups()
+
+    edge_list = list(scene.edge_items)
+
+    def forget_geometry():
+        # Sin la geometría en caché cada arista se recalcula aunque sus nodos no se hayan movido
+        for e in edge_list: e._geometry_key = None
+
+    if enabled("update_position"):
+        record("update_position", _measure(lambda: [e.update_position() for e in edge_list], repeat, setup=forget_geometry))
+
+    if enabled("update_positions"):
+        # Todas las aristas en una sola pasada vectorizada, como tras un acomodo
+        record("update_positions", _measure(lambda: EdgeItem.update_positions(edge_list), repeat, setup=forget_geometry))
+
+    if enabled("get_graph_data_json"):
+        record("get_graph_data_json", _measure(lambda: json.dump(scene.get_graph_data(), io.StringIO(), indent=2), repeat))
+
+    if enabled("to_matrix"):
+        record("to_matrix", _measure(scene.to_matrix, repeat))
+
+    if enabled("refresh_matrix"):
+        matrix = MatrixWidget(scene)
+        record("refresh_matrix", _measure(matrix.refresh_matrix, repeat))
+        scene.graph_changed.disconnect(matrix._on_graph_changed)
+        matrix.deleteLater()
+
+    if enabled("export_image"):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "grafo.png")
+            record("export_image", _measure(lambda: scene.render_to_image(padding=50.0).save(out), repeat))
+
+    def reload():
+        # Grafo recién cargado con el índice de la escena ya construido y los elementos ya pulidos, como después de dibujarlo
+        scene.load_graph_from_data(data, view=view)
+        scene.items(scene.sceneRect())
+        app.processEvents()
+
+    if enabled("delete_node"):
+        def delete_one_by_one():
+            for node in list(scene.node_items.values())[:DELETE_ONE_MAX]:
+                scene.delete_node(node)
+        record("delete_node", _measure(delete_one_by_one, repeat, setup=reload))
+
+    if enabled("delete_nodes"):
+        record("delete_nodes", _measure(lambda: scene.delete_items(list(scene.node_items.values())[:DELETE_BATCH_MAX]),
+                                        repeat, setup=reload))
+
+    if enabled("clear_scene"):
+        # Incluye la recolección de basura: lo que la limpieza no libera se paga en una pausa posterior
+        record("clear_scene", _measure(lambda: (scene.clear_scene(keep_background=False), gc.collect()), repeat, setup=reload))
+
+    scene.clear_scene(keep_background=False)
+    view.deleteLater()
+    app.processEvents()
+    return results
+
+
+def compare(current: List[dict], baseline_path: str):
+    """Imprime la razón de tiempos contra un archivo de resultados anterior"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["path"], r["kind"], r["nodes"]): r["seconds"] for r in json.load(f)["results"]}
+    print("\nComparación (actual / anterior):")
+    for r in current:
+        old = baseline.get((r["path"], r["kind"], r["nodes"]))
+        if old:
+            print(f"  {r['path']:<22} {r['kind']:<8} n={r['nodes']:<7} x{r['seconds'] / old:6.2f}")
+
+
+def main():
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks de rutas críticas de Grafo Drawer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Cantidades de nodos (la curva completa llega a 100000)")
+    parser.add_argument("--kinds", nargs="+", choices=GRAPH_KINDS, default=list(GRAPH_KINDS))
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición (se reporta la mediana)")
+    parser.add_argument("--skip", nargs="*", choices=BENCH_PATHS, default=[], help="Rutas a omitir")
+    parser.add_argument("--matrix-max", type=int, default=1000,
+                        help="Máximo de nodos para to_matrix y refresh_matrix (crecen con n²)")
+    parser.add_argument("--image-max", type=int, default=20000, help="Máximo de nodos para exportar imagen")
+    parser.add_argument("--output", default="bench_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--compare", help="Archivo JSON de una corrida anterior para comparar")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    limits = {"to_matrix": args.matrix_max, "refresh_matrix": args.matrix_max, "export_image": args.image_max}
+
+    results: List[dict] = []
+    for n in sorted(args.sizes):
+        for kind in args.kinds:
+            print(f"[{kind}, {n} nodos]")
+            results.extend(run_case(app, kind, n, args.repeat, limits, args.skip))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": QT_VERSION_STR,
+            "pyqt": PYQT_VERSION_STR,
+            "networkx": nx.__version__,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
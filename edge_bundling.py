@@ -0,0 +1,164 @@
+"""
+Agrupamiento jerárquico de aristas (edge bundling) sobre un quadtree de posiciones
+"""
+import math
+from typing import List, Tuple
+
+import numpy as np
+from PyQt5.QtCore import Qt, QObject, QRectF, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QGraphicsItem
+
+from utils import array_to_polygon
+
+# Profundidad máxima del quadtree (4^8 celdas en el nivel más fino)
+MAX_DEPTH = 8
+
+# Fuerza de agrupamiento: 0 = líneas rectas, 1 = siguen exactamente la jerarquía
+DEFAULT_BETA = 0.85
+
+# Iteraciones de suavizado de Chaikin sobre el polígono de control
+SMOOTHING_STEPS = 2
+
+
+def _cell_ids(xy: np.ndarray, lo: np.ndarray, size: float, depth: int) -> np.ndarray:
+    """Índice de celda de cada punto en cada nivel: arreglo (depth + 1, n)"""
+    cells = 1 << depth
+    ij = np.clip(((xy - lo) / size * cells).astype(np.int64), 0, cells - 1)
+    ids = np.empty((depth + 1, len(xy)), dtype=np.int64)
+    for d in range(depth + 1):
+        shift = depth - d
+        ids[d] = (ij[:, 0] >> shift) * (1 << d) + (ij[:, 1] >> shift)
+    return ids
+
+
+def _cell_centroids(xy: np.ndarray, flat_ids: np.ndarray, total_cells: int) -> np.ndarray:
+    """Centroide de los nodos de cada celda (todas las celdas de todos los niveles): arreglo (total_cells, 2)"""
+    count = np.zeros(total_cells)
+    sums = np.zeros((total_cells, 2))
+    for d in range(flat_ids.shape[0]):
+        count += np.bincount(flat_ids[d], minlength=total_cells)
+        sums[:, 0] += np.bincount(flat_ids[d], weights=xy[:, 0], minlength=total_cells)
+        sums[:, 1] += np.bincount(flat_ids[d], weights=xy[:, 1], minlength=total_cells)
+    return sums / np.maximum(count, 1.0)[:, None]
+
+
+def bundle_edges(xy: np.ndarray, src: np.ndarray, dst: np.ndarray, beta: float = DEFAULT_BETA) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula polilíneas agrupadas para las aristas (src[i] -> dst[i]) entre nodos en posiciones xy
+    Cada arista sube por las celdas del quadtree que contienen al origen hasta el ancestro común
+    y baja hasta el destino; los centroides de esas celdas son sus puntos de control
+    Retorna (puntos (m, k, 2), profundidad del ancestro común (m,)); todo vectorizado con NumPy
+    """
+    m = len(src)
+    if m == 0:
+        return np.zeros((0, 2, 2)), np.zeros(0, dtype=np.int64)
+    lo = xy.min(axis=0)
+    size = float(max(np.ptp(xy[:, 0]), np.ptp(xy[:, 1]), 1.0)) * 1.0001
+    depth = int(min(MAX_DEPTH, max(2, math.ceil(math.log(max(len(xy), 2), 4)) + 1)))
+    ids = _cell_ids(xy, lo, size, depth)
+
+    # Numeración global de celdas: el nivel d empieza después de las 4^0 + ... + 4^(d-1) anteriores
+    offsets = np.cumsum([0] + [1 << (2 * d) for d in range(depth + 1)])
+    flat_ids = ids + offsets[:-1, None]
+    centroids = _cell_centroids(xy, flat_ids, int(offsets[-1]))
+
+    # Profundidad del ancestro común más bajo: cantidad de niveles iniciales con la misma celda - 1
+    same = ids[:, src] == ids[:, dst]  # (depth + 1, m)
+    lca = np.cumprod(same, axis=0).sum(axis=0) - 1
+
+    # Polígono de control de largo fijo: los niveles sobre el ancestro común repiten su centroide
+    points = [xy[src]]
+    for d in range(depth - 1, -1, -1):
+        points.append(centroids[flat_ids[np.maximum(d, lca), src]])
+    for d in range(depth):
+        points.append(centroids[flat_ids[np.maximum(d, lca), dst]])
+    points.append(xy[dst])
+    ctrl = np.stack(points, axis=1)  # (m, 2 * depth + 2, 2)
+
+    # Enderezar según beta (interpolación con la recta origen -> destino)
+    k = ctrl.shape[1]
+    t = np.linspace(0.0, 1.0, k)[None, :, None]
+    straight = ctrl[:, :1] + t * (ctrl[:, -1:] - ctrl[:, :1])
+    ctrl = beta * ctrl + (1.0 - beta) * straight
+
+    # Suavizado de Chaikin conservando los extremos
+    for _ in range(SMOOTHING_STEPS):
+        a, b = ctrl[:, :-1], ctrl[:, 1:]
+        q, r = 0.75 * a + 0.25 * b, 0.25 * a + 0.75 * b
+        inner = np.stack([q, r], axis=2).reshape(m, -1, 2)
+        ctrl = np.concatenate([ctrl[:, :1], inner[:, 1:-1], ctrl[:, -1:]], axis=1)
+    return ctrl, lca
+
+
+def build_bundle_paths(points: np.ndarray, lca: np.ndarray) -> List[Tuple[int, QPainterPath]]:
+    """Une las polilíneas en un QPainterPath por profundidad de ancestro común"""
+    paths = []
+    for d in np.unique(lca):
+        path = QPainterPath()
+        for poly in points[lca == d]:
+            path.addPolygon(array_to_polygon(poly))
+        paths.append((int(d), path))
+    return paths
+
+
+class _BundleSignals(QObject):
+    """Señales de la tarea de agrupamiento (QRunnable no es QObject)"""
+    finished = pyqtSignal(object, object)  # identificador de la solicitud, rutas o excepción
+
+
+class _BundleTask(QRunnable):
+    """Calcula las rutas agrupadas en el pool de hilos"""
+
+    def __init__(self, request_id: int, xy: np.ndarray, src: np.ndarray, dst: np.ndarray, beta: float):
+        super().__init__()
+        self.request_id = request_id
+        self.args = (xy, src, dst, beta)
+        self.signals = _BundleSignals()
+
+    def run(self):
+        try:
+            result = build_bundle_paths(*bundle_edges(*self.args))
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(self.request_id, result)
+
+
+def start_bundling(request_id: int, xy: np.ndarray, src: np.ndarray, dst: np.ndarray, callback, beta: float = DEFAULT_BETA):
+    """Lanza el cálculo en segundo plano; callback(request_id, resultado) se llama en el hilo de la GUI"""
+    task = _BundleTask(request_id, xy, src, dst, beta)
+    task.signals.finished.connect(callback)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+# -----------------------
+# BundledEdgesItem
+# -----------------------
+class BundledEdgesItem(QGraphicsItem):
+    """Dibuja todas las aristas agrupadas con unas pocas rutas combinadas"""
+
+    def __init__(self, paths: List[Tuple[int, QPainterPath]], parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self._rect = QRectF()
+        for _, path in paths:
+            self._rect = self._rect.united(path.boundingRect())
+        max_depth = max((d for d, _ in paths), default=0)
+        # Las aristas largas (ancestro común alto) se dibujan más tenues para no saturar
+        self._pens = []
+        for d, _ in paths:
+            pen = QPen(QColor(60, 90, 140, 40 + int(120 * d / max(1, max_depth))), 1)
+            pen.setCosmetic(True)  # Ancho 1 cosmético: el rasterizador usa su trazador rápido
+            pen.setCapStyle(Qt.RoundCap)
+            self._pens.append(pen)
+        self.setZValue(-5)  # Misma capa que las aristas individuales
+
+    def boundingRect(self) -> QRectF:
+        return self._rect.adjusted(-2, -2, 2, 2)
+
+    def paint(self, painter: QPainter, option, widget=None):
+        painter.setBrush(Qt.NoBrush)
+        for pen, (_, path) in zip(self._pens, self.paths):
+            painter.setPen(pen)
+            painter.drawPath(path)
@@ -0,0 +1,101 @@
+"""
+Geometría de las aristas en forma cerrada (NumPy): extremos, punto de control, flecha y punto medio
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+from utils import ARROW_SIZE
+
+# Desplazamiento perpendicular del punto de control de las aristas que tienen inversa (se curvan)
+CURVE_OFFSET = 30.0
+
+# Apertura de cada ala de la flecha respecto de la dirección de llegada
+WING_ANGLE = math.pi / 6
+
+# Altura del punto de control de los bucles, en radios del nodo
+LOOP_HEIGHT = 1.6
+
+# Ángulo (desde la vertical) de los puntos donde el bucle sale y entra al nodo
+LOOP_SPREAD = math.radians(35)
+
+# Separación entre la cima del bucle y el centro de su etiqueta
+LOOP_LABEL_GAP = 15.0
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    """Normaliza cada fila de un arreglo (n, 2); las filas nulas quedan en cero"""
+    length = np.hypot(v[:, 0], v[:, 1])[:, None]
+    return v / np.maximum(length, 1e-9)
+
+
+def _toward(x: float, y: float, tx: float, ty: float, length: float) -> Tuple[float, float]:
+    """Vector de largo dado desde (x, y) hacia (tx, ty); nulo si ambos puntos coinciden"""
+    dx, dy = tx - x, ty - y
+    scale = length / max(math.hypot(dx, dy), 1e-9)
+    return dx * scale, dy * scale
+
+
+def _arrow_wings(end: Tuple[float, float], ctrl: Tuple[float, float]) -> Tuple[Tuple[float, float], ...]:
+    """Alas de la flecha: giradas ±WING_ANGLE hacia atrás desde la dirección de llegada (control -> fin)"""
+    bx, by = _toward(end[0], end[1], ctrl[0], ctrl[1], ARROW_SIZE)
+    cos, sin = math.cos(WING_ANGLE), math.sin(WING_ANGLE)
+    return ((end[0] + bx * cos - by * sin, end[1] + bx * sin + by * cos),
+            (end[0] + bx * cos + by * sin, end[1] - bx * sin + by * cos))
+
+
+def directed_geometry(x1: float, y1: float, r1: float, x2: float, y2: float, r2: float,
+                      curved: bool) -> Tuple[Tuple[float, float], ...]:
+    """
+    Geometría de una arista entre nodos distintos con centros (x1, y1) -> (x2, y2) y radios r1, r2
+    Las aristas con inversa (curved) son curvas cuadráticas con el punto de control desplazado a un lado;
+    las demás son rectas. Cada extremo sale del borde de su círculo en la dirección del punto de control
+    (la tangente de la curva; en las rectas, el otro nodo), sin muestrear la trayectoria
+    Retorna (inicio, fin, control, ala 1, ala 2, punto medio) como pares (x, y)
+    """
+    px, py = _toward(0.0, 0.0, y1 - y2, x2 - x1, CURVE_OFFSET if curved else 0.0)
+    ctrl = ((x1 + x2) / 2.0 + px, (y1 + y2) / 2.0 + py)
+    ox, oy = _toward(x1, y1, ctrl[0], ctrl[1], r1)
+    ix, iy = _toward(x2, y2, ctrl[0], ctrl[1], r2)
+    start, end = (x1 + ox, y1 + oy), (x2 + ix, y2 + iy)
+    if curved:
+        mid = (0.25 * start[0] + 0.5 * ctrl[0] + 0.25 * end[0], 0.25 * start[1] + 0.5 * ctrl[1] + 0.25 * end[1])
+    else:
+        mid = ((start[0] + end[0]) / 2.0, (start[1] + end[1]) / 2.0)
+    return (start, end, ctrl) + _arrow_wings(end, ctrl) + (mid,)
+
+
+def directed_geometry_batch(p1: np.ndarray, p2: np.ndarray, r1: np.ndarray, r2: np.ndarray,
+                            curved: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    directed_geometry para n aristas a la vez en una sola pasada vectorizada
+    p1, p2: centros (n, 2); r1, r2: radios (n,); curved: máscara (n,)
+    Retorna (inicio, fin, control, ala 1, ala 2, punto medio), cada uno (n, 2)
+    """
+    d = p2 - p1
+    normal = _unit(np.stack([-d[:, 1], d[:, 0]], axis=1))
+    ctrl = (p1 + p2) / 2.0 + normal * np.where(curved, CURVE_OFFSET, 0.0)[:, None]
+    start = p1 + _unit(ctrl - p1) * r1[:, None]
+    end = p2 + _unit(ctrl - p2) * r2[:, None]
+
+    # Alas de la flecha: giradas ±WING_ANGLE hacia atrás desde la dirección de llegada (control -> fin)
+    back = _unit(ctrl - end) * ARROW_SIZE
+    cos, sin = math.cos(WING_ANGLE), math.sin(WING_ANGLE)
+    wing1 = end + np.stack([back[:, 0] * cos - back[:, 1] * sin, back[:, 0] * sin + back[:, 1] * cos], axis=1)
+    wing2 = end + np.stack([back[:, 0] * cos + back[:, 1] * sin, -back[:, 0] * sin + back[:, 1] * cos], axis=1)
+
+    # Punto medio: B(0.5) de la curva cuadrática, o el centro del segmento recortado
+    mid = np.where(curved[:, None], 0.25 * start + 0.5 * ctrl + 0.25 * end, (start + end) / 2.0)
+    return start, end, ctrl, wing1, wing2, mid
+
+
+def loop_geometry(x: float, y: float, r: float) -> Tuple[Tuple[float, float], ...]:
+    """
+    Geometría de un bucle sobre el nodo con centro (x, y) y radio r
+    Retorna (inicio, fin, control, ala 1, ala 2, punto de la etiqueta) como pares (x, y)
+    """
+    dx, dy = r * math.sin(LOOP_SPREAD), -r * math.cos(LOOP_SPREAD)
+    start, end = (x - dx, y + dy), (x + dx, y + dy)
+    ctrl = (x, y - r * LOOP_HEIGHT)
+    return (start, end, ctrl) + _arrow_wings(end, ctrl) + ((x, y - r * LOOP_HEIGHT - LOOP_LABEL_GAP),)
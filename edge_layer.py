@@ -0,0 +1,387 @@
+"""
+Capa de aristas por lotes: un solo elemento gráfico dibuja todas las aristas desde arreglos planos
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QFontMetricsF, QPainter, QPen
+from PyQt5.QtWidgets import QGraphicsItem
+
+from utils import ARROW_SIZE, FONT_EDGE, array_to_polygon
+
+# Zoom mínimo (nivel de detalle) a partir del cual se dibujan los pesos
+LABEL_ZOOM_THRESHOLD = 0.6
+
+# Máximo de etiquetas de peso por cuadro (las demás se omiten)
+MAX_LABELS = 3000
+
+# Lado mínimo de las celdas del índice espacial usado para elegir aristas con el mouse
+GRID_CELL = 250.0
+
+# Tamaño mínimo en pantalla (px) de las puntas de flecha para dibujarlas
+MIN_ARROW_PX = 3.0
+
+# Separación entre una arista y su inversa (se dibujan paralelas en lugar de curvas)
+REVERSE_OFFSET = 10.0
+
+# Distancia máxima (en unidades de escena) para considerar que un clic cae sobre una arista
+PICK_TOLERANCE = 8.0
+
+# Fracción de filas muertas (aristas o nodos quitados) tolerada antes de compactar los arreglos
+COMPACT_FRACTION = 0.25
+
+
+# -----------------------
+# EdgeLayerItem
+# -----------------------
+class EdgeLayerItem(QGraphicsItem):
+    """
+    Dibuja las aristas del grafo con unas pocas llamadas drawLines agrupadas por pluma
+    Las EdgeItem siguen existiendo como modelo (peso, nodos) pero se ocultan mientras la capa está activa;
+    los bucles quedan fuera de la capa y se siguen dibujando como EdgeItem
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setZValue(-5)  # Misma capa que las aristas individuales
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)  # Necesario para option.exposedRect
+        self.edges: List = []  # EdgeItem por fila
+        self.row_of: Dict = {}  # EdgeItem -> fila
+        self._node_row: Dict = {}  # NodeItem -> fila en pos/radius
+        self.pos_xy = np.zeros((0, 2))
+        self.radius = np.zeros(0)
+        self.src = np.zeros(0, dtype=np.int64)
+        self.dst = np.zeros(0, dtype=np.int64)
+        self.has_reverse = np.zeros(0, dtype=bool)
+        self.dead = np.zeros(0, dtype=bool)  # Filas de aristas quitadas que aún no se compactaron
+        self._rect = QRectF()
+        self._filtered_edges = set()  # EdgeItem fuera del filtro de subgrafo de la escena
+        self.filtered = np.zeros(0, dtype=bool)  # Máscara por fila de las aristas filtradas
+        self.dim_filtered = False  # True: se dibujan atenuadas; False: se omiten
+        self._grid = None  # (claves ordenadas, filas) del índice espacial; None = desactualizado
+        self._label_widths: Dict[str, float] = {}
+        self._metrics = QFontMetricsF(FONT_EDGE)
+
+        self.normal_pen = QPen(QColor(80, 80, 80), 3, Qt.SolidLine, Qt.FlatCap)
+        self.arrow_pen = QPen(QColor(80, 80, 80), 2, Qt.SolidLine, Qt.FlatCap)
+        self.highlight_pen = QPen(QColor(46, 204, 113), 6, Qt.SolidLine, Qt.FlatCap)
+        self.search_pen = QPen(QColor(255, 140, 0), 5, Qt.SolidLine, Qt.FlatCap)
+        self.dim_pen = QPen(QColor(80, 80, 80, 30), 1)
+        self.dim_pen.setCosmetic(True)
+        # Con poco zoom el ancho real queda bajo un píxel: una pluma cosmética de 1 px usa el trazador rápido
+        self.thin_pen = QPen(QColor(80, 80, 80), 1)
+        self.thin_pen.setCosmetic(True)
+
+    # -----------------------
+    # Datos
+    # -----------------------
+    def rebuild(self, nodes, edges):
+        """Reconstruye los arreglos a partir de los NodeItem y EdgeItem de la escena (sin bucles)"""
+        nodes = list(nodes)
+        self._node_row = {n: i for i, n in enumerate(nodes)}
+        self.pos_xy = np.array([(n.pos().x(), n.pos().y()) for n in nodes], dtype=float).reshape(-1, 2)
+        self.radius = np.array([n.radius for n in nodes], dtype=float)
+        self.edges = [e for e in edges if not e.is_loop()]
+        self.row_of = {e: i for i, e in enumerate(self.edges)}
+        self.src = np.array([self._node_row[e.source] for e in self.edges], dtype=np.int64)
+        self.dst = np.array([self._node_row[e.dest] for e in self.edges], dtype=np.int64)
+        pairs = set(zip(self.src.tolist(), self.dst.tolist()))
+        self.has_reverse = np.array([(b, a) in pairs for a, b in zip(self.src.tolist(), self.dst.tolist())], dtype=bool)
+        self.dead = np.zeros(len(self.edges), dtype=bool)
+        self._grid = None
+        self.set_filter(self._filtered_edges, self.dim_filtered)
+        self._update_geometry()
+
+    def add_edges(self, edges):
+        """
+        Agrega al final las filas de aristas nuevas (sin bucles) y las de sus extremos que aún no tienen fila
+        Si la inversa ya estaba en la capa pasa a dibujarse desplazada: solo se recalculan esas filas
+        """
+        edges = [e for e in edges if not e.is_loop() and e not in self.row_of]
+        if not edges:
+            return
+        self._add_nodes({n for e in edges for n in (e.source, e.dest) if n not in self._node_row})
+        first = len(self.edges)
+        self.edges.extend(edges)
+        for row, e in enumerate(edges, first): self.row_of[e] = row
+        self.src = np.concatenate([self.src, np.array([self._node_row[e.source] for e in edges], dtype=np.int64)])
+        self.dst = np.concatenate([self.dst, np.array([self._node_row[e.dest] for e in edges], dtype=np.int64)])
+        self.filtered = np.concatenate([self.filtered, np.array([e in self._filtered_edges for e in edges], dtype=bool)])
+        self.dead = np.concatenate([self.dead, np.zeros(len(edges), dtype=bool)])
+        self.has_reverse = np.concatenate([self.has_reverse, np.zeros(len(edges), dtype=bool)])
+        for name in ("start", "end", "wing1", "wing2", "mid"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros((len(edges), 2))]))
+        rows = set(range(first, len(self.edges)))
+        for e in edges:
+            reverse = self._reverse_row(e)
+            if reverse is not None:
+                self.has_reverse[[self.row_of[e], reverse]] = True
+                rows.add(reverse)
+        self._update_geometry(np.fromiter(rows, dtype=np.int64, count=len(rows)))
+        self._grid = None
+        self.update()
+
+    def remove_edges(self, edges):
+        """
+        Quita aristas marcando sus filas como muertas (O(1) por arista; se compactan en lote más adelante)
+        Las inversas que siguen en la capa vuelven a dibujarse sin desplazamiento
+        """
+        edges = [e for e in edges if e in self.row_of]
+        if not edges:
+            return
+        self.dead[[self.row_of.pop(e) for e in edges]] = True
+        rows = [row for row in map(self._reverse_row, edges) if row is not None]
+        if rows:
+            self.has_reverse[rows] = False
+            self._update_geometry(np.array(rows, dtype=np.int64))
+        self._maybe_compact()
+        self.update()
+
+    def remove_nodes(self, nodes):
+        """Olvida las filas de nodos quitados de la escena (sus aristas se quitan antes con remove_edges)"""
+        for n in nodes: self._node_row.pop(n, None)
+        self._maybe_compact()
+
+    def edge_changed(self, edge):
+        """Redibuja tras cambiar el peso de una arista (la etiqueta se lee de la EdgeItem al dibujar)"""
+        if edge in self.row_of:
+            self.update()
+
+    def _add_nodes(self, nodes):
+        """Agrega al final las filas de posición y radio de los nodos indicados"""
+        nodes = list(nodes)
+        if not nodes:
+            return
+        for row, n in enumerate(nodes, len(self.pos_xy)): self._node_row[n] = row
+        self.pos_xy = np.concatenate([self.pos_xy, np.array([(n.pos().x(), n.pos().y()) for n in nodes], dtype=float)])
+        self.radius = np.concatenate([self.radius, np.array([n.radius for n in nodes], dtype=float)])
+
+    def _reverse_row(self, edge) -> Optional[int]:
+        """Fila de la arista inversa (destino -> origen) si está en la capa"""
+        for e in edge.dest.edges:
+            if e.dest is edge.source and e in self.row_of:
+                return self.row_of[e]
+        return None
+
+    def _maybe_compact(self):
+        """Compacta los arreglos cuando las filas muertas superan COMPACT_FRACTION de aristas o de nodos"""
+        dead_nodes = len(self.pos_xy) - len(self._node_row)
+        if (len(self.edges) - len(self.row_of) > COMPACT_FRACTION * max(1, len(self.edges))
+                or dead_nodes > COMPACT_FRACTION * max(1, len(self.pos_xy))):
+            self._compact()
+
+    def _compact(self):
+        """Descarta las filas muertas de aristas y nodos y renumera las vivas"""
+        keep = ~self.dead
+        self.edges = [e for e, alive in zip(self.edges, keep.tolist()) if alive]
+        self.row_of = {e: i for i, e in enumerate(self.edges)}
+        for name in ("src", "dst", "has_reverse", "filtered", "start", "end", "wing1", "wing2", "mid"):
+            setattr(self, name, getattr(self, name)[keep])
+        self.dead = np.zeros(len(self.edges), dtype=bool)
+        live = np.fromiter(self._node_row.values(), dtype=np.int64, count=len(self._node_row))
+        remap = np.full(len(self.pos_xy), -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+        self.pos_xy, self.radius = self.pos_xy[live], self.radius[live]
+        self._node_row = {n: i for i, n in enumerate(self._node_row)}
+        self.src, self.dst = remap[self.src], remap[self.dst]
+        self._grid = None
+
+    def set_filter(self, edges, dim: bool = False):
+        """Aristas que quedan fuera del filtro de subgrafo: se omiten o, con dim, se dibujan atenuadas"""
+        self._filtered_edges = edges
+        self.dim_filtered = dim
+        self.filtered = np.zeros(len(self.edges), dtype=bool)
+        rows = [self.row_of[e] for e in edges if e in self.row_of]
+        if rows: self.filtered[rows] = True
+        self.update()
+
+    def node_moved(self, node, pos: QPointF):
+        """Actualiza la posición de un nodo y la geometría de sus aristas"""
+        row = self._node_row.get(node)
+        if row is None:
+            return
+        self.pos_xy[row] = (pos.x(), pos.y())
+        rows = np.array([self.row_of[e] for e in node.edges if e in self.row_of], dtype=np.int64)
+        if len(rows):
+            self._update_geometry(rows)
+        self._grid = None
+        self.update()
+
+    def nodes_moved(self, nodes):
+        """
+        Actualiza posición y radio de varios nodos ya movidos o redimensionados
+        y recalcula una sola vez la geometría de sus aristas
+        """
+        moved = [(self._node_row[n], n) for n in nodes if n in self._node_row]
+        if not moved:
+            return
+        node_rows = [row for row, _ in moved]
+        self.pos_xy[node_rows] = [(n.pos().x(), n.pos().y()) for _, n in moved]
+        self.radius[node_rows] = [n.radius for _, n in moved]
+        rows = {self.row_of[e] for _, n in moved for e in n.edges if e in self.row_of}
+        if rows:
+            self._update_geometry(np.fromiter(rows, dtype=np.int64, count=len(rows)))
+        self._grid = None
+        self.update()
+
+    def _update_geometry(self, rows: Optional[np.ndarray] = None):
+        """
+        Calcula extremos, puntas de flecha y puntos medios (todas las filas o solo las indicadas)
+        Los extremos se recortan al borde de cada círculo; las aristas con inversa se desplazan en paralelo
+        """
+        if rows is None:
+            rows = np.arange(len(self.edges))
+            self.start = np.zeros((len(rows), 2))
+            self.end = np.zeros((len(rows), 2))
+            self.wing1 = np.zeros((len(rows), 2))
+            self.wing2 = np.zeros((len(rows), 2))
+            self.mid = np.zeros((len(rows), 2))
+        p1, p2 = self.pos_xy[self.src[rows]], self.pos_xy[self.dst[rows]]
+        r1, r2 = self.radius[self.src[rows]][:, None], self.radius[self.dst[rows]][:, None]
+        d = p2 - p1
+        length = np.maximum(np.hypot(d[:, 0], d[:, 1])[:, None], 1e-9)
+        u = d / length
+        n = np.stack([-u[:, 1], u[:, 0]], axis=1)
+        offset = np.where(self.has_reverse[rows], REVERSE_OFFSET, 0.0)[:, None] * n
+        start = p1 + u * r1 + offset
+        end = p2 - u * r2 + offset
+        back = end - u * ARROW_SIZE
+        self.start[rows], self.end[rows] = start, end
+        self.wing1[rows] = back + n * (ARROW_SIZE * 0.4)
+        self.wing2[rows] = back - n * (ARROW_SIZE * 0.4)
+        self.mid[rows] = (start + end) / 2.0
+
+        # Rectángulo envolvente (crece con margen de flecha y etiqueta)
+        if len(self.pos_xy):
+            lo = self.pos_xy.min(axis=0) - self.radius.max() * 3
+            hi = self.pos_xy.max(axis=0) + self.radius.max() * 3
+            rect = QRectF(lo[0], lo[1], hi[0] - lo[0], hi[1] - lo[1])
+        else:
+            rect = QRectF()
+        if rect != self._rect:
+            self.prepareGeometryChange()
+            self._rect = rect
+
+    # -----------------------
+    # Selección con el mouse
+    # -----------------------
+    def _build_grid(self):
+        """
+        Índice espacial de celdas uniformes: cada arista se registra en las celdas que cubre su rectángulo
+        Se guarda como claves de celda ordenadas para buscar con searchsorted; el lado de la celda
+        crece con la mediana del largo de las aristas para que ninguna ocupe demasiadas celdas
+        """
+        lo = np.minimum(self.start, self.end) - PICK_TOLERANCE
+        hi = np.maximum(self.start, self.end) + PICK_TOLERANCE
+        cell = max(GRID_CELL, float(np.median((hi - lo).max(axis=1))))
+        c0 = np.floor(lo / cell).astype(np.int64)
+        c1 = np.floor(hi / cell).astype(np.int64)
+        span = c1 - c0 + 1
+        counts = span[:, 0] * span[:, 1]
+        rows = np.repeat(np.arange(len(counts)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = c0[rows, 0] + k % span[rows, 0]
+        cy = c0[rows, 1] + k // span[rows, 0]
+        keys = (cx << 32) + (cy & 0xFFFFFFFF)
+        order = np.argsort(keys, kind="stable")
+        self._grid = (cell, keys[order], rows[order])
+
+    def edge_at(self, pos: QPointF, tolerance: float = PICK_TOLERANCE):
+        """Retorna la EdgeItem más cercana al punto (dentro de la tolerancia) o None"""
+        if not self.edges:
+            return None
+        if self._grid is None:
+            self._build_grid()
+        cell, keys, rows = self._grid
+        cx, cy = int(np.floor(pos.x() / cell)), int(np.floor(pos.y() / cell))
+        key = (cx << 32) + (cy & 0xFFFFFFFF)
+        left, right = np.searchsorted(keys, key, "left"), np.searchsorted(keys, key, "right")
+        candidates = rows[left:right]
+        candidates = candidates[~self.dead[candidates]]
+        if not self.dim_filtered: candidates = candidates[~self.filtered[candidates]]  # Ocultas por el filtro
+        if not len(candidates):
+            return None
+        # Distancia del punto a cada segmento candidato
+        p = np.array([pos.x(), pos.y()])
+        a, b = self.start[candidates], self.end[candidates]
+        ab = b - a
+        t = np.clip(((p - a) * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-9), 0.0, 1.0)
+        dist = np.hypot(*(a + ab * t[:, None] - p).T)
+        best = int(np.argmin(dist))
+        return self.edges[candidates[best]] if dist[best] <= tolerance else None
+
+    # -----------------------
+    # Dibujo
+    # -----------------------
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    def paint(self, painter: QPainter, option, widget=None):
+        """Dibuja solo las aristas que cruzan la región expuesta, agrupadas por pluma"""
+        if not self.edges:
+            return
+        rect = option.exposedRect
+        lo = np.minimum(self.start, self.end)
+        hi = np.maximum(self.start, self.end)
+        visible = ((hi[:, 0] >= rect.left()) & (lo[:, 0] <= rect.right())
+                   & (hi[:, 1] >= rect.top()) & (lo[:, 1] <= rect.bottom()) & ~self.dead)
+        dimmed = visible & self.filtered if self.dim_filtered else np.zeros(len(self.edges), dtype=bool)
+        visible &= ~self.filtered
+
+        scene = self.scene()
+        highlighted = np.zeros(len(self.edges), dtype=bool)
+        matched = np.zeros(len(self.edges), dtype=bool)
+        if scene is not None:
+            for mask, edges in ((highlighted, scene.highlighted_path[1]), (matched, scene.search_matches[1])):
+                for e in edges:
+                    row = self.row_of.get(e)
+                    if row is not None: mask[row] = True
+            matched &= ~highlighted
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        thin = lod * self.normal_pen.widthF() < 1.0
+        painter.setBrush(Qt.NoBrush)
+        if dimmed.any():
+            painter.setPen(self.dim_pen)
+            painter.drawLines(array_to_polygon(np.stack([self.start[dimmed], self.end[dimmed]], axis=1).reshape(-1, 2)))
+        groups = ((self.normal_pen, visible & ~highlighted & ~matched), (self.search_pen, visible & matched),
+                  (self.highlight_pen, visible & highlighted))
+        for pen, mask in groups:
+            if not mask.any():
+                continue
+            normal = pen is self.normal_pen
+            painter.setPen(self.thin_pen if normal and thin else pen)
+            painter.drawLines(array_to_polygon(np.stack([self.start[mask], self.end[mask]], axis=1).reshape(-1, 2)))
+            if lod * ARROW_SIZE < MIN_ARROW_PX:
+                continue
+            tips = self.end[mask]
+            wings = np.stack([tips, self.wing1[mask], tips, self.wing2[mask]], axis=1).reshape(-1, 2)
+            painter.setPen((self.thin_pen if thin else self.arrow_pen) if normal else pen)
+            painter.drawLines(array_to_polygon(wings))
+
+        # Pesos: solo con suficiente zoom y si están visibles en la ventana
+        if lod >= LABEL_ZOOM_THRESHOLD and (scene is None or scene._weights_visible()):
+            mid = self.mid
+            inside = (visible & (mid[:, 0] >= rect.left()) & (mid[:, 0] <= rect.right())
+                      & (mid[:, 1] >= rect.top()) & (mid[:, 1] <= rect.bottom()))
+            self._paint_labels(painter, np.flatnonzero(inside)[:MAX_LABELS])
+
+    def _paint_labels(self, painter: QPainter, rows: np.ndarray):
+        """Dibuja los pesos sobre un fondo blanco en el punto medio de cada arista"""
+        painter.setFont(FONT_EDGE)
+        height = self._metrics.height()
+        bg_brush, bg_pen, text_pen = QColor(255, 255, 255, 230), QPen(QColor(120, 120, 120), 1), QPen(Qt.black)
+        for row in rows:
+            text = str(self.edges[row].weight)
+            if not text:
+                continue
+            width = self._label_widths.get(text)
+            if width is None:
+                width = self._label_widths[text] = self._metrics.horizontalAdvance(text)
+            x, y = self.mid[row]
+            box = QRectF(x - width / 2 - 4, y - height / 2 - 2, width + 8, height + 4)
+            painter.setPen(bg_pen); painter.setBrush(bg_brush)
+            painter.drawRect(box)
+            painter.setPen(text_pen)
+            painter.drawText(box, Qt.AlignCenter, text)
@@ -0,0 +1,96 @@
+"""
+Diálogo para filtrar el subgrafo visible
+"""
+from typing import Optional
+
+from PyQt5.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QComboBox,
+    QSpinBox,
+    QDoubleSpinBox,
+    QLineEdit,
+    QStackedWidget,
+    QWidget,
+)
+
+from graph_filter import FILTER_MODES, NEIGHBOURHOOD_DIRECTIONS, FilterSpec
+
+# Saltos máximos ofrecidos para el vecindario
+MAX_HOPS = 20
+
+# Límite de los rangos de peso en el diálogo
+MAX_WEIGHT = 1e9
+
+
+# -----------------------
+# FilterDialog
+# -----------------------
+class FilterDialog(QDialog):
+    """Pide el tipo de filtro (vecindario, etiqueta o peso), sus parámetros y qué hacer con el resto"""
+
+    def __init__(self, scene, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Filtrar Grafo")
+        form = QFormLayout(self)
+
+        self.kind_combo = QComboBox()
+        self.kind_combo.addItem("Vecindario de un nodo", "neighbourhood")
+        self.kind_combo.addItem("Etiqueta o ID", "label")
+        self.kind_combo.addItem("Rango de peso", "weight")
+        form.addRow("Filtro:", self.kind_combo)
+
+        # Una página de parámetros por tipo de filtro
+        self.pages = QStackedWidget()
+        neighbourhood = QWidget(); nf = QFormLayout(neighbourhood); nf.setContentsMargins(0, 0, 0, 0)
+        self.node_edit = QLineEdit(); self.node_edit.setPlaceholderText("ID de un nodo existente")
+        selected = [item.id for item in scene.selectedItems() if hasattr(item, "label")]
+        if selected: self.node_edit.setText(str(selected[0]))
+        nf.addRow("ID del nodo:", self.node_edit)
+        self.hops_spin = QSpinBox(); self.hops_spin.setRange(0, MAX_HOPS); self.hops_spin.setValue(1)
+        nf.addRow("Saltos (k):", self.hops_spin)
+        self.direction_combo = QComboBox()
+        for name, text in NEIGHBOURHOOD_DIRECTIONS.items(): self.direction_combo.addItem(text, name)
+        nf.addRow("Sentido:", self.direction_combo)
+        self.pages.addWidget(neighbourhood)
+
+        label = QWidget(); lf = QFormLayout(label); lf.setContentsMargins(0, 0, 0, 0)
+        self.label_edit = QLineEdit(); self.label_edit.setPlaceholderText("Texto contenido en la etiqueta o el ID")
+        lf.addRow("Contiene:", self.label_edit)
+        self.pages.addWidget(label)
+
+        weight = QWidget(); wf = QFormLayout(weight); wf.setContentsMargins(0, 0, 0, 0)
+        self.min_spin = QDoubleSpinBox(); self.min_spin.setRange(-MAX_WEIGHT, MAX_WEIGHT); self.min_spin.setDecimals(3)
+        self.max_spin = QDoubleSpinBox(); self.max_spin.setRange(-MAX_WEIGHT, MAX_WEIGHT); self.max_spin.setDecimals(3)
+        self.max_spin.setValue(10)
+        wf.addRow("Mínimo:", self.min_spin); wf.addRow("Máximo:", self.max_spin)
+        self.pages.addWidget(weight)
+        form.addRow(self.pages)
+        self.kind_combo.currentIndexChanged.connect(self.pages.setCurrentIndex)
+
+        self.mode_combo = QComboBox()
+        for name, text in FILTER_MODES.items(): self.mode_combo.addItem(text, name)
+        self.mode_combo.setCurrentIndex(self.mode_combo.findData(scene.filter_mode))
+        form.addRow("Resto del grafo:", self.mode_combo)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+
+    def spec(self) -> Optional[FilterSpec]:
+        """Filtro elegido; None si los parámetros no son válidos (por ejemplo, un ID no numérico)"""
+        kind = self.kind_combo.currentData()
+        if kind == "neighbourhood":
+            try: center = int(self.node_edit.text().strip())
+            except ValueError: return None
+            return FilterSpec(kind, (center, self.hops_spin.value(), self.direction_combo.currentData()))
+        if kind == "label":
+            text = self.label_edit.text().strip()
+            return FilterSpec(kind, (text,)) if text else None
+        lo, hi = sorted((self.min_spin.value(), self.max_spin.value()))
+        return FilterSpec(kind, (lo, hi))
+
+    def mode(self) -> str:
+        """Qué hacer con lo que queda fuera ("hide" u "dim")"""
+        return self.mode_combo.currentData()
@@ -0,0 +1,68 @@
+"""
+Diálogo para generar grafos sintéticos
+"""
+from PyQt5.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QComboBox,
+    QSpinBox,
+)
+
+from graph_generators import DEFAULT_DEGREE, GENERATORS, LAYOUTS, WEIGHT_DISTRIBUTIONS
+
+# Límite de nodos ofrecido en el diálogo
+MAX_GENERATED_NODES = 200000
+
+
+# -----------------------
+# GenerateGraphDialog
+# -----------------------
+class GenerateGraphDialog(QDialog):
+    """Pide el modelo, tamaño, pesos y acomodo del grafo a generar"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Generar Grafo")
+        form = QFormLayout(self)
+
+        self.kind_combo = QComboBox()
+        for name, (text, _) in GENERATORS.items(): self.kind_combo.addItem(text, name)
+        form.addRow("Modelo:", self.kind_combo)
+
+        self.nodes_spin = QSpinBox(); self.nodes_spin.setRange(1, MAX_GENERATED_NODES); self.nodes_spin.setValue(1000)
+        self.nodes_spin.setGroupSeparatorShown(True)
+        form.addRow("Nodos:", self.nodes_spin)
+
+        self.degree_spin = QSpinBox(); self.degree_spin.setRange(1, 50); self.degree_spin.setValue(DEFAULT_DEGREE)
+        self.degree_spin.setToolTip("Grado medio de salida (en Barabási–Albert, enlaces de cada nodo nuevo)")
+        form.addRow("Grado medio:", self.degree_spin)
+
+        self.weights_combo = QComboBox()
+        for name, (text, _) in WEIGHT_DISTRIBUTIONS.items(): self.weights_combo.addItem(text, name)
+        self.weights_combo.setCurrentIndex(self.weights_combo.findData("uniform"))
+        form.addRow("Pesos:", self.weights_combo)
+
+        self.layout_combo = QComboBox()
+        for name, (text, _) in LAYOUTS.items(): self.layout_combo.addItem(text, name)
+        self.layout_combo.setToolTip("Automático: cuadrícula, capas o círculo según el modelo; si no, fuerzas o aleatorio")
+        form.addRow("Acomodo:", self.layout_combo)
+
+        self.seed_spin = QSpinBox(); self.seed_spin.setRange(0, 2 ** 31 - 1)
+        self.seed_spin.setSpecialValueText("Aleatoria")  # 0 = sin semilla fija
+        form.addRow("Semilla:", self.seed_spin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+
+    def options(self) -> dict:
+        """Argumentos para generate_graph_data según lo elegido"""
+        return {
+            "kind": self.kind_combo.currentData(),
+            "n": self.nodes_spin.value(),
+            "weights": self.weights_combo.currentData(),
+            "layout": self.layout_combo.currentData(),
+            "seed": self.seed_spin.value() or None,
+            "degree": self.degree_spin.value(),
+        }
@@ -0,0 +1,219 @@
+"""
+Servicio de análisis del grafo con resultados en caché por versión
+"""
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# -----------------------
+# Métricas (funciones puras sobre un DiGraph)
+# -----------------------
+def degree_distribution(G: nx.DiGraph) -> Dict[str, Any]:
+    """Calcula la distribución de grados de entrada y salida"""
+    in_deg = Counter(d for _, d in G.in_degree())
+    out_deg = Counter(d for _, d in G.out_degree())
+    n = G.number_of_nodes()
+    return {
+        "in": dict(sorted(in_deg.items())),
+        "out": dict(sorted(out_deg.items())),
+        "max_in": max(in_deg) if in_deg else 0,
+        "max_out": max(out_deg) if out_deg else 0,
+        "mean": G.number_of_edges() / n if n else 0.0,
+    }
+
+
+def strongly_connected_components(G: nx.DiGraph) -> List[List[Hashable]]:
+    """Obtiene las componentes fuertemente conexas ordenadas de mayor a menor"""
+    comps = [sorted(c) for c in nx.strongly_connected_components(G)]
+    comps.sort(key=len, reverse=True)
+    return comps
+
+
+def topological_order(G: nx.DiGraph) -> Tuple[bool, Optional[List[Hashable]]]:
+    """
+    Retorna (True, orden topológico) o (False, None) si el grafo tiene ciclos
+    Nunca retorna None, que en GraphAnalytics significa "todavía calculando"
+    """
+    try:
+        return True, list(nx.topological_sort(G))
+    except nx.NetworkXUnfeasible:
+        return False, None
+
+
+def pagerank(G: nx.DiGraph, alpha: float = 0.85, tol: float = 1.0e-6, max_iter: int = 100) -> Dict[Hashable, float]:
+    """
+    Calcula PageRank por iteración de potencias (sin depender de SciPy)
+    Los nodos sin aristas salientes reparten su puntaje entre todos los nodos
+    """
+    n = G.number_of_nodes()
+    if n == 0:
+        return {}
+    nodes = list(G)
+    index = {v: i for i, v in enumerate(nodes)}
+    succ = [[index[w] for w in G.successors(v)] for v in nodes]
+    rank = [1.0 / n] * n
+    for _ in range(max_iter):
+        dangling = sum(rank[i] for i in range(n) if not succ[i])
+        base = (1.0 - alpha) / n + alpha * dangling / n
+        new = [base] * n
+        for i, out in enumerate(succ):
+            if out:
+                share = alpha * rank[i] / len(out)
+                for j in out:
+                    new[j] += share
+        err = sum(abs(new[i] - rank[i]) for i in range(n))
+        rank = new
+        if err < n * tol:
+            break
+    return {v: rank[i] for i, v in enumerate(nodes)}
+
+
+def reachable_from(G: nx.DiGraph, source: Hashable) -> List[Hashable]:
+    """Lista los nodos alcanzables desde el nodo origen (sin incluirlo)"""
+    if source not in G:
+        return []
+    return sorted(nx.descendants(G, source))
+
+
+# Métricas costosas: se calculan en un hilo de trabajo
+METRICS: Dict[str, Tuple[Callable, bool]] = {
+    "degree": (lambda G, _arg: degree_distribution(G), False),
+    "scc": (lambda G, _arg: strongly_connected_components(G), True),
+    "topological": (lambda G, _arg: topological_order(G), True),
+    "pagerank": (lambda G, _arg: pagerank(G), True),
+    "reachability": (reachable_from, True),
+}
+
+
+# -----------------------
+# Tarea en segundo plano
+# -----------------------
+class _TaskSignals(QObject):
+    """Señales de una tarea de análisis (QRunnable no es QObject)"""
+    finished = pyqtSignal(object, object)  # clave, resultado
+
+
+class _MetricTask(QRunnable):
+    """Calcula una métrica sobre una copia del grafo en el pool de hilos"""
+
+    def __init__(self, key: tuple, func: Callable, graph: nx.DiGraph, arg: Any):
+        super().__init__()
+        self.key = key
+        self.func = func
+        self.graph = graph
+        self.arg = arg
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.func(self.graph, self.arg)
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(self.key, result)
+
+
+# -----------------------
+# GraphAnalytics
+# -----------------------
+class GraphAnalytics(QObject):
+    """
+    Memoiza métricas del grafo usando como clave (métrica, argumento, versión del grafo)
+    La caché tiene tamaño acotado y descarta primero lo usado hace más tiempo
+    Los fallos del cálculo en segundo plano también se recuerdan por versión para no relanzarlo en bucle
+    """
+
+    result_ready = pyqtSignal(str, object)  # métrica, argumento
+
+    def __init__(self, scene, max_entries: int = 64, parent=None):
+        super().__init__(parent)
+        self.scene = scene
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._errors: "OrderedDict[tuple, Exception]" = OrderedDict()
+        self._pending: Dict[tuple, _MetricTask] = {}
+        self._pool = QThreadPool.globalInstance()
+
+    def _key(self, metric: str, arg: Any = None) -> tuple:
+        """Clave de caché ligada a la versión actual del grafo"""
+        return (metric, arg, self.scene.graph_version)
+
+    def _store(self, key: tuple, value: Any):
+        """Guarda un resultado y expulsa el menos reciente si se excede el límite"""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _snapshot(self) -> nx.DiGraph:
+        """Copia solo la estructura del grafo para usarla fuera del hilo principal"""
+        H = nx.DiGraph()
+        H.add_nodes_from(self.scene.G.nodes())
+        H.add_edges_from(self.scene.G.edges())
+        return H
+
+    def cached(self, metric: str, arg: Any = None, default: Any = None) -> Any:
+        """Retorna el resultado vigente si ya está en caché (no calcula nada)"""
+        key = self._key(metric, arg)
+        if key not in self._cache:
+            return default
+        self._cache.move_to_end(key)
+        return self._cache[key]
+
+    def error(self, metric: str, arg: Any = None) -> Optional[Exception]:
+        """Retorna la excepción si el cálculo en segundo plano falló con la versión actual del grafo"""
+        return self._errors.get(self._key(metric, arg))
+
+    def request(self, metric: str, arg: Any = None) -> Optional[Any]:
+        """
+        Retorna el resultado si está en caché; si no, lo calcula
+        Las métricas costosas se lanzan en segundo plano y se anuncian con result_ready
+        """
+        key = self._key(metric, arg)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if key in self._errors:
+            return None  # Ya falló con esta versión del grafo: ver error()
+        func, expensive = METRICS[metric]
+        if not expensive:
+            value = func(self.scene.G, arg)
+            self._store(key, value)
+            return value
+        if key not in self._pending:
+            task = _MetricTask(key, func, self._snapshot(), arg)
+            task.signals.finished.connect(self._on_task_finished)
+            self._pending[key] = task
+            self._pool.start(task)
+        return None
+
+    def compute(self, metric: str, arg: Any = None) -> Any:
+        """Calcula la métrica de forma síncrona, reutilizando la caché"""
+        key = self._key(metric, arg)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        func, _ = METRICS[metric]
+        value = func(self.scene.G, arg)
+        self._store(key, value)
+        return value
+
+    def _on_task_finished(self, key: tuple, result: Any):
+        """Recibe el resultado del hilo de trabajo en el hilo principal"""
+        self._pending.pop(key, None)
+        if isinstance(result, Exception):
+            self._errors[key] = result
+            while len(self._errors) > self.max_entries:
+                self._errors.popitem(last=False)
+        else:
+            self._store(key, result)
+        # Solo anunciar resultados que siguen vigentes
+        if key[2] == self.scene.graph_version:
+            self.result_ready.emit(key[0], key[1])
+
+    def clear(self):
+        """Vacía la caché de resultados y de fallos"""
+        self._cache.clear()
+        self._errors.clear()
@@ -0,0 +1,90 @@
+"""
+Filtros de subgrafo: vecindario a k saltos, coincidencias de etiqueta y rango de pesos
+"""
+from typing import NamedTuple, Optional, Set, Tuple
+
+import networkx as nx
+
+from search_index import SearchIndex
+
+# Formas de mostrar lo que queda fuera del filtro: nombre -> texto para la interfaz
+FILTER_MODES = {"hide": "Ocultar", "dim": "Atenuar"}
+
+# Opacidad de los elementos filtrados en el modo "dim"
+DIM_OPACITY = 0.12
+
+# Sentido de los saltos en el vecindario: nombre -> texto para la interfaz
+NEIGHBOURHOOD_DIRECTIONS = {"both": "Ambos sentidos", "out": "Salientes", "in": "Entrantes"}
+
+
+class FilterSpec(NamedTuple):
+    """
+    Filtro declarativo; se vuelve a evaluar cada vez que cambia el grafo
+    kind: "neighbourhood" (args: nodo, k, sentido), "label" (args: texto) o "weight" (args: mínimo, máximo)
+    """
+    kind: str
+    args: tuple
+
+
+class FilterResult(NamedTuple):
+    """Nodos y aristas (origen, destino) que quedan visibles"""
+    nodes: Set[int]
+    edges: Set[Tuple[int, int]]
+
+
+def induced_edges(G: nx.DiGraph, nodes: Set[int]) -> Set[Tuple[int, int]]:
+    """Aristas con ambos extremos en el conjunto de nodos"""
+    succ = G.succ
+    return {(a, b) for a in nodes for b in succ[a] if b in nodes}
+
+
+def neighbourhood(G: nx.DiGraph, center: int, k: int, direction: str = "both") -> FilterResult:
+    """Nodos a lo sumo a k saltos del centro (búsqueda en anchura) y las aristas entre ellos"""
+    seen = {center}
+    frontier = {center}
+    for _ in range(max(0, k)):
+        reached = set()
+        for v in frontier:
+            if direction != "in": reached.update(G.succ[v])
+            if direction != "out": reached.update(G.pred[v])
+        frontier = reached - seen
+        if not frontier:
+            break
+        seen |= frontier
+    return FilterResult(seen, induced_edges(G, seen))
+
+
+def label_matches(G: nx.DiGraph, index: SearchIndex, query: str) -> FilterResult:
+    """Nodos cuya etiqueta o ID contiene el texto y las aristas entre ellos"""
+    nodes = {nid for nid in index.match_nodes(query) if nid in G}
+    return FilterResult(nodes, induced_edges(G, nodes))
+
+
+def weight_range(index: SearchIndex, lo: float, hi: float) -> FilterResult:
+    """Aristas con peso entre lo y hi (inclusive) y sus extremos"""
+    keys, _ = index.search_edges(lo, hi, limit=None)
+    edges = set(keys)
+    return FilterResult({a for a, _ in edges} | {b for _, b in edges}, edges)
+
+
+def evaluate(spec: FilterSpec, G: nx.DiGraph, index: SearchIndex) -> Optional[FilterResult]:
+    """Calcula el subgrafo visible de un filtro; None si ya no aplica (por ejemplo, se borró el nodo central)"""
+    if spec.kind == "neighbourhood":
+        center, k, direction = spec.args
+        return neighbourhood(G, center, k, direction) if center in G else None
+    if spec.kind == "label":
+        return label_matches(G, index, spec.args[0])
+    if spec.kind == "weight":
+        return weight_range(index, *spec.args)
+    raise ValueError(f"Filtro desconocido: {spec.kind}")
+
+
+def describe(spec: FilterSpec) -> str:
+    """Texto breve del filtro para la barra de estado y la matriz"""
+    if spec.kind == "neighbourhood":
+        center, k, direction = spec.args
+        return f"vecindario de {center} a {k} salto{'s' if k != 1 else ''} ({NEIGHBOURHOOD_DIRECTIONS[direction].lower()})"
+    if spec.kind == "label":
+        return f"etiqueta contiene \"{spec.args[0]}\""
+    lo, hi = spec.args
+    return f"peso entre {lo:g} y {hi:g}"
@@ -0,0 +1,513 @@
+"""
+Importación y exportación de formatos estándar de grafos: GraphML, GEXF, DOT y lista de aristas
+
+Los lectores producen el mismo diccionario que el formato JSON del proyecto (nodos con etiqueta y
+posición, aristas con peso). GraphML y GEXF se leen con iterparse liberando cada elemento procesado,
+así la memoria depende del grafo y no del tamaño del XML. Los escritores generan el archivo línea a línea.
+"""
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from graph_generators import fit_to_canvas, grid_positions
+from utils import DEFAULT_NODE_RADIUS
+
+
+# -----------------------
+# Utilidades comunes
+# -----------------------
+@lru_cache(maxsize=None)
+def _local(tag: str) -> str:
+    """Nombre de la etiqueta XML sin espacio de nombres"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _to_float(value) -> Optional[float]:
+    """Convierte a número; None si no es posible"""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _format_weight(weight: str) -> str:
+    """Quita el '.0' de los pesos enteros escritos como reales por otras herramientas"""
+    weight = str(weight)
+    if "." not in weight:
+        return weight
+    number = _to_float(weight)
+    return str(int(number)) if number is not None and number.is_integer() else weight
+
+
+class _IdMap:
+    """
+    Asigna IDs enteros a los identificadores externos en orden de aparición
+    Los que ya son enteros se conservan si están libres; el resto toma el siguiente libre
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.used = set()
+        self._next = 0
+
+    def new_id(self, key: str) -> int:
+        """Asigna el ID de un identificador que aún no se vio"""
+        if key.isdigit() and int(key) not in self.used:
+            nid = int(key)
+        else:
+            while self._next in self.used: self._next += 1
+            nid = self._next
+        self.ids[key] = nid
+        self.used.add(nid)
+        return nid
+
+
+class _GraphBuilder:
+    """Acumula nodos y aristas en el formato del proyecto a medida que se leen"""
+
+    def __init__(self):
+        self.id_map = _IdMap()
+        self.nodes: Dict[int, dict] = {}
+        self.edges: List[dict] = []
+
+    def node_id(self, key: str) -> int:
+        """ID del nodo con ese identificador (lo crea con el identificador como etiqueta si es nuevo)"""
+        nid = self.id_map.ids.get(key)
+        if nid is None:
+            key = str(key)
+            nid = self.id_map.new_id(key)
+            self.nodes[nid] = {"id": nid, "label": key}
+        return nid
+
+    def node(self, key: str, label: Optional[str] = None, x=None, y=None, radius=None) -> int:
+        """Registra (o completa) un nodo y retorna su ID"""
+        nid = self.node_id(key)
+        node = self.nodes[nid]
+        if label is not None: node["label"] = str(label)
+        x, y = _to_float(x), _to_float(y)
+        if x is not None and y is not None: node["x"], node["y"] = x, y
+        radius = _to_float(radius)
+        if radius is not None and radius > 0: node["radius"] = int(round(radius))
+        return nid
+
+    def edge(self, source: str, target: str, weight="", directed: bool = True):
+        """Registra una arista (y su inversa si el grafo no es dirigido)"""
+        a, b = self.node_id(source), self.node_id(target)
+        weight = "" if not weight else _format_weight(weight)
+        self.edges.append({"a": a, "b": b, "weight": weight})
+        if not directed and a != b:
+            self.edges.append({"a": b, "b": a, "weight": weight})
+
+    def data(self) -> dict:
+        """Diccionario final; los nodos sin posición se acomodan en cuadrícula"""
+        nodes = list(self.nodes.values())
+        _place_missing(nodes)
+        return {"nodes": nodes, "edges": self.edges}
+
+
+def _place_missing(nodes: List[dict]):
+    """
+    Da posición a los nodos que no la traen: si ninguno la tiene, cuadrícula ajustada al lienzo
+    (con radio reducido en grafos grandes); si no, cuadrícula a la derecha de los ya ubicados
+    """
+    missing = [n for n in nodes if "x" not in n]
+    if not missing:
+        return
+    xy = grid_positions(len(missing), [], None)
+    if len(missing) == len(nodes):
+        xy, radius = fit_to_canvas(xy, len(missing))
+        for n in missing: n.setdefault("radius", radius)
+    else:
+        spacing = 3.0 * DEFAULT_NODE_RADIUS
+        right = max(n["x"] for n in nodes if "x" in n) + spacing
+        top = min(n["y"] for n in nodes if "y" in n)
+        xy = xy * spacing + (right, top)
+    for n, (x, y) in zip(missing, xy.tolist()):
+        n["x"], n["y"] = x, y
+
+
+def _iter_elements(path: str, tags: Tuple[str, ...]) -> Iterator[Tuple[str, ET.Element]]:
+    """
+    Recorre el XML en streaming y entrega (etiqueta, elemento) al cerrarse cada etiqueta pedida
+    El elemento <graph> se entrega al abrirse (sus atributos definen la dirección por defecto)
+    Tras procesarlo, el elemento se elimina de su padre para no acumular el árbol en memoria
+    """
+    stack: List[ET.Element] = []
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            stack.append(elem)
+            if tag == "graph" and tag in tags: yield tag, elem
+            continue
+        stack.pop()
+        if tag in tags and tag != "graph":
+            yield tag, elem
+            if stack: stack[-1].remove(elem)
+            elem.clear()
+
+
+# -----------------------
+# GraphML
+# -----------------------
+def read_graphml(path: str) -> dict:
+    """
+    Lee GraphML: etiqueta de las claves 'label'/'name', posición de 'x'/'y' (o geometría de yEd)
+    y peso de la clave 'weight' (o la etiqueta de la arista)
+    """
+    builder = _GraphBuilder()
+    keys: Dict[str, str] = {}  # id de la clave -> nombre del atributo
+    directed = True
+    for tag, elem in _iter_elements(path, ("key", "graph", "node", "edge")):
+        if tag == "key":
+            keys[elem.get("id")] = (elem.get("attr.name") or elem.get("id")).lower()
+        elif tag == "graph":
+            directed = elem.get("edgedefault", "directed") != "undirected"
+        else:
+            values = {}
+            for child in elem.iter():
+                name = _local(child.tag)
+                if name == "data":
+                    values.setdefault(keys.get(child.get("key"), child.get("key", "")).lower(), (child.text or "").strip())
+                elif name == "Geometry":  # yEd guarda la esquina superior izquierda y el tamaño
+                    w, h = _to_float(child.get("width")) or 0.0, _to_float(child.get("height")) or 0.0
+                    values.setdefault("x", (_to_float(child.get("x")) or 0.0) + w / 2)
+                    values.setdefault("y", (_to_float(child.get("y")) or 0.0) + h / 2)
+                    values.setdefault("radius", max(w, h) / 2 or None)
+                elif name == "NodeLabel" and child.text and child.text.strip():
+                    values.setdefault("label", child.text.strip())
+            if tag == "node":
+                builder.node(elem.get("id"), values.get("label", values.get("name")), values.get("x"), values.get("y"), values.get("radius"))
+            else:
+                edge_directed = directed if elem.get("directed") is None else elem.get("directed") == "true"
+                builder.edge(elem.get("source"), elem.get("target"), values.get("weight", values.get("label", "")), edge_directed)
+    return builder.data()
+
+
+def write_graphml(data: dict, f: TextIO):
+    """Escribe GraphML con claves label, x, y, radius (nodos) y weight (aristas)"""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    f.write('  <key id="label" for="node" attr.name="label" attr.type="string"/>\n')
+    f.write('  <key id="x" for="node" attr.name="x" attr.type="double"/>\n')
+    f.write('  <key id="y" for="node" attr.name="y" attr.type="double"/>\n')
+    f.write('  <key id="radius" for="node" attr.name="radius" attr.type="int"/>\n')
+    f.write('  <key id="weight" for="edge" attr.name="weight" attr.type="string"/>\n')
+    f.write('  <graph id="G" edgedefault="directed">\n')
+    for n in data["nodes"]:
+        f.write(f'    <node id="{n["id"]}"><data key="label">{escape(str(n["label"]))}</data>'
+                f'<data key="x">{n["x"]}</data><data key="y">{n["y"]}</data>'
+                f'<data key="radius">{n.get("radius", DEFAULT_NODE_RADIUS)}</data></node>\n')
+    for e in data["edges"]:
+        f.write(f'    <edge source="{e["a"]}" target="{e["b"]}"><data key="weight">{escape(str(e["weight"]))}</data></edge>\n')
+    f.write('  </graph>\n</graphml>\n')
+
+
+# -----------------------
+# GEXF
+# -----------------------
+def read_gexf(path: str) -> dict:
+    """Lee GEXF: etiqueta de los nodos, posición de viz:position y peso del atributo weight (o label)"""
+    builder = _GraphBuilder()
+    directed = True
+    for tag, elem in _iter_elements(path, ("graph", "node", "edge")):
+        if tag == "graph":
+            directed = elem.get("defaultedgetype", "directed") != "undirected"
+        elif tag == "node":
+            x = y = radius = None
+            for child in elem.iter():
+                name = _local(child.tag)
+                if name == "position": x, y = _to_float(child.get("x")), _to_float(child.get("y"))
+                elif name == "size": radius = child.get("value")
+            # GEXF usa el eje y hacia arriba
+            builder.node(elem.get("id"), elem.get("label"), x, -y if y is not None else None, radius)
+        else:
+            weight = elem.get("weight", elem.get("label", ""))
+            edge_type = elem.get("type")
+            builder.edge(elem.get("source"), elem.get("target"), weight, edge_type != "undirected" if edge_type else directed)
+    return builder.data()
+
+
+def write_gexf(data: dict, f: TextIO):
+    """Escribe GEXF 1.3 con posiciones y tamaños (viz); el peso va en weight si es numérico y siempre en label"""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write('<gexf xmlns="http://gexf.net/1.3" xmlns:viz="http://gexf.net/1.3/viz" version="1.3">\n')
+    f.write('  <graph defaultedgetype="directed">\n    <nodes>\n')
+    for n in data["nodes"]:
+        f.write(f'      <node id="{n["id"]}" label={quoteattr(str(n["label"]))}>'
+                f'<viz:position x="{n["x"]}" y="{-n["y"]}" z="0.0"/>'
+                f'<viz:size value="{n.get("radius", DEFAULT_NODE_RADIUS)}"/></node>\n')
+    f.write('    </nodes>\n    <edges>\n')
+    for i, e in enumerate(data["edges"]):
+        weight = str(e["weight"])
+        numeric = f' weight="{weight}"' if _to_float(weight) is not None else ""
+        f.write(f'      <edge id="{i}" source="{e["a"]}" target="{e["b"]}"{numeric} label={quoteattr(weight)}/>\n')
+    f.write('    </edges>\n  </graph>\n</gexf>\n')
+
+
+# -----------------------
+# DOT (Graphviz)
+# -----------------------
+_DOT_TOKEN = re.compile(r'''
+    (?P<skip>\s+ | //[^\n]* | /\*.*?\*/ | ^\#[^\n]*)    # Espacios y comentarios (se descartan)
+  | (?P<str>"(?:[^"\\]|\\.)*")                        # Cadena entre comillas
+  | (?P<op>->|--|[\[\]{};,=:])                        # Operadores
+  | (?P<id>-?(?:\.\d+|\d+(?:\.\d*)?)(?![\w\x80-\uffff.])     # Número (si le siguen letras, como 1a, es un ID)
+          | [A-Za-z_\x80-\uffff\d][\w\x80-\uffff]*)                 # Identificador
+  | (?P<bad>.)
+''', re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+
+def _dot_tokens(text: str) -> Iterator[Tuple[str, str]]:
+    """Divide el texto DOT en tokens (tipo, valor); las cadenas se devuelven sin comillas"""
+    for match in _DOT_TOKEN.finditer(text):
+        kind, value = match.lastgroup, match.group()
+        if kind == "skip":
+            continue
+        if kind == "id":
+            yield "id", value
+        elif kind == "op":
+            yield value, value
+        elif kind == "str":
+            value = value[1:-1]
+            yield "id", value.replace('\\"', '"').replace("\\\n", "") if "\\" in value else value
+        else:
+            raise ValueError(f"DOT: carácter inesperado en la posición {match.start()}: {text[match.start():match.start() + 20]!r}")
+
+
+def read_dot(path: str) -> dict:
+    """
+    Lee el subconjunto común de DOT: nodos con atributos, cadenas de aristas (a -> b -> c), subgrafos
+    aplanados y listas de nodos como extremo de arista (a -> {b c} crea una arista por miembro).
+    Usa label, pos ("x,y" en puntos, eje y hacia arriba) y weight (o label de la arista)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tokens = list(_dot_tokens(f.read()))
+    builder = _GraphBuilder()
+    directed = True
+    i = 0
+
+    def attr_list(i: int) -> Tuple[Dict[str, str], int]:
+        attrs = {}
+        while i < len(tokens) and tokens[i][0] == "[":
+            i += 1
+            while i < len(tokens) and tokens[i][0] != "]":
+                if tokens[i][0] == "id" and i + 2 < len(tokens) and tokens[i + 1][0] == "=":
+                    attrs[tokens[i][1].lower()] = tokens[i + 2][1]
+                    i += 3
+                else:
+                    i += 1
+            i += 1
+        return attrs, i
+
+    def group_bounds(i: int) -> Optional[Tuple[int, int]]:
+        """Para un subgrafo que empieza en i ('subgraph' [nombre] '{' o '{'): (índice de '{', índice tras su '}')"""
+        if tokens[i][0] == "id":
+            i += 2 if i + 1 < len(tokens) and tokens[i + 1][0] == "id" else 1
+        if i >= len(tokens) or tokens[i][0] != "{":
+            return None
+        depth = 0
+        for j in range(i, len(tokens)):
+            if tokens[j][0] == "{": depth += 1
+            elif tokens[j][0] == "}":
+                depth -= 1
+                if depth == 0: return i, j + 1
+        return None
+
+    def is_group(i: int) -> bool:
+        return i < len(tokens) and (tokens[i][0] == "{" or (tokens[i][0] == "id" and tokens[i][1].lower() == "subgraph"))
+
+    def endpoint(i: int) -> Tuple[List[str], int]:
+        """Extremo de arista: un nodo (el puerto se ignora) o un subgrafo con una lista de nodos"""
+        if not is_group(i):
+            name, i = tokens[i][1], i + 1
+            if i + 1 < len(tokens) and tokens[i][0] == ":": i += 2  # Puerto: se ignora
+            return [name], i
+        bounds = group_bounds(i)
+        if bounds is None:
+            raise ValueError("DOT: subgrafo sin cerrar usado como extremo de arista")
+        members = []
+        for kind, value in tokens[bounds[0] + 1:bounds[1] - 1]:
+            if kind == "id": members.append(value)
+            elif kind not in (";", ","):
+                raise ValueError(f"DOT: '{value}' dentro de un subgrafo usado como extremo de arista no está soportado "
+                                 "(solo listas de nodos como a -> {b c})")
+        return members, bounds[1]
+
+    def edge_follows(i: int) -> bool:
+        return i + 1 < len(tokens) and tokens[i][0] in ("->", "--") and (tokens[i + 1][0] == "id" or is_group(i + 1))
+
+    while i < len(tokens):
+        kind, value = tokens[i]
+        low = value.lower()
+        if kind == "id" and low in ("graph", "node", "edge") and i + 1 < len(tokens) and tokens[i + 1][0] == "[":
+            _, i = attr_list(i + 1)  # Atributos por defecto: se ignoran
+            continue
+        if kind == "id" and low == "strict":
+            i += 1
+            continue
+        if kind == "id" and low in ("graph", "digraph"):
+            # Encabezado: [strict] (graph | digraph) [nombre] {
+            directed = low == "digraph"
+            i += 2 if i + 1 < len(tokens) and tokens[i + 1][0] == "id" else 1
+            continue
+        if is_group(i):
+            bounds = group_bounds(i)
+            if bounds is not None and edge_follows(bounds[1]):
+                i = _read_dot_edges(i, endpoint, edge_follows, attr_list, builder, directed)
+                continue
+        if kind == "id" and low == "subgraph":
+            i += 2 if i + 1 < len(tokens) and tokens[i + 1][0] == "id" else 1
+            continue
+        if kind != "id":
+            i += 1  # '{', '}', ';', ','
+            continue
+        if i + 1 < len(tokens) and tokens[i + 1][0] == "=":
+            i += 3  # Atributo del grafo (a = b)
+            continue
+
+        # Nodo o cadena de aristas
+        _, j = endpoint(i)
+        if edge_follows(j):
+            i = _read_dot_edges(i, endpoint, edge_follows, attr_list, builder, directed)
+            continue
+        attrs, i = attr_list(j)
+        x = y = None
+        if "pos" in attrs:
+            parts = attrs["pos"].rstrip("!").split(",")
+            if len(parts) >= 2 and _to_float(parts[0]) is not None and _to_float(parts[1]) is not None:
+                x, y = _to_float(parts[0]), -_to_float(parts[1])
+        builder.node(value, attrs.get("label"), x, y)
+    return builder.data()
+
+
+def _read_dot_edges(i: int, endpoint, edge_follows, attr_list, builder: "_GraphBuilder", directed: bool) -> int:
+    """Lee una cadena de aristas desde i (a -> b -> {c d} [atributos]); cada extremo vale por todos sus nodos"""
+    ends, i = endpoint(i)
+    chain = [ends]
+    while edge_follows(i):
+        ends, i = endpoint(i + 1)
+        chain.append(ends)
+    attrs, i = attr_list(i)
+    weight = attrs.get("weight", attrs.get("label", ""))
+    for sources, targets in zip(chain, chain[1:]):
+        for a in sources:
+            for b in targets:
+                builder.edge(a, b, weight, directed)
+    return i
+
+
+def _dot_quote(value) -> str:
+    """Cadena DOT entre comillas"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(data: dict, f: TextIO):
+    """Escribe un digraph con label y pos (fija, eje y hacia arriba) en los nodos y el peso como label de la arista"""
+    f.write("digraph G {\n")
+    for n in data["nodes"]:
+        f.write(f'  {n["id"]} [label={_dot_quote(n["label"])}, pos="{n["x"]},{-n["y"]}!"];\n')
+    for e in data["edges"]:
+        weight = str(e["weight"])
+        extra = f", weight={weight}" if weight.isdigit() else ""
+        f.write(f'  {e["a"]} -> {e["b"]} [label={_dot_quote(weight)}{extra}];\n')
+    f.write("}\n")
+
+
+# -----------------------
+# Lista de aristas
+# -----------------------
+# Primeras columnas que indican una fila de encabezado en archivos CSV
+EDGE_LIST_HEADERS = ("source", "from", "origen")
+
+def read_edge_list(path: str) -> dict:
+    """
+    Lee una arista por línea: 'origen destino [peso]' separados por espacios, tabuladores o comas
+    Una línea con un solo valor declara un nodo aislado; '#' y '%' inician comentarios
+    """
+    builder = _GraphBuilder()
+    first = True
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("%"):
+                continue
+            parts = [p for p in re.split(r"[\s,;]+", line) if p]
+            if first and parts[0].lower() in EDGE_LIST_HEADERS:
+                first = False
+                continue  # Encabezado de CSV (source,target,weight)
+            first = False
+            if len(parts) == 1:
+                builder.node(parts[0])
+            elif len(parts) >= 2:
+                builder.edge(parts[0], parts[1], parts[2] if len(parts) > 2 else "")
+    return builder.data()
+
+
+def write_edge_list(data: dict, f: TextIO):
+    """Escribe 'origen destino peso' por arista y los nodos aislados en líneas propias"""
+    connected = set()
+    for e in data["edges"]:
+        connected.update((e["a"], e["b"]))
+        weight = str(e["weight"]).replace(" ", "_")
+        f.write(f'{e["a"]} {e["b"]} {weight}\n' if weight else f'{e["a"]} {e["b"]}\n')
+    for n in data["nodes"]:
+        if n["id"] not in connected: f.write(f'{n["id"]}\n')
+
+
+# -----------------------
+# API
+# -----------------------
+def _read_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(data: dict, f: TextIO):
+    json.dump(data, f, indent=2)
+
+
+# Nombre -> (descripción para los diálogos, extensiones, lector, escritor)
+FORMATS: Dict[str, Tuple[str, Tuple[str, ...], Callable[[str], dict], Callable[[dict, TextIO], None]]] = {
+    "json": ("Grafo JSON", (".json",), _read_json, _write_json),
+    "graphml": ("GraphML", (".graphml", ".xml"), read_graphml, write_graphml),
+    "gexf": ("GEXF", (".gexf",), read_gexf, write_gexf),
+    "dot": ("Graphviz DOT", (".dot", ".gv"), read_dot, write_dot),
+    "edgelist": ("Lista de aristas", (".edgelist", ".edges", ".txt", ".csv", ".tsv"), read_edge_list, write_edge_list),
+}
+
+
+def format_for_path(path: str) -> str:
+    """Formato según la extensión del archivo (JSON si no se reconoce)"""
+    suffix = Path(path).suffix.lower()
+    for name, (_, extensions, _, _) in FORMATS.items():
+        if suffix in extensions:
+            return name
+    return "json"
+
+
+def file_filter(name: Optional[str] = None) -> str:
+    """Filtro para QFileDialog: un formato, o todos los soportados si name es None"""
+    if name is not None:
+        text, extensions, _, _ = FORMATS[name]
+        return f"{text} ({' '.join('*' + ext for ext in extensions)})"
+    patterns = " ".join("*" + ext for _, extensions, _, _ in FORMATS.values() for ext in extensions)
+    return ";;".join([f"Grafos ({patterns})"] + [file_filter(n) for n in FORMATS])
+
+
+def read_graph(path: str) -> dict:
+    """Lee un grafo en cualquiera de los formatos soportados y lo retorna en el formato del proyecto"""
+    return FORMATS[format_for_path(path)][2](path)
+
+
+def write_graph(data: dict, path: str, name: Optional[str] = None):
+    """Escribe el diccionario del proyecto en el formato indicado (o el de la extensión)"""
+    with open(path, "w", encoding="utf-8") as f:
+        FORMATS[name or format_for_path(path)][3](data, f)
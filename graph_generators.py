@@ -0,0 +1,235 @@
+"""
+Generadores de grafos sintéticos (pruebas de carga y demostraciones)
+
+Produce grafos en el formato de archivo del proyecto, con pesos y posiciones iniciales.
+También se puede usar sin ventana desde la línea de comandos:
+
+    python graph_generators.py barabasi_albert 50000 --weights exponential --output grafo.json
+"""
+import argparse
+import json
+import math
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from utils import DEFAULT_NODE_RADIUS, SCENE_FINITE_RECT
+
+# Grado medio de salida por defecto (Erdős–Rényi, DAG) y enlaces por nodo nuevo (Barabási–Albert)
+DEFAULT_DEGREE = 3
+
+# Probabilidad de recablear cada arista en el modelo de mundo pequeño
+DEFAULT_REWIRE = 0.1
+
+# Máximo de nodos para el acomodo por fuerzas (más allá se usa uno aleatorio): desde 500 nodos
+# networkx.spring_layout necesita SciPy, que no es dependencia
+SPRING_MAX_NODES = 499
+
+# Margen entre los nodos generados y el borde del área de trabajo
+LAYOUT_MARGIN = 200.0
+
+# Radio mínimo de los nodos al reducirlos para que un grafo grande quepa en el lienzo
+MIN_GENERATED_RADIUS = 6
+
+Edges = List[Tuple[int, int]]
+Positions = np.ndarray  # (n, 2)
+
+
+# -----------------------
+# Modelos de grafo
+# -----------------------
+def _orient(rnd: random.Random, edges) -> Edges:
+    """Da una dirección al azar a cada arista de un grafo no dirigido"""
+    return [(a, b) if rnd.random() < 0.5 else (b, a) for a, b in edges]
+
+
+def erdos_renyi(n: int, rnd: random.Random, degree: int = DEFAULT_DEGREE, **_) -> Edges:
+    """Aristas independientes con probabilidad fija (grado medio de salida = degree)"""
+    p = min(1.0, degree / max(1, n - 1))
+    return list(nx.fast_gnp_random_graph(n, p, seed=rnd.randrange(2 ** 32), directed=True).edges())
+
+
+def barabasi_albert(n: int, rnd: random.Random, degree: int = DEFAULT_DEGREE, **_) -> Edges:
+    """Enlace preferencial: cada nodo nuevo apunta a degree nodos existentes (aparecen concentradores)"""
+    m = max(1, min(degree, n - 1))
+    G = nx.barabasi_albert_graph(n, m, seed=rnd.randrange(2 ** 32)) if n > m else nx.empty_graph(n)
+    return [(max(a, b), min(a, b)) for a, b in G.edges()]
+
+
+def grid(n: int, rnd: random.Random, **_) -> Edges:
+    """Cuadrícula de filas x columnas con aristas hacia la derecha y hacia abajo"""
+    cols = max(1, math.ceil(math.sqrt(n)))
+    G = nx.grid_2d_graph(math.ceil(n / cols), cols)
+    index = lambda rc: rc[0] * cols + rc[1]
+    return [(index(a), index(b)) for a, b in G.edges() if index(a) < n and index(b) < n]
+
+
+def random_dag(n: int, rnd: random.Random, degree: int = DEFAULT_DEGREE, **_) -> Edges:
+    """Grafo acíclico: aristas al azar que siempre van de un id menor a uno mayor"""
+    p = min(1.0, 2 * degree / max(1, n - 1))
+    G = nx.fast_gnp_random_graph(n, p, seed=rnd.randrange(2 ** 32), directed=True)
+    return [(a, b) for a, b in G.edges() if a < b]
+
+
+def small_world(n: int, rnd: random.Random, degree: int = DEFAULT_DEGREE, rewire: float = DEFAULT_REWIRE, **_) -> Edges:
+    """Modelo de Watts–Strogatz: anillo con vecinos cercanos y algunos atajos recableados"""
+    k = max(2, min(2 * degree, n - 1))
+    G = nx.watts_strogatz_graph(n, k, rewire, seed=rnd.randrange(2 ** 32)) if n > 2 else nx.path_graph(n)
+    return _orient(rnd, G.edges())
+
+
+# Nombre -> (texto para la interfaz, función generadora)
+GENERATORS: Dict[str, Tuple[str, Callable[..., Edges]]] = {
+    "erdos_renyi": ("Aleatorio (Erdős–Rényi)", erdos_renyi),
+    "barabasi_albert": ("Libre de escala (Barabási–Albert)", barabasi_albert),
+    "grid": ("Cuadrícula", grid),
+    "random_dag": ("DAG aleatorio", random_dag),
+    "small_world": ("Mundo pequeño (Watts–Strogatz)", small_world),
+}
+
+
+# -----------------------
+# Distribuciones de pesos
+# -----------------------
+# Nombre -> (texto para la interfaz, función que genera m pesos enteros)
+WEIGHT_DISTRIBUTIONS: Dict[str, Tuple[str, Callable[[np.random.Generator, int], np.ndarray]]] = {
+    "constant": ("Constante (1)", lambda g, m: np.ones(m, dtype=np.int64)),
+    "uniform": ("Uniforme (1-100)", lambda g, m: g.integers(1, 101, m)),
+    "normal": ("Normal (media 50)", lambda g, m: np.clip(np.rint(g.normal(50, 15, m)), 1, None).astype(np.int64)),
+    "exponential": ("Exponencial (media 10)", lambda g, m: np.ceil(g.exponential(10, m)).astype(np.int64)),
+}
+
+
+# -----------------------
+# Acomodo inicial
+# -----------------------
+def _random_positions(n: int, edges: Edges, rng: np.random.Generator) -> Positions:
+    return rng.random((n, 2))
+
+
+def _circular_positions(n: int, edges: Edges, rng: np.random.Generator) -> Positions:
+    angle = np.linspace(0.0, 2 * math.pi, n, endpoint=False)
+    return np.stack([np.cos(angle), np.sin(angle)], axis=1)
+
+
+def grid_positions(n: int, edges: Edges, rng: np.random.Generator) -> Positions:
+    cols = max(1, math.ceil(math.sqrt(n)))
+    ids = np.arange(n)
+    return np.stack([ids % cols, ids // cols], axis=1).astype(float)
+
+
+def _layered_positions(n: int, edges: Edges, rng: np.random.Generator) -> Positions:
+    """Capas por camino más largo siguiendo las aristas de id menor a mayor (las demás se ignoran)"""
+    layer = np.zeros(n, dtype=np.int64)
+    for a, b in sorted(edges):
+        if a < b and layer[b] <= layer[a]: layer[b] = layer[a] + 1
+    xy = np.zeros((n, 2))
+    for depth in np.unique(layer):
+        members = np.flatnonzero(layer == depth)
+        xy[members, 0] = np.arange(len(members)) - (len(members) - 1) / 2.0
+        xy[members, 1] = depth * max(1.0, math.sqrt(n) / 4)
+    return xy
+
+
+def _spring_positions(n: int, edges: Edges, rng: np.random.Generator) -> Positions:
+    if n > SPRING_MAX_NODES:
+        return _random_positions(n, edges, rng)
+    G = nx.Graph(); G.add_nodes_from(range(n)); G.add_edges_from(edges)
+    pos = nx.spring_layout(G, seed=int(rng.integers(2 ** 31)))  # Versión densa de NumPy (sin SciPy)
+    return np.array([pos[i] for i in range(n)])
+
+
+# Nombre -> (texto para la interfaz, función de acomodo con coordenadas en cualquier escala)
+LAYOUTS: Dict[str, Tuple[str, Callable[[int, Edges, np.random.Generator], Positions]]] = {
+    "auto": ("Automático", None),
+    "random": ("Aleatorio", _random_positions),
+    "circular": ("Circular", _circular_positions),
+    "grid": ("Cuadrícula", grid_positions),
+    "layered": ("Por capas", _layered_positions),
+    "spring": (f"Fuerzas (hasta {SPRING_MAX_NODES} nodos)", _spring_positions),
+}
+
+# Acomodo usado con "auto" según el modelo
+AUTO_LAYOUT = {"grid": "grid", "random_dag": "layered", "small_world": "circular"}
+
+
+def fit_to_canvas(xy: Positions, n: int) -> Tuple[Positions, int]:
+    """
+    Escala las posiciones para que cada nodo tenga espacio (unos 3 radios) y todo quepa en el lienzo
+    Si no alcanza el área, se reduce el radio de los nodos; retorna (posiciones, radio)
+    """
+    usable = min(SCENE_FINITE_RECT.width(), SCENE_FINITE_RECT.height()) - 2 * LAYOUT_MARGIN
+    spacing = min(3.0 * DEFAULT_NODE_RADIUS, usable / max(1.0, math.sqrt(n)))
+    radius = max(MIN_GENERATED_RADIUS, min(DEFAULT_NODE_RADIUS, int(spacing / 3)))
+    if n == 0:
+        return xy, radius
+    lo, hi = xy.min(axis=0), xy.max(axis=0)
+    extent = float(max((hi - lo).max(), 1e-9))
+    side = min(usable, spacing * math.sqrt(n) * 1.5)
+    scaled = (xy - (lo + hi) / 2.0) / extent * side if n > 1 else xy * 0.0
+    center = SCENE_FINITE_RECT.center()
+    return scaled + np.array([center.x(), center.y()]), radius
+
+
+# -----------------------
+# API
+# -----------------------
+def generate_graph_data(
+    kind: str,
+    n: int,
+    weights: str = "uniform",
+    layout: str = "auto",
+    seed: Optional[int] = None,
+    **params,
+) -> dict:
+    """
+    Genera un grafo en el formato de archivo del proyecto (nodos con posición, aristas con peso)
+    kind: clave de GENERATORS; weights: clave de WEIGHT_DISTRIBUTIONS; layout: clave de LAYOUTS
+    params se pasa al generador (degree, rewire)
+    """
+    if kind not in GENERATORS:
+        raise ValueError(f"Modelo desconocido: {kind}")
+    if weights not in WEIGHT_DISTRIBUTIONS:
+        raise ValueError(f"Distribución de pesos desconocida: {weights}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Acomodo desconocido: {layout}")
+    n = max(0, int(n))
+    rnd = random.Random(seed)
+    rng = np.random.default_rng(seed)
+
+    edges = GENERATORS[kind][1](n, rnd, **params)
+    values = WEIGHT_DISTRIBUTIONS[weights][1](rng, len(edges))
+    layout_fn = LAYOUTS[AUTO_LAYOUT.get(kind, "spring") if layout == "auto" else layout][1]
+    xy, radius = fit_to_canvas(layout_fn(n, edges, rng) if n else np.zeros((0, 2)), n)
+
+    return {
+        "nodes": [{"id": i, "label": str(i), "x": float(x), "y": float(y), "radius": radius}
+                  for i, (x, y) in enumerate(xy.tolist())],
+        "edges": [{"a": a, "b": b, "weight": str(w)} for (a, b), w in zip(edges, values.tolist())],
+    }
+
+
+def main():
+    """Punto de entrada de la línea de comandos: escribe el grafo generado en JSON"""
+    parser = argparse.ArgumentParser(description="Genera grafos sintéticos para Grafo Drawer")
+    parser.add_argument("kind", choices=GENERATORS, help="Modelo de grafo")
+    parser.add_argument("nodes", type=int, help="Cantidad de nodos")
+    parser.add_argument("--degree", type=int, default=DEFAULT_DEGREE, help="Grado medio de salida / enlaces por nodo")
+    parser.add_argument("--rewire", type=float, default=DEFAULT_REWIRE, help="Probabilidad de recableo (mundo pequeño)")
+    parser.add_argument("--weights", choices=WEIGHT_DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--layout", choices=LAYOUTS, default="auto")
+    parser.add_argument("--seed", type=int, help="Semilla para reproducir el mismo grafo")
+    parser.add_argument("--output", default="grafo_generado.json", help="Archivo JSON de salida")
+    args = parser.parse_args()
+
+    data = generate_graph_data(args.kind, args.nodes, weights=args.weights, layout=args.layout,
+                               seed=args.seed, degree=args.degree, rewire=args.rewire)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    print(f"{len(data['nodes'])} nodos y {len(data['edges'])} aristas guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
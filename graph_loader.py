@@ -0,0 +1,212 @@
+"""
+Carga de archivos de grafo: lectura en segundo plano e inserción progresiva en la escena
+"""
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRectF, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QGraphicsView
+
+from graph_formats import read_graph
+from node_groups import NodeGroup, groups_from_data
+from utils import DEFAULT_NODE_RADIUS, parse_weight
+
+# Tiempo máximo (ms) que cada lote ocupa el hilo de la GUI
+BATCH_BUDGET_MS = 15
+
+# Elementos insertados entre cada revisión del tiempo disponible
+BATCH_CHUNK = 100
+
+# Intervalo mínimo (ms) entre redibujos de la vista durante la carga; entre medio no se redibuja por cada lote
+REFRESH_INTERVAL_MS = 250
+
+# Fracción máxima del tiempo de carga dedicada a redibujar (el intervalo crece con el costo de pintar)
+REFRESH_SHARE = 0.2
+
+
+class PreparedGraph(NamedTuple):
+    """Grafo leído y validado, listo para insertarse en la escena sin más cálculos"""
+    nodes: List[Tuple[int, str, float, float, int]]  # (id, etiqueta, x, y, radio)
+    edges: List[Tuple[int, int, str, float, bool]]  # (origen, destino, peso, valor numérico, tiene_inversa)
+    bounds: Optional[QRectF]  # Rectángulo que contiene todos los nodos
+    id_allocator: Optional[dict]
+    background: Optional[str]
+    background_pos: Tuple[float, float]
+    background_scale: float
+    groups: List[NodeGroup]  # Grupos de nodos validados (ver node_groups)
+
+
+def prepare_graph_data(data: dict) -> PreparedGraph:
+    """
+    Valida y normaliza el formato de archivo: descarta aristas duplicadas o con nodos inexistentes,
+    convierte los pesos a número y marca las aristas que tienen inversa (se dibujan curvas)
+    No usa objetos gráficos, por lo que puede ejecutarse fuera del hilo de la GUI
+    """
+    nodes = []
+    left = top = float("inf")
+    right = bottom = float("-inf")
+    for n_data in data.get("nodes", []):
+        nid = int(n_data["id"])
+        x, y = float(n_data.get("x", 0)), float(n_data.get("y", 0))
+        radius = int(n_data.get("radius", DEFAULT_NODE_RADIUS))
+        nodes.append((nid, n_data.get("label", str(nid)), x, y, radius))
+        left, top = min(left, x - radius), min(top, y - radius)
+        right, bottom = max(right, x + radius), max(bottom, y + radius)
+    node_ids = {n[0] for n in nodes}
+
+    pairs = {}
+    for ed_data in data.get("edges", []):
+        a, b = int(ed_data["a"]), int(ed_data["b"])
+        if a in node_ids and b in node_ids and (a, b) not in pairs:
+            pairs[(a, b)] = ed_data.get("weight", "")
+    edges = [(a, b, w, parse_weight(w), a != b and (b, a) in pairs) for (a, b), w in pairs.items()]
+
+    bx, by = data.get("background_pos", [0.0, 0.0])
+    return PreparedGraph(
+        nodes=nodes,
+        edges=edges,
+        bounds=QRectF(left, top, right - left, bottom - top) if nodes else None,
+        id_allocator=data.get("id_allocator"),
+        background=data.get("background"),
+        background_pos=(float(bx), float(by)),
+        background_scale=float(data.get("background_scale", 1.0)),
+        groups=groups_from_data(data.get("groups"), node_ids),
+    )
+
+
+def read_graph_file(path: str) -> PreparedGraph:
+    """Lee un archivo de grafo (JSON u otro formato soportado, ver graph_formats) y lo prepara para insertarlo"""
+    return prepare_graph_data(read_graph(path))
+
+
+class _ReadSignals(QObject):
+    """Señales de la tarea de lectura (QRunnable no es QObject)"""
+    finished = pyqtSignal(object)  # PreparedGraph o la excepción ocurrida
+
+
+class _ReadTask(QRunnable):
+    """Lee (o genera) y prepara el grafo en el pool de hilos"""
+
+    def __init__(self, source: Callable[[], PreparedGraph]):
+        super().__init__()
+        self.source = source
+        self.signals = _ReadSignals()
+
+    def run(self):
+        try:
+            result = self.source()
+        except Exception as exc:
+            result = exc
+        self.signals.finished.emit(result)
+
+
+# -----------------------
+# ProgressiveGraphLoader
+# -----------------------
+class ProgressiveGraphLoader(QObject):
+    """
+    Abre un archivo sin congelar la ventana: la lectura ocurre en un hilo del pool y los
+    elementos se insertan en lotes de pocos milisegundos, así la vista sigue respondiendo
+    Con source se inserta otro grafo preparado (por ejemplo uno generado) en lugar de leer path
+    """
+
+    parsed = pyqtSignal(object)  # PreparedGraph, antes de insertar el primer lote
+    progress = pyqtSignal(int, int)  # elementos insertados, total
+    finished = pyqtSignal()
+    cancelled = pyqtSignal(bool)  # True si la escena ya se había reemplazado (quedó vacía)
+    failed = pyqtSignal(str)
+
+    def __init__(self, scene, path: Optional[str], view=None, parent=None, source: Optional[Callable[[], PreparedGraph]] = None):
+        super().__init__(parent)
+        self.scene = scene
+        self.path = path
+        self.source = source if source is not None else (lambda: read_graph_file(path))
+        self.view = view
+        self.graph: Optional[PreparedGraph] = None
+        self._task: Optional[_ReadTask] = None
+        self._active = False
+        self._node_index = 0
+        self._edge_index = 0
+        self._saved_update_mode = None
+        self._next_refresh = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._insert_batch)
+
+    @property
+    def total(self) -> int:
+        """Cantidad total de elementos a insertar"""
+        return len(self.graph.nodes) + len(self.graph.edges) if self.graph else 0
+
+    def start(self):
+        """Lanza la lectura en segundo plano"""
+        self._active = True
+        self._task = _ReadTask(self.source)
+        self._task.signals.finished.connect(self._on_parsed)
+        QThreadPool.globalInstance().start(self._task)
+
+    def cancel(self):
+        """Detiene la carga; si la inserción ya había empezado, deja la escena vacía"""
+        if not self._active:
+            return
+        self._active = False
+        self._timer.stop()
+        self._restore_view()
+        replaced = self.scene.bulk_loading  # Antes de parsed la escena sigue con el grafo anterior
+        self.scene.cancel_bulk_load()
+        self.cancelled.emit(replaced)
+
+    def _on_parsed(self, result):
+        """Recibe el archivo preparado y comienza la inserción por lotes"""
+        self._task = None
+        if not self._active:
+            return  # Cancelado mientras se leía
+        if isinstance(result, Exception):
+            self._active = False
+            self.failed.emit(str(result))
+            return
+        self.graph = result
+        self.scene.begin_bulk_load()
+        self.scene.restore_background(result, view=self.view)
+        self.parsed.emit(result)
+        if self.view is not None:
+            # Los lotes no disparan redibujos; se refresca cada REFRESH_INTERVAL_MS (desplazar la vista sí redibuja)
+            self._saved_update_mode = self.view.viewportUpdateMode()
+            self.view.setViewportUpdateMode(QGraphicsView.NoViewportUpdate)
+        self._next_refresh = time.perf_counter()
+        self._timer.start()
+
+    def _restore_view(self):
+        """Devuelve a la vista su modo de actualización y la redibuja"""
+        if self.view is not None and self._saved_update_mode is not None:
+            self.view.setViewportUpdateMode(self._saved_update_mode)
+            self._saved_update_mode = None
+            self.view.viewport().update()
+
+    def _insert_batch(self):
+        """Inserta elementos hasta agotar el tiempo del lote (primero nodos, luego aristas)"""
+        graph = self.graph
+        deadline = time.perf_counter() + BATCH_BUDGET_MS / 1000.0
+        while time.perf_counter() < deadline:
+            if self._node_index < len(graph.nodes):
+                chunk = graph.nodes[self._node_index:self._node_index + BATCH_CHUNK]
+                self.scene.add_nodes_batch(chunk)
+                self._node_index += len(chunk)
+            elif self._edge_index < len(graph.edges):
+                chunk = graph.edges[self._edge_index:self._edge_index + BATCH_CHUNK]
+                self.scene.add_edges_batch(chunk)
+                self._edge_index += len(chunk)
+            else:
+                self._timer.stop()
+                self._active = False
+                self._restore_view()
+                self.scene.end_bulk_load(graph.id_allocator, graph.groups)
+                self.progress.emit(self.total, self.total)
+                self.finished.emit()
+                return
+        if self.view is not None and time.perf_counter() >= self._next_refresh:
+            start = time.perf_counter()
+            self.view.viewport().repaint()
+            cost = time.perf_counter() - start
+            self._next_refresh = start + max(REFRESH_INTERVAL_MS / 1000.0, cost / REFRESH_SHARE)
+        self.progress.emit(self._node_index + self._edge_index, self.total)
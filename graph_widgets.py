@@ -2,28 +2,30 @@
 Widgets y componentes gráficos del grafo: NodeItem, EdgeItem, GraphScene, GraphView
 """
 import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Dict, Set, Tuple, List
+from typing import Optional, Dict, Iterable, Sequence, Set, Tuple, List
 
-from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal, QLineF, QPoint
+from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal, QPoint, QTimer
 from PyQt5.QtGui import (
     QBrush,
     QPen,
     QFont,
     QPainter,
     QColor,
-    QPixmap,
+    QImage,
     QPainterPath,
     QPolygonF,
+    QOpenGLContext,
 )
 from PyQt5.QtWidgets import (
     QGraphicsView,
     QGraphicsScene,
     QGraphicsEllipseItem,
     QGraphicsLineItem,
-    QGraphicsTextItem,
-    QGraphicsPixmapItem,
-    QGraphicsRectItem,
     QInputDialog,
     QFileDialog,
     QGraphicsItem,
@@ -31,9 +33,11 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QGraphicsPathItem,
     QLabel,
+    QOpenGLWidget,
 )
 
 import networkx as nx
+import numpy as np
 
 from utils import (
     DEFAULT_NODE_RADIUS,
@@ -42,9 +46,57 @@ from utils import (
     SCENE_FINITE_RECT,
     ARROW_SIZE,
     make_radial_brush,
+    parse_weight,
+    static_label,
     show_warning,
     show_info,
 )
+from layouts import hierarchical_layout
+from pathfinding import WeightedAdjacency, shortest_path
+from id_allocator import IdAllocator
+from profiling import PROFILER, FrameSample, FrameTelemetry, profiled
+from background_tiles import TiledBackgroundItem, read_image_size
+from graph_loader import PreparedGraph, prepare_graph_data
+from graph_generators import generate_graph_data
+from edge_bundling import BundledEdgesItem, start_bundling
+from edge_layer import EdgeLayerItem
+from edge_geometry import directed_geometry, directed_geometry_batch, loop_geometry
+from search_index import MAX_SEARCH_RESULTS, SearchIndex, SearchResult
+from graph_filter import DIM_OPACITY, FilterResult, FilterSpec, evaluate as evaluate_filter
+from node_groups import MIN_COMMUNITY_SIZE, NodeGroup, aggregate_edges, detect_communities
+
+# Modos de actualización del viewport disponibles: nombre -> (descripción, modo Qt)
+VIEWPORT_UPDATE_MODES = {
+    "minimal": ("Mínima (regiones cambiadas)", QGraphicsView.MinimalViewportUpdate),
+    "smart": ("Inteligente", QGraphicsView.SmartViewportUpdate),
+    "bounding": ("Rectángulo envolvente", QGraphicsView.BoundingRectViewportUpdate),
+    "full": ("Completa (recomendada con OpenGL)", QGraphicsView.FullViewportUpdate),
+}
+
+# Actualizar o quitar un elemento del índice BSP cuesta como insertar esta cantidad al reconstruirlo
+# (una arista larga ocupa muchas hojas): las operaciones en lote más grandes suspenden el índice
+BSP_UPDATE_COST = 20
+
+# Profundidad del árbol BSP: la automática de Qt (log2 de los elementos) es demasiado profunda con aristas
+# largas; con 10k nodos al azar construir el índice pasa de ~20 s a ~1 s
+BSP_MIN_DEPTH, BSP_MAX_DEPTH = 4, 10
+
+# Separación de las líneas de la cuadrícula (menores y mayores); la menor es el paso del ajuste a la cuadrícula
+GRID_MINOR_STEP, GRID_MAJOR_STEP = 20, 100
+
+# Bordes válidos para GraphScene.align_nodes
+ALIGN_SIDES = ("left", "hcenter", "right", "top", "vcenter", "bottom")
+
+# Nodos listados por nombre en el resumen de una selección múltiple
+SUMMARY_MAX_NODES = 10
+
+# Plumas compartidas para marcar los resultados de la búsqueda
+SEARCH_NODE_PEN = QPen(QColor(255, 140, 0), 5)
+SEARCH_EDGE_PEN = QPen(QColor(255, 140, 0), 5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+# Fondo de las etiquetas de peso de las aristas
+EDGE_LABEL_BG_PEN = QPen(QColor(120, 120, 120), 1)
+EDGE_LABEL_BG_BRUSH = QBrush(QColor(255, 255, 255, 230))
 
 
 # -----------------------
@@ -71,18 +123,21 @@ class NodeItem(QGraphicsEllipseItem):
         self.id = node_id
         self.label = label
 
-        # Texto centrado dentro del nodo
-        self.text = QGraphicsTextItem(self.label, parent=self)
-        self.text.setFont(FONT_NODE)
-        self.text.setDefaultTextColor(Qt.white)
+        # Texto centrado dentro del nodo: se dibuja en paint() (sin QGraphicsTextItem hijo)
+        self._label_rect = QRectF()
         self.update_text_position()
 
         self.setPos(pos)
 
         # Crear pinceles para estado normal y hover
+        self.is_highlighted = False  # Resaltado como parte de un camino
+        self.is_search_match = False  # Coincide con la búsqueda actual
         self._create_brushes()
         self.is_hovered = False
         self.setZValue(10)  # Mantener nodos sobre aristas
+        # Reutilizar el gradiente rasterizado mientras el nodo no cambie;
+        # setBrush (hover, resaltado) y setRect llaman a update(), que invalida la caché
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
     def _create_brushes(self):
         """Crea los pinceles con gradiente radial para el nodo"""
@@ -94,21 +149,53 @@ class NodeItem(QGraphicsEllipseItem):
             self.radius,
             (QColor(100, 160, 220), QColor(80, 140, 200), QColor(60, 120, 180)),
         )
-        self.setBrush(self.normal_brush)
-        pen = QPen(QColor(20, 50, 100))
-        pen.setWidth(3)
-        self.setPen(pen)
+        self.highlight_brush = make_radial_brush(
+            self.radius,
+            (QColor(90, 220, 140), QColor(46, 204, 113), QColor(30, 150, 80)),
+        )
+        self.setBrush(self.base_brush())
+        self.normal_pen = QPen(QColor(20, 50, 100))
+        self.normal_pen.setWidth(3)
+        self.setPen(SEARCH_NODE_PEN if self.is_search_match else self.normal_pen)
+
+    def base_brush(self) -> QBrush:
+        """Pincel en reposo: resaltado si forma parte de un camino, normal en otro caso"""
+        return self.highlight_brush if self.is_highlighted else self.normal_brush
+
+    def set_highlighted(self, highlighted: bool):
+        """Marca o desmarca el nodo como parte de un camino resaltado"""
+        self.is_highlighted = highlighted
+        self.setBrush(self.base_brush())
+
+    def set_search_match(self, match: bool):
+        """Marca o desmarca el nodo como resultado de la búsqueda (borde naranja)"""
+        self.is_search_match = match
+        self.setPen(SEARCH_NODE_PEN if match else self.normal_pen)
+
+    def boundingRect(self) -> QRectF:
+        """Círculo más la etiqueta (puede ser más ancha que el nodo)"""
+        return super().boundingRect().united(self._label_rect)
+
+    def paint(self, painter, option, widget=None):
+        """Dibuja el círculo del nodo y su etiqueta"""
+        if PROFILER.enabled: PROFILER.count("paint.nodes")
+        super().paint(painter, option, widget)
+        if self.label:
+            painter.setFont(FONT_NODE)
+            painter.setPen(Qt.white)
+            painter.drawStaticText(self._label_rect.topLeft(), static_label(self.label, FONT_NODE))
 
     def update_text_position(self):
-        """Centra el texto dentro del círculo del nodo"""
-        rect = self.text.boundingRect()
-        self.text.setPos(-rect.width() / 2, -rect.height() / 2)
+        """Centra el texto dentro del círculo del nodo (medidas en caché por texto y fuente)"""
+        self.prepareGeometryChange()
+        size = static_label(self.label, FONT_NODE).size()
+        self._label_rect = QRectF(-size.width() / 2, -size.height() / 2, size.width(), size.height())
 
     def set_label(self, label: str):
         """Cambia la etiqueta del nodo"""
         self.label = label
-        self.text.setPlainText(label)
         self.update_text_position()
+        if self.scene() is not None: self.scene().search_index.set_label(self.id, label)
 
     def hoverEnterEvent(self, event):
         """Cambia apariencia cuando el mouse entra al nodo"""
@@ -120,19 +207,14 @@ class NodeItem(QGraphicsEllipseItem):
     def hoverLeaveEvent(self, event):
         """Restaura apariencia cuando el mouse sale del nodo"""
         self.setCursor(Qt.ArrowCursor)
-        self.setBrush(self.normal_brush)
+        self.setBrush(self.base_brush())
         self.is_hovered = False
         super().hoverLeaveEvent(event)
 
     def itemChange(self, change, value):
         """Maneja cambios en el nodo (posición, selección, etc.)"""
-        # Actualizar aristas conectadas cuando el nodo se mueve
         if change == QGraphicsItem.ItemPositionChange and self.scene():
-            for e in list(getattr(self, "edges", [])):
-                try:
-                    e.update_position()
-                except Exception:
-                    pass
+            layer = None if self.scene().moving_nodes else self.scene().edge_layer
             
             # Limitar movimiento dentro del rectángulo de la escena
             new_pos = value
@@ -146,25 +228,33 @@ class NodeItem(QGraphicsEllipseItem):
             clamped_x = max(left_limit, min(new_pos.x(), right_limit))
             clamped_y = max(top_limit, min(new_pos.y(), bottom_limit))
             
+            if layer is not None: layer.node_moved(self, QPointF(clamped_x, clamped_y))
             return QPointF(clamped_x, clamped_y)
 
-        # Mostrar/ocultar panel de información cuando se selecciona/deselecciona
-        if change == QGraphicsItem.ItemSelectedChange and self.scene():
-            will_be_selected = bool(value)
-            view = self.scene().views()[0] if self.scene().views() else None
-            if will_be_selected and view and hasattr(view, 'show_node_info_panel'):
-                try:
-                    view.show_node_info_panel(self)
-                except Exception:
-                    pass
-            elif not will_be_selected and view and hasattr(view, 'hide_node_info_panel'):
-                try:
-                    view.hide_node_info_panel()
-                except Exception:
-                    pass
-
+        # Actualizar aristas conectadas ya con la nueva posición (en un movimiento en lote lo hace move_nodes al final)
+        if change == QGraphicsItem.ItemPositionHasChanged and self.scene() and not self.scene().moving_nodes:
+            layer = self.scene().edge_layer
+            # La capa de aristas recalcula las suyas (todas menos los bucles)
+            try:
+                EdgeItem.update_positions([e for e in getattr(self, "edges", ()) if layer is None or e.is_loop()])
+            except Exception:
+                pass
+            if self.scene().edge_bundling: self.scene().schedule_edge_bundling()
+
+        # El panel de información no se actualiza aquí sino una vez por cambio de selección (GraphView)
         return super().itemChange(change, value)
 
+    def mouseMoveEvent(self, event):
+        """Arrastra el nodo; si hay varios nodos seleccionados se mueven juntos en lote (ver GraphScene.drag_nodes)"""
+        scene = self.scene()
+        if scene is not None and event.buttons() & Qt.LeftButton and self.isSelected():
+            nodes = [item for item in scene.selectedItems() if isinstance(item, NodeItem) and item.flags() & QGraphicsItem.ItemIsMovable]
+            if len(nodes) > 1:
+                delta = event.scenePos() - event.lastScenePos()
+                scene.drag_nodes(nodes, delta.x(), delta.y())
+                return
+        super().mouseMoveEvent(event)
+
     def update_radius(self, new_radius: int):
         """Cambia el radio del nodo y actualiza todo lo relacionado"""
         self.radius = new_radius
@@ -172,8 +262,7 @@ class NodeItem(QGraphicsEllipseItem):
         self._create_brushes()
         self.update_text_position()
         # Actualizar posición de aristas conectadas
-        for e in list(self.edges):
-            e.update_position()
+        EdgeItem.update_positions(list(self.edges))
 
 
 # -----------------------
@@ -182,27 +271,26 @@ class NodeItem(QGraphicsEllipseItem):
 class EdgeItem(QGraphicsPathItem):
     """Representa una arista dirigida entre dos nodos con peso opcional"""
     
-    def __init__(self, source: NodeItem, dest: NodeItem, weight: Optional[str] = None):
+    def __init__(self, source: NodeItem, dest: NodeItem, weight: Optional[str] = None, weight_value: Optional[float] = None):
         super().__init__()
         self.source = source
         self.dest = dest
         self.weight = weight if weight is not None else ""
+        # Peso numérico, calculado una sola vez (o recibido ya calculado al cargar archivos)
+        self.weight_value = weight_value if weight_value is not None else parse_weight(self.weight)
         self.arrow_head = QPolygonF()  # Polígono para la flecha
         self.text_visible = True
-
-        # Etiqueta de peso sobre un fondo blanco
-        self.text = QGraphicsTextItem(str(self.weight), parent=self)
-        self.text.setFont(FONT_EDGE)
-        self.text.setDefaultTextColor(QColor(0, 0, 0))
-        self.text.setZValue(2)
-        self.text_bg = QGraphicsRectItem(parent=self)
-        self.text_bg.setZValue(1)
-        self.text_bg.setBrush(QBrush(QColor(255, 255, 255, 230)))
-        self.text_bg.setPen(QPen(QColor(120, 120, 120), 1))
+        # Recuadro del peso (fondo blanco) en el punto medio; vacío si no se dibuja
+        self._label_anchor = QPointF()
+        self._label_rect = QRectF()
+        self._geometry_key = None  # Datos con los que se calculó la geometría (ver geometry_key)
 
         # Estilos de línea para estado normal y hover
         self.normal_pen = QPen(QColor(80, 80, 80), 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
         self.hover_pen = QPen(QColor(200, 100, 100), 4, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self.highlight_pen = QPen(QColor(46, 204, 113), 6, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self.is_highlighted = False  # Resaltada como parte de un camino
+        self.is_search_match = False  # Coincide con la búsqueda actual
         self.setPen(self.normal_pen)
         self.setZValue(-5)  # Mantener aristas detrás de nodos
         self.setAcceptHoverEvents(True)
@@ -218,192 +306,103 @@ class EdgeItem(QGraphicsPathItem):
     def boundingRect(self) -> QRectF:
         """Calcula el rectángulo que contiene toda la arista (línea + flecha + texto)"""
         base_rect = self.path().boundingRect()
-        children_rect = self.childrenBoundingRect()
         arrow_rect = self.arrow_head.boundingRect()
         
-        total_rect = base_rect.united(children_rect).united(arrow_rect)
+        total_rect = base_rect.united(self._label_rect).united(arrow_rect)
         
         # Agregar padding para asegurar que todo sea visible
         padding = max(self.pen().widthF(), ARROW_SIZE) + 5
         return total_rect.adjusted(-padding, -padding, padding, padding)
 
+    def shape(self) -> QPainterPath:
+        """Línea más el recuadro del peso, para poder hacer clic (o doble clic) sobre el peso"""
+        shape = super().shape()
+        if not self._label_rect.isEmpty(): shape.addRect(self._label_rect)
+        return shape
+
     def is_loop(self) -> bool:
         """Verifica si la arista es un bucle (mismo nodo origen y destino)"""
         return self.source == self.dest
 
     def has_reverse_edge(self) -> bool:
-        """Verifica si existe una arista en la dirección opuesta"""
-        if self.is_loop():
+        """Verifica si existe una arista en la dirección opuesta (la inversa está en las aristas de ambos nodos)"""
+        a, b = self.source, self.dest
+        if a is b:
             return False
-        for edge in self.dest.edges:
-            if edge.dest == self.source:
-                return True
-        return False
-
-    def update_position(self):
-        """Recalcula la trayectoria de la arista según posición de los nodos"""
-        self.prepareGeometryChange()
-        if self.is_loop():
-            self._update_loop_path()
-        else:
-            self._update_directed_path()
-        self._update_text_position()
-
-    def _update_loop_path(self):
-        """Crea un bucle curvo para aristas que conectan un nodo consigo mismo"""
-        path = QPainterPath()
-        node_pos = self.source.pos()
-        r = self.source.radius
-        
-        # Definir ángulos para el inicio y fin del bucle
-        angle_offset = 35
-        start_angle_rad = math.radians(90 + angle_offset)
-        end_angle_rad = math.radians(90 - angle_offset)
-        
-        start_point = node_pos + QPointF(r * math.cos(start_angle_rad), -r * math.sin(start_angle_rad))
-        end_point = node_pos + QPointF(r * math.cos(end_angle_rad), -r * math.sin(end_angle_rad))
-        
-        # Punto de control para la curva del bucle
-        loop_height = r * 1.6
-        ctrl_point = node_pos + QPointF(0, -loop_height)
-        
-        path.moveTo(start_point)
-        path.quadTo(ctrl_point, end_point)
-        self.setPath(path)
-        
-        # Calcular flecha al final del bucle
-        direction_line = QLineF(ctrl_point, end_point)
-        self._calculate_arrow_head(end_point, direction_line)
-
-    def _update_directed_path(self):
-        """Crea la trayectoria para aristas normales entre dos nodos diferentes"""
-        p1 = self.source.scenePos()
-        p2 = self.dest.scenePos()
-        line = QLineF(p1, p2)
-        if line.length() == 0:
-            return
-
-        full_path = QPainterPath()
-        full_path.moveTo(p1)
-
-        # Si hay arista inversa, curvar la línea para evitar superposición
-        ctrl_point = None
-        if self.has_reverse_edge():
-            dx, dy = p2.x() - p1.x(), p2.y() - p1.y()
-            ctrl_offset = 30
-            norm_len = line.length()
-            if norm_len > 0:
-                # Punto de control perpendicular a la línea
-                ctrl_point = QPointF(
-                    p1.x() + dx / 2 - dy / norm_len * ctrl_offset,
-                    p1.y() + dy / 2 + dx / norm_len * ctrl_offset
-                )
-                full_path.quadTo(ctrl_point, p2)
-            else:
-                full_path.lineTo(p2)
-        else:
-            full_path.lineTo(p2)
+        edges = a.edges if len(a.edges) < len(b.edges) else b.edges
+        return any(e.source is b and e.dest is a for e in edges)
 
-        # Calcular intersecciones con los bordes de los nodos
-        line_to_source = QLineF(full_path.pointAtPercent(0.1), full_path.pointAtPercent(0))
-        line_to_dest = QLineF(full_path.pointAtPercent(0.9), full_path.pointAtPercent(1))
-        
-        intersect_p1 = self._get_intersection_point(line_to_source, self.source) or p1
-        intersect_p2 = self._get_intersection_point(line_to_dest, self.dest) or p2
-
-        # Crear trayectoria final desde borde a borde
-        final_path = QPainterPath()
-        final_path.moveTo(intersect_p1)
-        if self.has_reverse_edge() and ctrl_point:
-            final_path.quadTo(ctrl_point, intersect_p2)
-        else:
-            final_path.lineTo(intersect_p2)
-        
-        self.setPath(final_path)
-        
-        # Calcular dirección para la flecha
-        if self.has_reverse_edge() and ctrl_point:
-            direction_line = QLineF(ctrl_point, intersect_p2)
-        else:
-            direction_line = QLineF(intersect_p1, intersect_p2)
-        self._calculate_arrow_head(intersect_p2, direction_line)
+    def geometry_key(self) -> tuple:
+        """Datos de los que depende la geometría: posición y radio de cada extremo y si tiene inversa"""
+        s, d = self.source, self.dest
+        if s is d: return (s.x(), s.y(), s.radius)
+        return (s.x(), s.y(), s.radius, d.x(), d.y(), d.radius, self.has_reverse_edge())
 
-    def _calculate_arrow_head(self, end_point: QPointF, direction_line: QLineF):
-        """Calcula los puntos del triángulo de la flecha según la dirección"""
-        # Solo mostrar flecha en bucles o cuando hay arista inversa
-        if not self.is_loop() and not self.has_reverse_edge():
-            self.arrow_head = QPolygonF()
+    @profiled("edge.update_position")
+    def update_position(self):
+        """Recalcula la trayectoria de la arista si cambió la posición o el radio de sus nodos, o su inversa"""
+        key = self.geometry_key()
+        if key == self._geometry_key:
             return
-
-        if direction_line.length() == 0:
-            self.arrow_head = QPolygonF()
+        self._geometry_key = key
+        points = loop_geometry(*key) if self.is_loop() else directed_geometry(*key)
+        self._set_geometry(tuple(chain.from_iterable(points)), curved=self.is_loop() or key[6])
+
+    @staticmethod
+    @profiled("edge.update_positions")
+    def update_positions(edges: Iterable["EdgeItem"]):
+        """
+        update_position para varias aristas: se omiten las que no cambiaron y las demás (sin bucles)
+        se calculan juntas en una sola pasada vectorizada
+        """
+        dirty, keys = [], []
+        for e in edges:
+            key = e.geometry_key()
+            if key == e._geometry_key: continue
+            if e.is_loop(): e.update_position()
+            else: dirty.append(e); keys.append(key)
+        if not dirty:
             return
-            
-        # Calcular ángulo de la línea
-        angle = math.atan2(-direction_line.dy(), direction_line.dx())
-        
-        # Puntos de las "alas" del triángulo
-        rev_angle = angle + math.pi
-        wing_spread_angle = math.pi / 6
-        
-        p2_wing = end_point + QPointF(math.cos(rev_angle - wing_spread_angle) * ARROW_SIZE, 
-                                      -math.sin(rev_angle - wing_spread_angle) * ARROW_SIZE)
-        p3_wing = end_point + QPointF(math.cos(rev_angle + wing_spread_angle) * ARROW_SIZE, 
-                                      -math.sin(rev_angle + wing_spread_angle) * ARROW_SIZE)
-        
-        self.arrow_head = QPolygonF([end_point, p2_wing, p3_wing])
-
-    def _get_intersection_point(self, line: QLineF, node: NodeItem) -> Optional[QPointF]:
-        """Calcula el punto donde la línea intersecta el círculo del nodo"""
-        circle_center = node.scenePos()
-        line_p1, line_p2 = line.p1(), line.p2()
-        dx, dy = line_p2.x() - line_p1.x(), line_p2.y() - line_p1.y()
-        
-        # Resolver ecuación cuadrática para intersección línea-círculo
-        a = dx**2 + dy**2
-        if a == 0: return None
-        b = 2 * (dx * (line_p1.x() - circle_center.x()) + dy * (line_p1.y() - circle_center.y()))
-        c = (line_p1.x() - circle_center.x())**2 + (line_p1.y() - circle_center.y())**2 - node.radius**2
-        delta = b**2 - 4 * a * c
-        if delta < 0: return None
-        
-        t1 = (-b + math.sqrt(delta)) / (2 * a)
-        t2 = (-b - math.sqrt(delta)) / (2 * a)
-
-        # Filtrar puntos dentro del segmento [0,1]
-        points = []
-        if 0 <= t1 <= 1: points.append(line_p1 + t1 * (line_p2 - line_p1))
-        if 0 <= t2 <= 1: points.append(line_p1 + t2 * (line_p2 - line_p1))
-
-        if not points: return None
-        if len(points) == 1: return points[0]
-        # Retornar el punto más cercano al destino
-        return min(points, key=lambda p: QLineF(p, line_p2).length())
+        data = np.array(keys, dtype=float)
+        geometry = directed_geometry_batch(data[:, 0:2], data[:, 3:5], data[:, 2], data[:, 5], data[:, 6] > 0)
+        # Una lista de 12 coordenadas por arista (menos objetos que pares anidados)
+        for e, key, coords in zip(dirty, keys, np.concatenate(geometry, axis=1).tolist()):
+            e._geometry_key = key
+            e._set_geometry(coords, curved=key[6])
+
+    def _set_geometry(self, coords: Sequence[float], curved: bool):
+        """
+        Aplica una geometría ya calculada: trayectoria, flecha y punto de la etiqueta
+        coords: x, y de inicio, fin, control, ala 1, ala 2 y punto de la etiqueta (en ese orden)
+        """
+        sx, sy, ex, ey, cx, cy, w1x, w1y, w2x, w2y, lx, ly = coords
+        self.prepareGeometryChange()
+        end = QPointF(ex, ey)
+        path = QPainterPath(QPointF(sx, sy))
+        if curved: path.quadTo(QPointF(cx, cy), end)
+        else: path.lineTo(end)
+        self.setPath(path)
+        # Solo los bucles y las aristas con inversa (curvas) muestran la flecha
+        self.arrow_head = QPolygonF([end, QPointF(w1x, w1y), QPointF(w2x, w2y)]) if curved else QPolygonF()
+        self._label_anchor = QPointF(lx, ly)
+        self._update_text_position()
 
     def _update_text_position(self):
-        """Posiciona la etiqueta de peso en el punto medio de la arista"""
-        if not self.text_visible:
+        """Posiciona la etiqueta de peso en el punto medio de la arista (medidas en caché por texto y fuente)"""
+        text = str(self.weight)
+        if not self.text_visible or not text:
+            self._label_rect = QRectF()
             return
 
-        if self.is_loop():
-            # Para bucles, colocar texto arriba del arco
-            r = self.source.radius
-            loop_height = r * 1.6
-            mid_point = self.source.pos() + QPointF(0, -loop_height - 15)
-        else:
-            mid_point = self.path().pointAtPercent(0.5)
-
-        text_rect = self.text.boundingRect()
-        text_pos = mid_point - QPointF(text_rect.width() / 2, text_rect.height() / 2)
-        self.text.setPos(text_pos)
-
-        # Fondo blanco con padding alrededor del texto
-        padding = 4
-        bg_rect = QRectF(text_pos, text_rect.size()).adjusted(-padding, -padding, padding, padding)
-        self.text_bg.setRect(bg_rect)
+        # Fondo blanco con padding alrededor del texto (mismo recuadro que dibuja EdgeLayerItem)
+        mid_point = self._label_anchor
+        size = static_label(text, FONT_EDGE).size()
+        self._label_rect = QRectF(mid_point.x() - size.width() / 2 - 4, mid_point.y() - size.height() / 2 - 2,
+                                  size.width() + 8, size.height() + 4)
 
     def paint(self, painter, option, widget=None):
         """Dibuja la línea de la arista y la flecha"""
+        if PROFILER.enabled: PROFILER.count("paint.edges")
         painter.setPen(self.pen())
         painter.drawPath(self.path())
         
@@ -413,19 +412,29 @@ class EdgeItem(QGraphicsPathItem):
             painter.setBrush(self.pen().color())
             painter.drawPolygon(self.arrow_head)
 
+        # Peso sobre un fondo blanco
+        if not self._label_rect.isEmpty():
+            painter.setPen(EDGE_LABEL_BG_PEN)
+            painter.setBrush(EDGE_LABEL_BG_BRUSH)
+            painter.drawRect(self._label_rect)
+            painter.setFont(FONT_EDGE)
+            painter.setPen(Qt.black)
+            painter.drawStaticText(self._label_rect.topLeft() + QPointF(4, 2), static_label(str(self.weight), FONT_EDGE))
+
     def set_weight(self, weight: str):
         """Cambia el peso de la arista"""
         self.weight = weight
-        self.text.setPlainText(str(weight))
-        self.update_position()
+        self.weight_value = parse_weight(weight)
+        self.prepareGeometryChange()
+        self._update_text_position()
+        self.update()
+        if self.scene() is not None: self.scene().search_index.set_edge_weight((self.source.id, self.dest.id), self.weight_value)
 
     def set_text_visibility(self, visible: bool):
         """Muestra u oculta la etiqueta de peso"""
         self.text_visible = visible
-        self.text.setVisible(visible)
-        self.text_bg.setVisible(visible)
-        if visible:
-            self.update_position()
+        self.prepareGeometryChange()
+        self._update_text_position()
         self.update()
 
     def hoverEnterEvent(self, event):
@@ -433,12 +442,81 @@ class EdgeItem(QGraphicsPathItem):
         self.setPen(self.hover_pen)
         super().hoverEnterEvent(event)
 
+    def set_highlighted(self, highlighted: bool):
+        """Marca o desmarca la arista como parte de un camino resaltado"""
+        self.is_highlighted = highlighted
+        self.setPen(self.base_pen())
+
+    def set_search_match(self, match: bool):
+        """Marca o desmarca la arista como resultado de la búsqueda"""
+        self.is_search_match = match
+        self.setPen(self.base_pen())
+
+    def base_pen(self) -> QPen:
+        """Pluma en reposo: camino resaltado, resultado de búsqueda o normal"""
+        if self.is_highlighted: return self.highlight_pen
+        return SEARCH_EDGE_PEN if self.is_search_match else self.normal_pen
+
     def hoverLeaveEvent(self, event):
         """Restaura estilo normal cuando el mouse sale"""
-        self.setPen(self.normal_pen)
+        self.setPen(self.base_pen())
         super().hoverLeaveEvent(event)
 
 
+# -----------------------
+# Grupos contraídos
+# -----------------------
+class MetaNodeItem(NodeItem):
+    """Meta-nodo de un grupo contraído: muestra el nombre del grupo y la cantidad de miembros"""
+
+    def __init__(self, group: NodeGroup, pos: QPointF):
+        self.group = group
+        super().__init__(group.id, self._caption(group), pos, radius=self._radius_for(len(group.members)))
+        self.setToolTip("Doble clic para expandir el grupo")
+
+    @staticmethod
+    def _caption(group: NodeGroup) -> str:
+        return f"{group.label} ({len(group.members)})"
+
+    @staticmethod
+    def _radius_for(size: int) -> int:
+        """Radio que crece con el logaritmo del tamaño del grupo (hasta el triple del radio de los nodos)"""
+        return int(DEFAULT_NODE_RADIUS * min(3.0, 1.0 + math.log10(max(1, size))))
+
+    def _create_brushes(self):
+        """Pinceles violeta para distinguir los grupos de los nodos"""
+        self.normal_brush = make_radial_brush(self.radius, (QColor(170, 120, 210), QColor(140, 90, 190), QColor(100, 60, 150)))
+        self.hover_brush = make_radial_brush(self.radius, (QColor(195, 150, 230), QColor(170, 120, 210), QColor(130, 90, 180)))
+        self.highlight_brush = self.normal_brush
+        self.setBrush(self.base_brush())
+        self.normal_pen = QPen(QColor(70, 40, 110), 3, Qt.DashLine)
+        self.setPen(self.normal_pen)
+
+    def set_label(self, label: str):
+        """Renombra el grupo (no se indexa en la búsqueda: no es un nodo del grafo)"""
+        self.group.label = label
+        self.refresh()
+
+    def refresh(self):
+        """Actualiza etiqueta y radio tras cambiar el nombre o los miembros del grupo"""
+        self.label = self._caption(self.group)
+        radius = self._radius_for(len(self.group.members))
+        if radius != self.radius: self.update_radius(radius)
+        else: self.update_text_position()
+
+
+class MetaEdgeItem(EdgeItem):
+    """Arista agregada entre un grupo contraído y otro nodo o grupo; su peso combina los de las aristas reales"""
+
+    def __init__(self, source: NodeItem, dest: NodeItem, value: float, count: int):
+        super().__init__(source, dest, f"{value:g}", value)
+        self.count = count  # Aristas reales representadas
+        self.normal_pen = QPen(QColor(130, 90, 170), 3, Qt.DashLine, Qt.RoundCap, Qt.RoundJoin)
+        self.setPen(self.base_pen())
+        self.key = (source.id, dest.id)  # Clave en GraphScene.meta_edges (fija aunque se renumeren los nodos)
+        self.setToolTip(f"{count} arista{'s' if count != 1 else ''} agregada{'s' if count != 1 else ''}")
+
+
 # -----------------------
 # GraphScene
 # -----------------------
@@ -446,22 +524,78 @@ class GraphScene(QGraphicsScene):
     """Escena que contiene y gestiona todos los nodos y aristas del grafo"""
     
     graph_changed = pyqtSignal()  # Señal emitida cuando el grafo cambia
+    path_computed = pyqtSignal(int, int, object)  # origen, destino, (distancia, camino) o None
+    filter_changed = pyqtSignal()  # Cambió el subgrafo visible (se aplicó, modificó o quitó el filtro)
+    groups_changed = pyqtSignal()  # Se creó, quitó, contrajo o expandió algún grupo de nodos
 
     def __init__(self):
         super().__init__()
         self.mode = "draw"  # Modo de interacción: draw, edge, delete, edit, move
-        self.node_counter = 0  # Contador para IDs únicos de nodos
+        self.id_allocator = IdAllocator()  # IDs únicos de nodos con lista libre
         self.node_items: Dict[int, NodeItem] = {}  # Diccionario id -> NodeItem
         self.edge_items: Set[EdgeItem] = set()  # Conjunto de todas las aristas
         self.edge_mode_first_node: Optional[NodeItem] = None  # Primer nodo al crear arista
         self.temp_line: Optional[QGraphicsLineItem] = None  # Línea temporal en modo edge
-        self.background_image_item: Optional[QGraphicsPixmapItem] = None  # Imagen de fondo
+        self.background_image_item: Optional[TiledBackgroundItem] = None  # Imagen de fondo en mosaicos
         self.G = nx.DiGraph()  # Grafo dirigido de NetworkX para algoritmos
         self.background_image_path: Optional[str] = None
         self.grid_visible = True  # Mostrar/ocultar cuadrícula
+        self.graph_version = 0  # Se incrementa con cada cambio de estructura, etiquetas o pesos
+        self.path_source: Optional[NodeItem] = None  # Origen elegido en modo camino
+        self.highlighted_path: Tuple[List[NodeItem], List[EdgeItem]] = ([], [])
+        self._adjacency_cache: Optional[Tuple[int, WeightedAdjacency]] = None  # (versión, adyacencia)
+        self.bulk_loading = False  # Carga por lotes en curso: se suspenden notificaciones y edición
+        self.moving_nodes = False  # Movimiento en lote en curso: itemChange no recalcula aristas por nodo
+
+        # Índice de elementos: NoIndex durante las operaciones en lote, BSP de profundidad ajustada el resto del tiempo
+        self._index_suspensions = 0  # Operaciones en lote anidadas en curso
+        self._drag_suspends_index = False  # Un arrastre de muchos nodos mantiene el índice suspendido hasta soltar
+        self.index_rebuild_seconds = 0.0  # Duración de la última reconstrucción del índice
+
+        # Agrupamiento de aristas: se recalcula en segundo plano tras cambios o movimientos
+        self.edge_bundling = False
+        self.bundled_edges_item: Optional[BundledEdgesItem] = None
+        self._bundle_request = 0  # Identifica la solicitud vigente; se descartan resultados viejos
+        self._bundle_task = None
+        self._bundle_timer = QTimer(self)
+        self._bundle_timer.setSingleShot(True)
+        self._bundle_timer.setInterval(200)
+        self._bundle_timer.timeout.connect(self._start_edge_bundling)
+        self.graph_changed.connect(self.schedule_edge_bundling)
+
+        # Capa de aristas por lotes: un solo elemento dibuja todas las aristas (alternativa a las EdgeItem)
+        # Cada edición la actualiza por filas; solo cargas, grupos y cambios de radio la reconstruyen
+        self.edge_layer: Optional[EdgeLayerItem] = None
+
+        # Índice de búsqueda (etiquetas, IDs y pesos), mantenido con cada cambio del grafo
+        self.search_index = SearchIndex()
+        self.search_matches: Tuple[List[NodeItem], List[EdgeItem]] = ([], [])
+
+        # Filtro de subgrafo: lo que queda fuera se oculta o atenúa, sin quitarlo de la escena
+        self.filter_spec: Optional[FilterSpec] = None
+        self.filter_mode = "hide"  # "hide" u "dim" (ver graph_filter.FILTER_MODES)
+        self.filter_result: Optional[FilterResult] = None  # None = sin filtro
+        self._filtered_nodes: Set[NodeItem] = set()
+        self._filtered_edges: Set[EdgeItem] = set()
+        # Reevaluar el filtro recorre todo el grafo: se hace una vez por ráfaga de cambios, no en cada edición
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(300)
+        self._filter_timer.timeout.connect(self._reapply_filter)
+        self.graph_changed.connect(self.schedule_filter_refresh)
+        self.filter_changed.connect(self.schedule_edge_bundling)  # Las rutas agrupadas omiten lo oculto
+
+        # Grupos de nodos: los contraídos se dibujan como un meta-nodo y sus miembros salen de la escena
+        # (siguen en node_items, edge_items y G; solo cambia qué elementos gestiona y dibuja Qt)
+        self.groups: Dict[int, NodeGroup] = {}  # ID de grupo (negativo) -> grupo
+        self._group_of: Dict[int, int] = {}  # Nodo -> grupo al que pertenece
+        self._collapsed_owner: Dict[int, int] = {}  # Nodo -> grupo contraído que lo oculta
+        self.group_items: Dict[int, MetaNodeItem] = {}  # Meta-nodos de los grupos contraídos
+        self.meta_edges: Dict[Tuple[int, int], MetaEdgeItem] = {}  # Aristas agregadas por (extremo, extremo)
         
         self.setSceneRect(SCENE_FINITE_RECT)
 
+    @profiled("scene.draw_background")
     def drawBackground(self, painter: QPainter, rect: QRectF):
         """Dibuja el fondo con cuadrícula opcional"""
         super().drawBackground(painter, rect)
@@ -470,7 +604,7 @@ class GraphScene(QGraphicsScene):
         if not self.background_image_item and self.grid_visible:
             minor_grid_color = QColor(240, 240, 240)
             major_grid_color = QColor(220, 220, 220)
-            minor_step, major_step = 20, 100
+            minor_step, major_step = GRID_MINOR_STEP, GRID_MAJOR_STEP
             minor_pen, major_pen = QPen(minor_grid_color, 1), QPen(major_grid_color, 2)
             left, right, top, bottom = int(rect.left()), int(rect.right()), int(rect.top()), int(rect.bottom())
             
@@ -492,9 +626,130 @@ class GraphScene(QGraphicsScene):
         painter.setPen(border_pen)
         painter.drawRect(scene_rect)
 
+    def _mark_graph_changed(self):
+        """Incrementa la versión del grafo y notifica a las vistas"""
+        if self.bulk_loading: return  # end_bulk_load notifica una sola vez
+        self.graph_version += 1
+        # Un camino resaltado deja de ser válido cuando cambia el grafo
+        self.clear_path_highlight()
+        self.graph_changed.emit()
+
+    # -----------------------
+    # Agrupamiento de aristas
+    # -----------------------
+    def set_edge_bundling(self, enabled: bool):
+        """Activa o desactiva el dibujo agrupado de aristas (excluyente con la capa de aristas)"""
+        if enabled and self.edge_layer is not None: self.set_edge_layer(False)
+        self.edge_bundling = enabled
+        self._bundle_request += 1
+        if enabled:
+            self._start_edge_bundling()
+        else:
+            self._bundle_timer.stop()
+            self._remove_bundled_edges()
+            for edge in self._scene_edges(): edge.setVisible(self._edge_shown(edge))
+
+    def schedule_edge_bundling(self):
+        """Programa un recálculo (agrupa cambios seguidos como arrastres)"""
+        if self.edge_bundling: self._bundle_timer.start()
+
+    def _remove_bundled_edges(self):
+        """Quita de la escena las rutas agrupadas"""
+        if self.bundled_edges_item is not None:
+            self.removeItem(self.bundled_edges_item)
+            self.bundled_edges_item = None
+
+    def _start_edge_bundling(self):
+        """Toma una copia de posiciones y aristas y lanza el cálculo en segundo plano (sin las ocultas por el filtro)"""
+        self._bundle_request += 1
+        nodes = self._scene_nodes()
+        index = {n: i for i, n in enumerate(nodes)}
+        hidden = self._filtered_edges if self.filter_mode == "hide" else set()
+        pairs = [(index[e.source], index[e.dest]) for e in self._scene_edges() if not e.is_loop() and e not in hidden]
+        if not pairs:
+            self._remove_bundled_edges()
+            return
+        xy = np.array([(n.pos().x(), n.pos().y()) for n in nodes], dtype=float)
+        src, dst = np.array(pairs, dtype=np.int64).T
+        self._bundle_task = start_bundling(self._bundle_request, xy, src, dst, self._on_edges_bundled)
+
+    def _on_edges_bundled(self, request_id: int, result):
+        """Reemplaza las rutas agrupadas y oculta las aristas individuales (salvo bucles)"""
+        if request_id != self._bundle_request or not self.edge_bundling:
+            return  # Resultado obsoleto
+        self._bundle_task = None
+        if isinstance(result, Exception):
+            show_warning("Agrupar aristas", f"No se pudo agrupar las aristas: {result}")
+            return
+        self._remove_bundled_edges()
+        self.bundled_edges_item = BundledEdgesItem(result)
+        self.addItem(self.bundled_edges_item)
+        for edge in self._scene_edges(): edge.setVisible(self._edge_shown(edge))
+
+    # -----------------------
+    # Capa de aristas por lotes
+    # -----------------------
+    def set_edge_layer(self, enabled: bool):
+        """Activa o desactiva el dibujo de aristas en un solo elemento (excluyente con el agrupamiento)"""
+        if enabled == (self.edge_layer is not None):
+            return
+        if enabled:
+            if self.edge_bundling: self.set_edge_bundling(False)
+            self.edge_layer = EdgeLayerItem()
+            self.addItem(self.edge_layer)
+            self._refresh_edge_layer()
+        else:
+            self.removeItem(self.edge_layer)
+            self.edge_layer = None
+            edges = list(self._scene_edges())
+            EdgeItem.update_positions(edges)  # Las posiciones no se siguieron mientras estaban ocultas
+            for edge in edges: edge.setVisible(self._edge_shown(edge))
+
+    def _refresh_edge_layer(self):
+        """Reconstruye los arreglos de la capa (cargas, grupos, radios) y oculta las aristas que dibuja"""
+        if self.edge_layer is None:
+            return
+        edges = self._scene_edges()
+        self.edge_layer.rebuild(self._scene_nodes(), edges)
+        self.edge_layer.set_filter(self._filtered_edges, dim=self.filter_mode == "dim")
+        for edge in edges: edge.setVisible(self._edge_shown(edge))
+
+    def _edge_shown(self, edge: EdgeItem) -> bool:
+        """Visibilidad de una EdgeItem: oculta si la dibuja la capa o el agrupamiento, o si el filtro la oculta"""
+        if (self.edge_layer is not None or self.edge_bundling) and not edge.is_loop():
+            return False
+        return self.filter_mode != "hide" or edge not in self._filtered_edges
+
+    def _scene_nodes(self) -> List[NodeItem]:
+        """Nodos presentes en la escena: los que no oculta un grupo contraído, más los meta-nodos"""
+        if not self.group_items:
+            return list(self.node_items.values())
+        owner = self._collapsed_owner
+        return [n for nid, n in self.node_items.items() if nid not in owner] + list(self.group_items.values())
+
+    def _scene_edges(self) -> List[EdgeItem]:
+        """Aristas presentes en la escena: las reales entre nodos visibles, más las agregadas de los grupos"""
+        if not self.group_items:
+            return list(self.edge_items)
+        owner = self._collapsed_owner
+        return [e for e in self.edge_items if e.source.id not in owner and e.dest.id not in owner] + list(self.meta_edges.values())
+
+    def _item_at(self, pos: QPointF):
+        """Item lógico bajo el punto; con la capa de aristas activa, las aristas se buscan en su índice"""
+        top = self._logical_item_from(self.items(pos))
+        if top is None and self.edge_layer is not None:
+            top = self.edge_layer.edge_at(pos)
+        return top
+
     def toggle_grid_visibility(self, visible: bool):
         """Muestra u oculta la cuadrícula de fondo"""
         self.grid_visible = visible
+        self._invalidate_background()
+
+    def _invalidate_background(self):
+        """Descarta el fondo en caché de las vistas (cuadrícula, borde) y redibuja"""
+        for view in self.views():
+            view.resetCachedContent()
         self.update()
 
     def set_background_image(self, image_path: str, view: Optional[QGraphicsView] = None) -> bool:
@@ -502,28 +757,45 @@ class GraphScene(QGraphicsScene):
         try:
             p = Path(image_path)
             if not p.exists(): raise FileNotFoundError(f"Archivo no encontrado: {image_path}")
-            pixmap = QPixmap(str(p))
-            if pixmap.isNull(): raise ValueError("No se pudo leer la imagen (formato inválido).")
+            size = read_image_size(str(p))
+            if size.isEmpty(): raise ValueError("No se pudo leer la imagen (formato inválido).")
 
             if self.background_image_item:
                 self.removeItem(self.background_image_item)
 
-            self.background_image_item = QGraphicsPixmapItem(pixmap)
+            # Los mosaicos y sus versiones reducidas se generan en segundo plano
+            self.background_image_item = TiledBackgroundItem(str(p), size)
             self.background_image_item.setZValue(-100)  # Detrás de todo
             self.addItem(self.background_image_item)
             self.background_image_path = image_path
+            self.background_image_item.start_loading(self._on_background_loaded)
             
             # Ajustar área de la escena al tamaño de la imagen
-            image_rect = QRectF(pixmap.rect())
-            self.setSceneRect(image_rect)
             self.background_image_item.setPos(0, 0)
+            self.setSceneRect(self.background_image_item.sceneBoundingRect())
 
-            self.update()
+            self._invalidate_background()
             return True
         except Exception as exc:
             show_warning("Error al cargar imagen", str(exc))
             return False
 
+    def _on_background_loaded(self, item: TiledBackgroundItem):
+        """Avisa si la imagen de fondo no pudo cargarse en segundo plano"""
+        if item is not self.background_image_item or item.load_error is None:
+            return
+        self.remove_background_image()
+        show_warning("Error al cargar imagen", str(item.load_error))
+
+    def set_background_geometry(self, pos: QPointF, scale: float):
+        """Ubica y escala la imagen de fondo; el área de la escena la sigue"""
+        if not self.background_image_item:
+            return
+        self.background_image_item.setPos(pos)
+        self.background_image_item.setScale(scale)
+        self.setSceneRect(self.background_image_item.sceneBoundingRect())
+        self._invalidate_background()
+
     def remove_background_image(self):
         """Elimina la imagen de fondo"""
         if self.background_image_item:
@@ -531,19 +803,18 @@ class GraphScene(QGraphicsScene):
             self.background_image_item = None
             self.background_image_path = None
             self.setSceneRect(SCENE_FINITE_RECT)
-            self.update()
+            self._invalidate_background()
 
     def set_mode(self, mode: str):
         """Cambia el modo de interacción con el grafo"""
         self.mode = mode
         # Limpiar estado temporal del modo edge
         if mode != "edge":
-            if self.edge_mode_first_node:
-                self.edge_mode_first_node.setBrush(self.edge_mode_first_node.normal_brush)
-                self.edge_mode_first_node = None
-            if self.temp_line:
-                self.removeItem(self.temp_line)
-                self.temp_line = None
+            self._cancel_pending_edge()
+        # Limpiar estado del modo camino
+        if mode != "path":
+            self._reset_path_source()
+            self.clear_path_highlight()
         
         if self.views():
             self.views()[0].setDragMode(QGraphicsView.RubberBandDrag)
@@ -552,6 +823,15 @@ class GraphScene(QGraphicsScene):
         for node in self.node_items.values():
             node.setFlag(QGraphicsItem.ItemIsMovable, True)
 
+    def _cancel_pending_edge(self):
+        """Descarta el nodo origen elegido en modo edge y la línea temporal"""
+        if self.edge_mode_first_node:
+            self.edge_mode_first_node.setBrush(self.edge_mode_first_node.base_brush())
+            self.edge_mode_first_node = None
+        if self.temp_line:
+            self.removeItem(self.temp_line)
+            self.temp_line = None
+
     def _logical_item_from(self, items_list):
         """Obtiene el item lógico (NodeItem o EdgeItem) de una lista de items gráficos"""
         for it in items_list:
@@ -562,6 +842,7 @@ class GraphScene(QGraphicsScene):
 
     def mousePressEvent(self, event):
         """Maneja clics según el modo activo"""
+        if self.bulk_loading: return  # Solo se permite navegar mientras se carga un archivo
         pos = event.scenePos()
         
         # Ignorar clics fuera del área de trabajo
@@ -571,7 +852,11 @@ class GraphScene(QGraphicsScene):
              super().mousePressEvent(event)
              return
 
-        top = self._logical_item_from(self.items(pos))
+        top = self._item_at(pos)
+        # Los meta-nodos solo se mueven, se renombran o se expanden (doble clic); las aristas agregadas no se editan
+        if self.mode in ("edge", "path", "delete", "edit") and (
+                isinstance(top, MetaEdgeItem) or (isinstance(top, MetaNodeItem) and self.mode != "edit")):
+            top = None
 
         if self.mode == "draw":
             # Crear nodo si no se hizo clic sobre uno existente
@@ -596,18 +881,34 @@ class GraphScene(QGraphicsScene):
                 else:
                     # Segundo nodo: crear arista
                     self.create_edge(self.edge_mode_first_node, top)
-                    self.edge_mode_first_node.setBrush(self.edge_mode_first_node.normal_brush)
+                    self.edge_mode_first_node.setBrush(self.edge_mode_first_node.base_brush())
                     if self.temp_line: self.removeItem(self.temp_line)
                     self.temp_line = None
                     self.edge_mode_first_node = None
             else:
                 # Clic fuera de nodo: cancelar operación
                 if self.edge_mode_first_node:
-                    self.edge_mode_first_node.setBrush(self.edge_mode_first_node.normal_brush)
+                    self.edge_mode_first_node.setBrush(self.edge_mode_first_node.base_brush())
                 self.edge_mode_first_node = None
                 if self.temp_line: self.removeItem(self.temp_line)
                 self.temp_line = None
 
+        elif self.mode == "path":
+            # Modo camino: elegir origen y destino para buscar el camino más corto
+            if isinstance(top, NodeItem):
+                if self.path_source is None:
+                    self.clear_path_highlight()
+                    self.path_source = top
+                    top.setBrush(make_radial_brush(top.radius, (QColor(255, 220, 120), QColor(255, 180, 80), QColor(220, 140, 40))))
+                else:
+                    source = self.path_source
+                    self._reset_path_source()
+                    self.show_shortest_path(source.id, top.id)
+            else:
+                # Clic fuera de nodo: cancelar y quitar resaltado
+                self._reset_path_source()
+                self.clear_path_highlight()
+
         elif self.mode == "delete":
             # Eliminar nodo o arista bajo el cursor
             if isinstance(top, NodeItem): self.delete_node(top)
@@ -632,15 +933,28 @@ class GraphScene(QGraphicsScene):
             self.temp_line.setLine(start.x(), start.y(), p.x(), p.y())
         super().mouseMoveEvent(event)
 
+    def mouseReleaseEvent(self, event):
+        """Al soltar un arrastre en lote el índice se reconstruye una sola vez"""
+        super().mouseReleaseEvent(event)
+        if self._drag_suspends_index:
+            self._drag_suspends_index = False
+            self.resume_index()
+
     def mouseDoubleClickEvent(self, event):
         """Doble clic para editar nodos o aristas rápidamente"""
-        top = self._logical_item_from(self.items(event.scenePos()))
-        if isinstance(top, NodeItem): self._edit_node_label(top)
+        if self.bulk_loading: return
+        top = self._item_at(event.scenePos())
+        if isinstance(top, MetaNodeItem):
+            self.expand_group(top.id)
+            return
+        if isinstance(top, MetaEdgeItem): pass
+        elif isinstance(top, NodeItem): self._edit_node_label(top)
         elif isinstance(top, EdgeItem): self._edit_edge_weight(top)
         super().mouseDoubleClickEvent(event)
 
     def keyPressEvent(self, event):
         """Maneja atajos de teclado"""
+        if self.bulk_loading: return
         from PyQt5.QtGui import QKeySequence
         if event.key() == Qt.Key_Delete:
             self.delete_selected_items()
@@ -651,48 +965,680 @@ class GraphScene(QGraphicsScene):
         else:
             super().keyPressEvent(event)
     
+    @profiled("scene.delete_selected_items")
     def delete_selected_items(self):
-        """Elimina todos los items seleccionados"""
-        selected_edges = [item for item in self.selectedItems() if isinstance(item, EdgeItem)]
-        selected_nodes = [item for item in self.selectedItems() if isinstance(item, NodeItem)]
-
-        # Eliminar aristas primero para evitar referencias inválidas
-        for item in selected_edges:
-            self.delete_edge(item)
-        for item in selected_nodes:
-            self.delete_node(item)
-            
+        """Elimina todos los items seleccionados en lote"""
+        selected = self.selectedItems()
+        self.delete_items([item for item in selected if isinstance(item, NodeItem)],
+                          [item for item in selected if isinstance(item, EdgeItem)])
+
+    # -----------------------
+    # Operaciones en lote sobre la selección
+    # -----------------------
+    def select_items(self, items: Iterable[QGraphicsItem], add: bool = False):
+        """
+        Selecciona varios elementos emitiendo selectionChanged una sola vez al final
+        (el panel de información se actualiza una vez, no por cada elemento)
+        """
+        self.blockSignals(True)
+        try:
+            if not add: self.clearSelection()
+            for item in items: item.setSelected(True)
+        finally:
+            self.blockSignals(False)
+        self.selectionChanged.emit()
+
+    def deselect_items(self, items: Iterable[QGraphicsItem]):
+        """Quita varios elementos de la selección con una sola notificación"""
+        self.blockSignals(True)
+        try:
+            for item in items: item.setSelected(False)
+        finally:
+            self.blockSignals(False)
+        self.selectionChanged.emit()
+
     def select_all_items(self):
-        """Selecciona todos los nodos"""
-        for node in self.node_items.values():
-            node.setSelected(True)
+        """Selecciona todos los nodos de la escena (incluidos los meta-nodos)"""
+        self.select_items(self._scene_nodes())
+
+    @profiled("scene.move_nodes")
+    def move_nodes(self, nodes: Iterable[NodeItem], dx: float, dy: float):
+        """Desplaza varios nodos a la vez (ver set_node_positions)"""
+        nodes = list(nodes)
+        self.set_node_positions(nodes, self.node_positions(nodes) + (dx, dy))
+
+    def node_positions(self, nodes: List[NodeItem]) -> np.ndarray:
+        """Centros de los nodos como arreglo (n, 2)"""
+        return np.array([(n.x(), n.y()) for n in nodes], dtype=float).reshape(-1, 2)
+
+    @profiled("scene.set_node_positions")
+    def set_node_positions(self, nodes: List[NodeItem], xy: np.ndarray):
+        """
+        Coloca varios nodos en las posiciones xy (n, 2) en una sola actualización: se limitan todas juntas
+        al área de trabajo (según el radio de cada nodo), cada arista afectada se recalcula una sola vez
+        (no una vez por extremo) y la capa de aristas se actualiza en lote
+        """
+        if not nodes:
+            return
+        rect = self.sceneRect()
+        r = np.array([n.radius for n in nodes], dtype=float)
+        x = np.clip(xy[:, 0], rect.left() + r, rect.right() - r)
+        y = np.clip(xy[:, 1], rect.top() + r, rect.bottom() - r)
+        edges = {e for n in nodes for e in n.edges}
+        if self.edge_layer is not None: edges = {e for e in edges if e.is_loop()}
+        with self.index_suspended(len(nodes) + len(edges)):
+            self.moving_nodes = True
+            try:
+                for n, px, py in zip(nodes, x.tolist(), y.tolist()): n.setPos(px, py)
+            finally:
+                self.moving_nodes = False
+            if self.edge_layer is not None: self.edge_layer.nodes_moved(nodes)
+            EdgeItem.update_positions(edges)
+        self.schedule_edge_bundling()
+
+    def drag_nodes(self, nodes: List[NodeItem], dx: float, dy: float):
+        """
+        move_nodes durante un arrastre con el mouse: si el arrastre mueve lo suficiente para suspender
+        el índice, queda suspendido hasta soltar el botón en vez de reconstruirse en cada movimiento
+        """
+        if not self._drag_suspends_index and self._index_worth_suspending(len(nodes) + sum(len(n.edges) for n in nodes)):
+            self._drag_suspends_index = True
+            self.suspend_index()
+        self.move_nodes(nodes, dx, dy)
+
+    # -----------------------
+    # Acomodo de la selección
+    # -----------------------
+    def selected_nodes(self) -> List[NodeItem]:
+        """Nodos seleccionados (incluidos los meta-nodos)"""
+        return [item for item in self.selectedItems() if isinstance(item, NodeItem)]
+
+    @profiled("scene.transform_nodes")
+    def transform_nodes(self, nodes: List[NodeItem], matrix, center: Optional[Tuple[float, float]] = None):
+        """
+        Aplica una transformación lineal (matriz 2x2) a las posiciones de los nodos alrededor de center
+        (por defecto, el centro de su rectángulo envolvente), en una sola operación sobre el arreglo
+        """
+        if not nodes:
+            return
+        xy = self.node_positions(nodes)
+        c = np.asarray(center, dtype=float) if center is not None else (xy.min(axis=0) + xy.max(axis=0)) / 2
+        self.set_node_positions(nodes, (xy - c) @ np.asarray(matrix, dtype=float).T + c)
+        self.graph_changed.emit()  # Solo cambian posiciones: no invalida la versión del grafo
+
+    def scale_nodes(self, nodes: List[NodeItem], sx: float, sy: Optional[float] = None):
+        """Escala las distancias entre los nodos (sx horizontal, sy vertical; por defecto iguales)"""
+        self.transform_nodes(nodes, ((sx, 0.0), (0.0, sx if sy is None else sy)))
+
+    def rotate_nodes(self, nodes: List[NodeItem], degrees: float):
+        """Gira los nodos alrededor de su centro, en sentido horario (el eje y de la escena apunta hacia abajo)"""
+        a = math.radians(degrees)
+        self.transform_nodes(nodes, ((math.cos(a), -math.sin(a)), (math.sin(a), math.cos(a))))
+
+    @profiled("scene.align_nodes")
+    def align_nodes(self, nodes: List[NodeItem], side: str):
+        """
+        Alinea los nodos por el borde de sus círculos: left, right, top o bottom,
+        o por el centro de la selección: hcenter (misma x) o vcenter (misma y)
+        """
+        if side not in ALIGN_SIDES:
+            raise ValueError(f"Alineación desconocida: {side}")
+        if not nodes:
+            return
+        xy = self.node_positions(nodes)
+        r = np.array([n.radius for n in nodes], dtype=float)
+        axis = 0 if side in ("left", "hcenter", "right") else 1
+        lo, hi = (xy[:, axis] - r).min(), (xy[:, axis] + r).max()
+        if side in ("left", "top"): xy[:, axis] = lo + r
+        elif side in ("right", "bottom"): xy[:, axis] = hi - r
+        else: xy[:, axis] = (lo + hi) / 2
+        self.set_node_positions(nodes, xy)
+        self.graph_changed.emit()
+
+    @profiled("scene.distribute_nodes")
+    def distribute_nodes(self, nodes: List[NodeItem], axis: int):
+        """Reparte los centros de los nodos a intervalos iguales entre los dos extremos (axis 0: x, 1: y)"""
+        if len(nodes) < 3:
+            return
+        xy = self.node_positions(nodes)
+        order = np.argsort(xy[:, axis], kind="stable")
+        xy[order, axis] = np.linspace(xy[order[0], axis], xy[order[-1], axis], len(nodes))
+        self.set_node_positions(nodes, xy)
+        self.graph_changed.emit()
+
+    @profiled("scene.snap_nodes_to_grid")
+    def snap_nodes_to_grid(self, nodes: List[NodeItem], step: float = GRID_MINOR_STEP):
+        """Lleva el centro de cada nodo a la intersección más cercana de la cuadrícula"""
+        if not nodes:
+            return
+        self.set_node_positions(nodes, np.round(self.node_positions(nodes) / step) * step)
+        self.graph_changed.emit()
+
+    @profiled("scene.delete_items")
+    def delete_items(self, nodes: Iterable[NodeItem], edges: Iterable[EdgeItem] = ()):
+        """
+        Borra varios nodos y aristas con una sola notificación del grafo
+        Las aristas (las indicadas y las de los nodos) se quitan en lote; al final solo se recalculan
+        las inversas que sobreviven y las aristas agregadas de los grupos contraídos afectados
+        Los meta-nodos y las aristas agregadas se ignoran: se expanden o se deshace el grupo
+        """
+        nodes = {n for n in nodes if not isinstance(n, MetaNodeItem) and self.node_items.get(n.id) is n}
+        dead = {e for e in edges if e in self.edge_items}
+        for n in nodes: dead.update(e for e in n.edges if not isinstance(e, MetaEdgeItem))
+        if not nodes and not dead:
+            return
+        if self.path_source in nodes: self._reset_path_source()
+        if self.edge_mode_first_node in nodes: self._cancel_pending_edge()
+        G, index, owner = self.G, self.search_index, self._collapsed_owner
+        touched: Set[int] = set()
+        reverse: List[Tuple[NodeItem, NodeItem]] = []
+        with PROFILER.measure("scene.delete_items.edges"):
+            for e in dead:
+                a, b = e.source, e.dest
+                a.edges.discard(e); b.edges.discard(e)
+                self.edge_items.discard(e)
+                index.remove_edge((a.id, b.id))
+                if G.has_edge(a.id, b.id): G.remove_edge(a.id, b.id)
+                touched.update(owner[x] for x in (a.id, b.id) if x in owner)
+                if a is not b: reverse.append((b, a))
+        with PROFILER.measure("scene.delete_items.nodes"):
+            for n in nodes:
+                nid = n.id
+                for e in list(n.edges): self._remove_meta_edge(e)  # Solo quedan aristas agregadas
+                del self.node_items[nid]
+                index.remove_node(nid)
+                if G.has_node(nid): G.remove_node(nid)
+                self._remove_group_member(nid)
+                self.id_allocator.release(nid)
+        self.remove_scene_items(chain(dead, nodes))
+        if self.edge_layer is not None:
+            self.edge_layer.remove_edges(dead)
+            self.edge_layer.remove_nodes(nodes)
+        # Una arista cuya inversa se borró pasa de curva a recta
+        for b, a in reverse:
+            if b in nodes or a in nodes: continue
+            for e in b.edges:
+                if e.dest is a: e.update_position(); break
+        self._refresh_group_edges(touched)
+        self._mark_graph_changed()
+
+    @profiled("scene.remove_scene_items")
+    def remove_scene_items(self, items: Iterable[QGraphicsItem]):
+        """
+        Quita de la escena los elementos que siguen en ella (comprobación O(1) con item.scene(), sin recorrer self.items())
+        Se llama con los elementos ya fuera de node_items y edge_items: en lotes grandes frente a lo que
+        queda se suspende el índice, porque reconstruirlo una vez con el resto es más barato que sacar
+        cada elemento del árbol
+        """
+        items = [item for item in items if item.scene() is self]
+        if not items:
+            return
+        with self.index_suspended(len(items)):
+            for item in items: self.removeItem(item)
+
+    # -----------------------
+    # Índice de elementos
+    # -----------------------
+    def suspend_index(self):
+        """Pasa a NoIndex para una operación en lote; las suspensiones se anidan y cada una se cierra con resume_index"""
+        self._index_suspensions += 1
+        if self._index_suspensions == 1: self._set_index_method(QGraphicsScene.NoIndex)
+
+    def resume_index(self):
+        """Cierra una suspensión; al cerrar la última se vuelve al índice BSP, reconstruido una sola vez"""
+        self._index_suspensions -= 1
+        if self._index_suspensions == 0: self._rebuild_index()
+
+    @contextmanager
+    def index_suspended(self, count: Optional[int] = None):
+        """
+        Suspende el índice durante el bloque; con count, solo si compensa: actualizar esa cantidad de
+        elementos en el árbol cuesta más que reconstruirlo con todo el grafo
+        """
+        if count is not None and not self._index_worth_suspending(count):
+            yield
+            return
+        self.suspend_index()
+        try:
+            yield
+        finally:
+            self.resume_index()
+
+    def _index_worth_suspending(self, count: int) -> bool:
+        """Indica si una operación que toca count elementos debe hacerse sin índice"""
+        return self._index_suspensions > 0 or count * BSP_UPDATE_COST >= len(self.node_items) + len(self.edge_items)
+
+    def _rebuild_index(self):
+        """Vuelve al índice BSP con una profundidad acorde al grafo y lo construye ahora (y no en el próximo cuadro)"""
+        count = len(self.node_items) + len(self.edge_items)
+        start = time.perf_counter()
+        self._set_index_method(QGraphicsScene.BspTreeIndex)
+        self.setBspTreeDepth(max(BSP_MIN_DEPTH, min(BSP_MAX_DEPTH, count.bit_length() // 2 + 2)))
+        self.items(self.sceneRect())
+        self.index_rebuild_seconds = time.perf_counter() - start
+        if PROFILER.enabled: PROFILER.record("scene.index_rebuild", self.index_rebuild_seconds)
+
+    def index_description(self) -> str:
+        """Índice en uso, para el panel de rendimiento y los informes"""
+        if self.itemIndexMethod() == QGraphicsScene.NoIndex:
+            return "sin índice (operación en lote)"
+        depth = self.bspTreeDepth()
+        return (f"BSP, profundidad {depth or 'automática'} "
+                f"(última reconstrucción {self.index_rebuild_seconds * 1000:.0f} ms)")
+
+    def _set_index_method(self, method: QGraphicsScene.ItemIndexMethod):
+        """Cambia el índice de elementos de la escena"""
+        self.setItemIndexMethod(method)
+        if method == QGraphicsScene.BspTreeIndex:
+            # Un índice BSP nuevo no recibe el rectángulo de la escena hasta que este cambia, y sin él
+            # construir el árbol y quitar elementos es varias veces más lento
+            rect = self.sceneRect()
+            self.setSceneRect(QRectF()); self.setSceneRect(rect)
+
+    def _reset_path_source(self):
+        """Descarta el origen elegido en modo camino"""
+        if self.path_source is not None:
+            self.path_source.setBrush(self.path_source.base_brush())
+            self.path_source = None
+
+    def get_weighted_adjacency(self) -> WeightedAdjacency:
+        """Adyacencia con pesos numéricos, reconstruida solo si cambió la versión del grafo"""
+        if self._adjacency_cache is None or self._adjacency_cache[0] != self.graph_version:
+            self._adjacency_cache = (self.graph_version, WeightedAdjacency(self.G))
+        return self._adjacency_cache[1]
+
+    @profiled("scene.find_shortest_path")
+    def find_shortest_path(self, source_id: int, target_id: int) -> Optional[Tuple[float, List[int]]]:
+        """Calcula el camino más corto ponderado; None si el destino no es alcanzable"""
+        return shortest_path(self.get_weighted_adjacency(), self.G, source_id, target_id)
+
+    def show_shortest_path(self, source_id: int, target_id: int) -> Optional[Tuple[float, List[int]]]:
+        """Busca el camino más corto, lo resalta en el lienzo y notifica el resultado"""
+        self.clear_path_highlight()
+        try:
+            result = self.find_shortest_path(source_id, target_id)
+        except ValueError as exc:
+            show_warning("Camino más corto", str(exc))
+            return None
+        if result is not None:
+            self.highlight_path(result[1])
+        self.path_computed.emit(source_id, target_id, result)
+        return result
+
+    def highlight_path(self, node_ids: List[int]):
+        """Resalta los nodos y aristas de un camino"""
+        self.clear_path_highlight()
+        nodes = [self.node_items[nid] for nid in node_ids if nid in self.node_items]
+        edges = []
+        for a, b in zip(nodes, nodes[1:]):
+            for e in a.edges:
+                if e.source is a and e.dest is b:
+                    edges.append(e)
+                    break
+        for n in nodes: n.set_highlighted(True)
+        for e in edges: e.set_highlighted(True)
+        self.highlighted_path = (nodes, edges)
+        if self.edge_layer is not None: self.edge_layer.update()
+
+    def clear_path_highlight(self):
+        """Quita el resaltado del camino actual"""
+        nodes, edges = self.highlighted_path
+        for n in nodes: n.set_highlighted(False)
+        for e in edges: e.set_highlighted(False)
+        self.highlighted_path = ([], [])
+        if self.edge_layer is not None and edges: self.edge_layer.update()
+
+    # -----------------------
+    # Búsqueda
+    # -----------------------
+    @profiled("scene.rebuild_search_index")
+    def rebuild_search_index(self):
+        """Reconstruye el índice de búsqueda desde cero (tras renumerar IDs)"""
+        self.search_index.clear()
+        for nid, node in self.node_items.items():
+            self.search_index.add_node(nid, node.label)
+        for e in self.edge_items:
+            self.search_index.set_edge_weight((e.source.id, e.dest.id), e.weight_value)
+
+    def search(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> SearchResult:
+        """Busca nodos por etiqueta o ID, o aristas por rango de peso (w>5, w:1..10)"""
+        with PROFILER.measure("search.query"):
+            return self.search_index.query(text, limit)
+
+    def highlight_search(self, result: SearchResult) -> Tuple[List[NodeItem], List[EdgeItem]]:
+        """Marca los resultados de una búsqueda (reemplaza la marca anterior); retorna los elementos marcados"""
+        self.clear_search_highlight()
+        nodes = [self.node_items[nid] for nid in result.nodes if nid in self.node_items]
+        edges = []
+        for a, b in result.edges:
+            source = self.node_items.get(a)
+            for e in (source.edges if source is not None else ()):
+                if e.source is source and e.dest.id == b:
+                    edges.append(e)
+                    break
+        for n in nodes: n.set_search_match(True)
+        for e in edges: e.set_search_match(True)
+        self.search_matches = (nodes, edges)
+        if self.edge_layer is not None and edges: self.edge_layer.update()
+        return self.search_matches
+
+    def clear_search_highlight(self):
+        """Quita la marca de los resultados de búsqueda"""
+        nodes, edges = self.search_matches
+        for n in nodes: n.set_search_match(False)
+        for e in edges: e.set_search_match(False)
+        self.search_matches = ([], [])
+        if self.edge_layer is not None and edges: self.edge_layer.update()
+
+    # -----------------------
+    # Filtro de subgrafo
+    # -----------------------
+    @profiled("scene.set_filter")
+    def set_filter(self, spec: Optional[FilterSpec], mode: Optional[str] = None) -> Optional[FilterResult]:
+        """
+        Aplica un filtro de subgrafo (None lo quita) y retorna lo que queda visible
+        mode: "hide" oculta y "dim" atenúa lo que queda fuera; el filtro se reevalúa tras los cambios del grafo (ver schedule_filter_refresh)
+        """
+        self._filter_timer.stop()  # Esta evaluación reemplaza a la pendiente
+        if mode is not None and mode != self.filter_mode:
+            self._apply_filtered(set(), set())  # Restaurar todo con el modo anterior
+            self.filter_mode = mode
+        previous = self.filter_result
+        self.filter_result = evaluate_filter(spec, self.G, self.search_index) if spec is not None else None
+        self.filter_spec = spec if self.filter_result is not None else None
+        if self.filter_result is None:
+            self._apply_filtered(set(), set())
+        else:
+            nodes, edges = self.filter_result
+            self._apply_filtered({n for nid, n in self.node_items.items() if nid not in nodes},
+                                 {e for e in self.edge_items if (e.source.id, e.dest.id) not in edges})
+        if self.filter_result != previous or mode is not None:
+            self.filter_changed.emit()
+        return self.filter_result
+
+    def clear_filter(self):
+        """Quita el filtro y vuelve a mostrar todo el grafo"""
+        self.set_filter(None)
+
+    def schedule_filter_refresh(self):
+        """Programa la reevaluación del filtro activo (agrupa cambios seguidos del grafo)"""
+        if self.filter_spec is not None: self._filter_timer.start()
+
+    def _reapply_filter(self):
+        """Reevalúa el filtro activo tras un cambio del grafo"""
+        if self.filter_spec is not None:
+            self.set_filter(self.filter_spec)
+
+    def _apply_filtered(self, nodes: Set[NodeItem], edges: Set[EdgeItem]):
+        """Oculta o atenúa los elementos fuera del filtro, tocando solo los que cambian de estado"""
+        hide = self.filter_mode == "hide"
+        changed_nodes = nodes.symmetric_difference(self._filtered_nodes)
+        changed_edges = edges.symmetric_difference(self._filtered_edges)
+        self._filtered_nodes, self._filtered_edges = nodes, edges
+        with PROFILER.measure("scene.apply_filter_items"):
+            for n in changed_nodes:
+                if hide: n.setVisible(n not in nodes)
+                else: n.setOpacity(DIM_OPACITY if n in nodes else 1.0)
+            for e in changed_edges:
+                if hide: e.setVisible(self._edge_shown(e))
+                else: e.setOpacity(DIM_OPACITY if e in edges else 1.0)
+        if self.edge_layer is not None and changed_edges:
+            self.edge_layer.set_filter(edges, dim=not hide)
+
+    # -----------------------
+    # Grupos de nodos
+    # -----------------------
+    def _add_group(self, node_ids: Set[int], label: Optional[str], aggregation: str) -> NodeGroup:
+        """Registra un grupo expandido; los nodos dejan su grupo anterior"""
+        for nid in node_ids: self._remove_group_member(nid)
+        gid = min(self.groups, default=0) - 1
+        group = NodeGroup(gid, label or f"Grupo {-gid}", node_ids, aggregation)
+        self.groups[gid] = group
+        for nid in node_ids: self._group_of[nid] = gid
+        return group
+
+    def create_group(self, node_ids: Iterable[int], label: Optional[str] = None, aggregation: str = "sum",
+                     collapse: bool = True) -> Optional[NodeGroup]:
+        """Agrupa nodos visibles (no contraídos en otro grupo); None si quedan menos de dos"""
+        ids = {nid for nid in node_ids if nid in self.node_items and nid not in self._collapsed_owner}
+        if len(ids) < 2:
+            return None
+        group = self._add_group(ids, label, aggregation)
+        if collapse: self._set_collapsed([group.id], True)
+        self.groups_changed.emit()
+        return group
+
+    @profiled("scene.group_communities")
+    def group_communities(self, method: str = "louvain", min_size: int = MIN_COMMUNITY_SIZE, aggregation: str = "sum",
+                          collapse: bool = True, seed: Optional[int] = None) -> List[NodeGroup]:
+        """Reemplaza los grupos por las comunidades detectadas en el grafo (ver node_groups.detect_communities)"""
+        communities = detect_communities(self.G, method, min_size, seed)
+        self.remove_all_groups(notify=False)
+        groups = [self._add_group(members, f"Comunidad {i}", aggregation) for i, members in enumerate(communities, 1)]
+        if collapse: self._set_collapsed([g.id for g in groups], True)
+        self.groups_changed.emit()
+        return groups
+
+    def collapse_groups(self, gids: Iterable[int]):
+        """Contrae los grupos indicados en sus meta-nodos"""
+        self._set_collapsed(gids, True)
+        self.groups_changed.emit()
+
+    def expand_groups(self, gids: Iterable[int]):
+        """Expande los grupos indicados, devolviendo sus miembros a la escena"""
+        self._set_collapsed(gids, False)
+        self.groups_changed.emit()
+
+    def collapse_group(self, gid: int): self.collapse_groups([gid])
+
+    def expand_group(self, gid: int): self.expand_groups([gid])
+
+    def collapse_all_groups(self): self.collapse_groups(list(self.groups))
+
+    def expand_all_groups(self): self.expand_groups(list(self.groups))
+
+    def expand_groups_of(self, node_ids: Iterable[int]):
+        """Expande los grupos contraídos que ocultan alguno de los nodos (por ejemplo, al ir a un resultado de búsqueda)"""
+        gids = {self._collapsed_owner[nid] for nid in node_ids if nid in self._collapsed_owner}
+        if gids: self.expand_groups(gids)
+
+    def group_of(self, node_id: int) -> Optional[int]:
+        """Grupo al que pertenece un nodo, o None"""
+        return self._group_of.get(node_id)
+
+    def selected_groups(self) -> Tuple[Set[int], Set[int]]:
+        """Grupos de la selección: (contraídos cuyo meta-nodo está seleccionado, expandidos con algún nodo seleccionado)"""
+        collapsed, expanded = set(), set()
+        for item in self.selectedItems():
+            if isinstance(item, MetaNodeItem): collapsed.add(item.id)
+            elif isinstance(item, NodeItem) and item.id in self._group_of: expanded.add(self._group_of[item.id])
+        return collapsed, expanded
+
+    def ungroup(self, gid: int, notify: bool = True):
+        """Expande el grupo y lo deshace (los nodos quedan sueltos)"""
+        if gid not in self.groups:
+            return
+        self._set_collapsed([gid], False)
+        for nid in self.groups.pop(gid).members: self._group_of.pop(nid, None)
+        if notify: self.groups_changed.emit()
+
+    def remove_all_groups(self, notify: bool = True):
+        """Expande y deshace todos los grupos"""
+        if not self.groups:
+            return
+        self._set_collapsed(list(self.group_items), False)
+        self._forget_groups()
+        if notify: self.groups_changed.emit()
+
+    def restore_groups(self, groups: List[NodeGroup]):
+        """Restaura grupos leídos de un archivo (ver node_groups.groups_from_data) y contrae los que estaban contraídos"""
+        self.remove_all_groups(notify=False)
+        collapsed = []
+        for group in groups:
+            group.members = {m for m in group.members if m in self.node_items and m not in self._group_of}
+            if not group.members: continue
+            if group.collapsed: collapsed.append(group.id)
+            group.collapsed = False
+            self.groups[group.id] = group
+            for m in group.members: self._group_of[m] = group.id
+        self._set_collapsed(collapsed, True)
+        self.groups_changed.emit()
+
+    def _forget_groups(self):
+        """Quita meta-nodos y aristas agregadas y olvida los grupos, sin devolver los miembros a la escena"""
+        self.remove_scene_items(chain(self.meta_edges.values(), self.group_items.values()))
+        self.groups.clear(); self._group_of.clear(); self._collapsed_owner.clear()
+        self.group_items.clear(); self.meta_edges.clear()
+
+    def _remove_group_member(self, nid: int):
+        """Saca un nodo de su grupo (al borrarlo o reagruparlo); un grupo vacío se deshace"""
+        gid = self._group_of.pop(nid, None)
+        if gid is None:
+            return
+        group = self.groups[gid]
+        group.members.discard(nid)
+        self._collapsed_owner.pop(nid, None)
+        if not group.members: self.ungroup(gid, notify=False)
+        elif group.collapsed: self._refresh_group_edges({gid})
+
+    def _members_center(self, group: NodeGroup) -> Tuple[float, float]:
+        """Centro de las posiciones de los miembros"""
+        nodes = [self.node_items[m] for m in group.members]
+        return sum(n.x() for n in nodes) / len(nodes), sum(n.y() for n in nodes) / len(nodes)
+
+    @profiled("scene.set_groups_collapsed")
+    def _set_collapsed(self, gids: Iterable[int], collapsed: bool):
+        """
+        Contrae o expande grupos de forma incremental: solo entran o salen de la escena los miembros,
+        sus aristas y las aristas agregadas de los grupos afectados (los que cambian y sus vecinos contraídos)
+        """
+        groups = [self.groups[gid] for gid in set(gids) if gid in self.groups and self.groups[gid].collapsed != collapsed]
+        if not groups:
+            return
+        owner, G = self._collapsed_owner, self.G
+        affected = {g.id for g in groups}
+        for group in groups:
+            for m in group.members:
+                affected.update(owner[v] for v in chain(G.succ[m], G.pred[m]) if v in owner)
+        with self.index_suspended(sum(1 + G.degree(m) for g in groups for m in g.members)):
+            # Las aristas agregadas de los grupos afectados se recalculan al final con la nueva asignación
+            for gid in affected:
+                item = self.group_items.get(gid)
+                for e in list(item.edges if item is not None else ()): self._remove_meta_edge(e)
+            for group in groups:
+                group.collapsed = collapsed
+                if collapsed: self._collapse_items(group)
+                else: self._expand_items(group)
+            self._refresh_group_edges(affected)
+        self._refresh_edge_layer()
+        self.schedule_edge_bundling()
+
+    def _collapse_items(self, group: NodeGroup):
+        """Quita de la escena los miembros y sus aristas y agrega el meta-nodo"""
+        members = [self.node_items[m] for m in group.members]
+        for m in group.members: self._collapsed_owner[m] = group.id
+        if self.path_source is not None and self.path_source.id in group.members: self._reset_path_source()
+        if self.edge_mode_first_node is not None and self.edge_mode_first_node.id in group.members: self._cancel_pending_edge()
+        for node in members:
+            if node.isSelected(): node.setSelected(False)
+            for e in node.edges:
+                if e.scene() is self: self.removeItem(e)
+            if node.scene() is self: self.removeItem(node)
+        group.center = self._members_center(group)
+        item = MetaNodeItem(group, QPointF(*(group.pos or group.center)))
+        self.addItem(item)
+        self.group_items[group.id] = item
+
+    def _expand_items(self, group: NodeGroup):
+        """Quita el meta-nodo y devuelve a la escena los miembros y sus aristas hacia nodos visibles"""
+        item = self.group_items.pop(group.id, None)
+        if item is not None:
+            # Los miembros acompañan al meta-nodo si se movió desde que se contrajo
+            dx, dy = item.x() - group.center[0], item.y() - group.center[1]
+            self.removeItem(item)
+        else:
+            dx = dy = 0.0
+        group.pos = None
+        owner = self._collapsed_owner
+        for m in group.members: owner.pop(m, None)
+        members = [self.node_items[m] for m in group.members]
+        for node in members:
+            if dx or dy: node.setPos(node.x() + dx, node.y() + dy)
+            self.addItem(node)
+        for node in members:
+            for e in node.edges:
+                if e.scene() is None and e.source.id not in owner and e.dest.id not in owner:
+                    if dx or dy: e.update_position()
+                    self.addItem(e)
+
+    def _refresh_group_edges(self, gids: Set[int]):
+        """Recalcula las aristas agregadas de los grupos contraídos indicados y actualiza sus meta-nodos"""
+        gids = {gid for gid in gids if gid in self.group_items}
+        if not gids:
+            return
+        for gid in gids:
+            for e in list(self.group_items[gid].edges): self._remove_meta_edge(e)
+        aggregated = aggregate_edges(self.G, self._collapsed_owner, {gid: self.groups[gid].members for gid in gids},
+                                     {gid: g.aggregation for gid, g in self.groups.items()})
+        weights_visible = self._weights_visible()
+        created = []
+        for (a, b), (value, count) in aggregated.items():
+            source = self.group_items[a] if a < 0 else self.node_items[a]
+            dest = self.group_items[b] if b < 0 else self.node_items[b]
+            edge = MetaEdgeItem(source, dest, value, count)
+            if not weights_visible: edge.set_text_visibility(False)
+            edge.setVisible(self._edge_shown(edge))
+            self.addItem(edge)
+            self.meta_edges[edge.key] = edge
+            created.append(edge)
+        # Las agregadas en ambos sentidos se curvan: la primera en crearse no vio a su inversa
+        for edge in created:
+            if (edge.key[1], edge.key[0]) in self.meta_edges: edge.update_position()
+        for gid in gids: self.group_items[gid].refresh()
+        if self.edge_layer is not None:
+            self.edge_layer.add_edges(created)
+            self.edge_layer.nodes_moved([self.group_items[gid] for gid in gids])  # El radio sigue a los miembros
+
+    def _remove_meta_edge(self, edge: "MetaEdgeItem"):
+        """Quita una arista agregada de la escena y de sus extremos"""
+        if self.meta_edges.get(edge.key) is not edge:
+            return
+        del self.meta_edges[edge.key]
+        edge.source.edges.discard(edge)
+        edge.dest.edges.discard(edge)
+        if edge.scene() is self: self.removeItem(edge)
+        if self.edge_layer is not None: self.edge_layer.remove_edges([edge])
 
     def _edit_node_label(self, node: NodeItem):
         """Abre diálogo para editar la etiqueta de un nodo"""
         text, ok = QInputDialog.getText(None, "Editar etiqueta", "Etiqueta de nodo:", text=node.label)
         if ok:
             node.set_label(text)
-            if node.id in self.G.nodes:
+            if isinstance(node, MetaNodeItem): self.groups_changed.emit()
+            elif node.id in self.G.nodes:
                 self.G.nodes[node.id]["label"] = text
-                self.graph_changed.emit()
+                self._mark_graph_changed()
 
     def _edit_edge_weight(self, edge: EdgeItem):
         """Abre diálogo para editar el peso de una arista"""
         text, ok = QInputDialog.getText(None, "Editar peso", "Peso:", text=str(edge.weight))
         if ok:
             edge.set_weight(text)
+            if self.edge_layer is not None: self.edge_layer.edge_changed(edge)
             a, b = edge.source.id, edge.dest.id
             if self.G.has_edge(a, b):
                 self.G[a][b]["weight"] = text
-                self.graph_changed.emit()
+                self.G[a][b]["value"] = edge.weight_value
+                self._mark_graph_changed()
 
+    @profiled("scene.create_node")
     def create_node(self, pos: QPointF, label: Optional[str] = None, radius: Optional[int] = None) -> NodeItem:
         """Crea un nuevo nodo en la posición especificada"""
         from utils import DEFAULT_NODE_RADIUS
-        # Buscar ID único
-        nid = self.node_counter
-        while nid in self.node_items:
-            nid += 1
+        # Obtener ID único en O(1)
+        nid = self.id_allocator.allocate()
+        while nid in self.node_items:  # Solo ocurre si se insertaron IDs explícitos fuera del asignador
+            nid = self.id_allocator.allocate()
             
         label_text = label if label is not None else f"{nid}"
         node = NodeItem(nid, label_text, pos, radius=radius if radius is not None else DEFAULT_NODE_RADIUS)
@@ -700,10 +1646,11 @@ class GraphScene(QGraphicsScene):
         self.addItem(node)
         self.node_items[nid] = node
         self.G.add_node(nid, label=label_text)
-        self.node_counter = max(self.node_counter, nid + 1)
-        self.graph_changed.emit()
+        self.search_index.add_node(nid, label_text)
+        self._mark_graph_changed()
         return node
 
+    @profiled("scene.create_edge")
     def create_edge(self, source: NodeItem, dest: NodeItem, weight: Optional[str] = None) -> Optional[EdgeItem]:
         """Crea una nueva arista entre dos nodos"""
         a, b = source.id, dest.id
@@ -723,14 +1670,21 @@ class GraphScene(QGraphicsScene):
         edge = EdgeItem(source, dest, weight_val)
         
         # Respetar visibilidad global de pesos
-        main_window = self.views()[0].window()
-        if hasattr(main_window, 'toggle_weights_action'):
-            is_visible = main_window.toggle_weights_action.isChecked()
-            edge.set_text_visibility(is_visible)
+        if not self._weights_visible(): edge.set_text_visibility(False)
 
         self.addItem(edge)
         self.edge_items.add(edge)
-        self.G.add_edge(a, b, weight=weight_val)
+        self.G.add_edge(a, b, weight=weight_val, value=edge.weight_value)
+        self.search_index.set_edge_weight((a, b), edge.weight_value)
+        touched = {self._collapsed_owner[x] for x in (a, b) if x in self._collapsed_owner}
+        if touched:
+            # Un extremo está dentro de un grupo contraído: la arista se suma a la agregada
+            self.removeItem(edge)
+            self._refresh_group_edges(touched)
+        elif self.edge_layer is not None:
+            # La capa dibuja la arista (y desplaza su inversa, si existe)
+            edge.setVisible(self._edge_shown(edge))
+            self.edge_layer.add_edges([edge])
         
         # Actualizar arista inversa si existe
         for other_edge in dest.edges:
@@ -738,62 +1692,122 @@ class GraphScene(QGraphicsScene):
                 other_edge.update_position()
                 break
         
-        self.graph_changed.emit()
+        self._mark_graph_changed()
         return edge
 
+    def _weights_visible(self) -> bool:
+        """Indica si la ventana principal muestra los pesos de las aristas"""
+        main_window = self.views()[0].window() if self.views() else None
+        return not hasattr(main_window, 'toggle_weights_action') or main_window.toggle_weights_action.isChecked()
+
+    # -----------------------
+    # Carga por lotes
+    # -----------------------
+    def begin_bulk_load(self):
+        """Vacía la escena y suspende notificaciones e índice para insertar un grafo por lotes"""
+        self.bulk_loading = True  # Antes de limpiar: la limpieza tampoco notifica
+        self.suspend_index()
+        self.clear_scene(keep_background=False)
+        self._bulk_weights_visible = self._weights_visible()
+
+    @profiled("scene.add_nodes_batch")
+    def add_nodes_batch(self, nodes: List[Tuple[int, str, float, float, int]]):
+        """Agrega nodos ya validados como tuplas (id, etiqueta, x, y, radio)"""
+        for nid, label, x, y, radius in nodes:
+            node = NodeItem(nid, label, QPointF(x, y), radius)
+            self.addItem(node)
+            self.node_items[nid] = node
+            self.G.add_node(nid, label=label)
+            self.search_index.add_node(nid, label)
+
+    @profiled("scene.add_edges_batch")
+    def add_edges_batch(self, edges: List[Tuple[int, int, str, float, bool]]):
+        """
+        Agrega aristas ya validadas como tuplas (origen, destino, peso, valor numérico, tiene_inversa)
+        Sin diálogos ni verificación de duplicados: los datos vienen de prepare_graph_data
+        """
+        nodes = self.node_items
+        for a, b, weight, value, has_reverse in edges:
+            source, dest = nodes[a], nodes[b]
+            edge = EdgeItem(source, dest, weight, value)
+            if not self._bulk_weights_visible: edge.set_text_visibility(False)
+            self.addItem(edge)
+            self.edge_items.add(edge)
+            self.G.add_edge(a, b, weight=weight, value=value)
+            self.search_index.set_edge_weight((a, b), value)
+            # Si la inversa ya estaba dibujada como recta, ahora debe curvarse
+            if has_reverse:
+                for other_edge in dest.edges:
+                    if other_edge.dest is source:
+                        other_edge.update_position()
+                        break
+
+    def end_bulk_load(self, allocator_data: Optional[dict] = None, groups: Optional[List[NodeGroup]] = None):
+        """Termina la carga por lotes (restaurando los grupos guardados) y notifica un único cambio del grafo"""
+        self.id_allocator.load_data(allocator_data, self.node_items.keys())
+        if groups: self.restore_groups(groups)
+        self.bulk_loading = False
+        self.resume_index()
+        self._refresh_edge_layer()
+        self._mark_graph_changed()
+
+    def cancel_bulk_load(self):
+        """Abandona una carga por lotes a medias y deja la escena vacía"""
+        if not self.bulk_loading:
+            return
+        self.bulk_loading = False
+        self.clear_scene(keep_background=False)
+        self.resume_index()
+
+    @profiled("scene.delete_node")
     def delete_node(self, node: NodeItem):
-        """Elimina un nodo y todas sus aristas conectadas"""
-        nid = node.id
-        # Eliminar todas las aristas conectadas primero
-        for e in list(node.edges):
-            self.delete_edge(e)
-        
-        if node in self.items():
-            self.removeItem(node)
-        
-        self.node_items.pop(nid, None)
-        if self.G.has_node(nid):
-            self.G.remove_node(nid)
-        self.graph_changed.emit()
+        """Elimina un nodo y todas sus aristas conectadas (costo proporcional a su grado)"""
+        self.delete_items([node])
 
+    @profiled("scene.delete_edge")
     def delete_edge(self, edge: EdgeItem):
         """Elimina una arista del grafo"""
-        a, b = edge.source, edge.dest
-        
-        # Desregistrar arista de los nodos
-        edge.source.edges.discard(edge)
-        if not edge.is_loop():
-            edge.dest.edges.discard(edge)
-            
-        if edge in self.items():
-            self.removeItem(edge)
-        self.edge_items.discard(edge)
-        if self.G.has_edge(a.id, b.id):
-            self.G.remove_edge(a.id, b.id)
-        
-        # Actualizar arista inversa si existe
-        if not edge.is_loop():
-             for rev_edge in b.edges:
-                  if rev_edge.dest == a:
-                       rev_edge.update_position()
-                       break
-
-        self.graph_changed.emit()
+        if isinstance(edge, MetaEdgeItem):
+            self._remove_meta_edge(edge)
+            return
+        self.delete_items((), [edge])
 
+    @profiled("scene.clear_scene")
     def clear_scene(self, keep_background: bool = True):
-        """Limpia todos los nodos y aristas del grafo"""
-        for e in list(self.edge_items): self.removeItem(e)
-        self.edge_items.clear()
-        for n in list(self.node_items.values()): self.removeItem(n)
+        """
+        Limpia todos los nodos y aristas del grafo
+        Los elementos salen de la escena en un solo lote (sin índice BSP), el modelo se reemplaza en vez
+        de vaciarse y se notifica un único cambio del grafo (los grupos desaparecen con él; el filtro
+        se anuncia aparte solo si había uno activo)
+        """
+        self._cancel_pending_edge()
+        self.path_source = None
+        self.highlighted_path, self.search_matches = ([], []), ([], [])
+        self._forget_groups()
+        nodes, edges = list(self.node_items.values()), list(self.edge_items)
         self.node_items.clear()
-        self.G.clear()
-        self.node_counter = 0
+        self.edge_items.clear()
+        # Los miembros de grupos contraídos ya están fuera de la escena: remove_scene_items los salta
+        self.remove_scene_items(chain(edges, nodes))
+        # Sin los ciclos nodo <-> arista los elementos se liberan ahora y no en una pausa posterior del recolector
+        for node in nodes: node.edges.clear()
+        self.G = nx.DiGraph()
+        self._adjacency_cache = None
+        self.search_index.clear()
+        filtered = self.filter_result is not None
+        self.filter_spec = self.filter_result = None
+        self._filtered_nodes, self._filtered_edges = set(), set()
+        self.id_allocator.reset()
         if not keep_background: self.remove_background_image()
-        self.graph_changed.emit()
+        self._refresh_edge_layer()
+        self._mark_graph_changed()
+        if filtered: self.filter_changed.emit()
 
+    @profiled("scene.get_graph_data")
     def get_graph_data(self) -> dict:
         """Serializa el grafo a un diccionario para guardar"""
-        data = {"nodes": [], "edges": [], "background": self.background_image_path}
+        data = {"nodes": [], "edges": [], "background": self.background_image_path,
+                "id_allocator": self.id_allocator.to_data()}
         if self.background_image_item:
             data["background_pos"] = [self.background_image_item.x(), self.background_image_item.y()]
             data["background_scale"] = self.background_image_item.scale()
@@ -804,47 +1818,61 @@ class GraphScene(QGraphicsScene):
         # Guardar información de cada arista
         for e in self.edge_items:
             data["edges"].append({"a": e.source.id, "b": e.dest.id, "weight": e.weight})
+        # Guardar los grupos con la posición de su meta-nodo
+        for gid, item in self.group_items.items():
+            self.groups[gid].pos = (item.x(), item.y())
+        if self.groups: data["groups"] = [g.to_data() for g in self.groups.values()]
         return data
 
+    @profiled("scene.load_graph_from_data")
     def load_graph_from_data(self, data: dict, view: Optional[QGraphicsView] = None):
-        """Carga un grafo desde un diccionario serializado"""
-        from utils import DEFAULT_NODE_RADIUS
-        self.clear_scene(keep_background=False)
-        nodes_data = data.get("nodes", [])
-        
-        temp_node_map = {}
-        max_id = -1
-        
-        # Recrear todos los nodos
-        for n_data in nodes_data:
-            nid = int(n_data["id"])
-            pos = QPointF(float(n_data.get("x", 0)), float(n_data.get("y", 0)))
-            label = n_data.get("label", str(nid))
-            radius = int(n_data.get("radius", DEFAULT_NODE_RADIUS))
-            
-            node = NodeItem(nid, label, pos, radius)
-            node.setFlag(QGraphicsItem.ItemIsMovable, True)
-            self.addItem(node)
-            temp_node_map[nid] = node
-            self.G.add_node(nid, label=label)
-            max_id = max(max_id, nid)
-        
-        self.node_items = temp_node_map
-        self.node_counter = max_id + 1
-
-        # Recrear todas las aristas
-        for ed_data in data.get("edges", []):
-            a, b = int(ed_data["a"]), int(ed_data["b"])
-            if a in self.node_items and b in self.node_items:
-                self.create_edge(self.node_items[a], self.node_items[b], ed_data.get("weight", ""))
-        
-        # Restaurar imagen de fondo si existe
-        bg_path = data.get("background")
-        if bg_path and self.set_background_image(bg_path, view=view):
-            pass
-
-        self.graph_changed.emit()
+        """Carga un grafo desde un diccionario serializado (de una vez, ver graph_loader para la carga progresiva)"""
+        graph = prepare_graph_data(data)
+        self.begin_bulk_load()
+        self.restore_background(graph, view=view)
+        self.add_nodes_batch(graph.nodes)
+        self.add_edges_batch(graph.edges)
+        self.end_bulk_load(graph.id_allocator, graph.groups)
+
+    @profiled("scene.generate_graph")
+    def generate_graph(self, kind: str, n: int, view: Optional[QGraphicsView] = None, **options) -> Tuple[int, int]:
+        """
+        Reemplaza el grafo por uno sintético (ver graph_generators) insertado por lotes
+        options: weights, layout, seed, degree, rewire; retorna (nodos, aristas)
+        """
+        self.load_graph_from_data(generate_graph_data(kind, n, **options), view=view)
+        return len(self.node_items), len(self.edge_items)
+
+    def restore_background(self, graph: "PreparedGraph", view: Optional[QGraphicsView] = None):
+        """Restaura la imagen de fondo guardada con su posición y escala"""
+        if graph.background and self.set_background_image(graph.background, view=view):
+            self.set_background_geometry(QPointF(*graph.background_pos), graph.background_scale)
     
+    @profiled("scene.compact_node_ids")
+    def compact_node_ids(self) -> Dict[int, int]:
+        """
+        Renumera los nodos con IDs consecutivos desde 0 (en el orden actual de IDs)
+        Las etiquetas no cambian; retorna el mapeo id_anterior -> id_nuevo
+        """
+        mapping = {old: new for new, old in enumerate(sorted(self.node_items))}
+        self.node_items = {mapping[old]: node for old, node in self.node_items.items()}
+        for node in self.node_items.values():
+            node.id = mapping[node.id]
+        self.G = nx.relabel_nodes(self.G, mapping, copy=True)
+        for group in self.groups.values():
+            group.members = {mapping[m] for m in group.members}
+        self._group_of = {mapping[nid]: gid for nid, gid in self._group_of.items()}
+        self._collapsed_owner = {mapping[nid]: gid for nid, gid in self._collapsed_owner.items()}
+        self._refresh_group_edges(set(self.group_items))  # Las claves de las aristas agregadas usan IDs de nodos
+        self.rebuild_search_index()
+        if self.filter_spec is not None and self.filter_spec.kind == "neighbourhood":
+            center, k, direction = self.filter_spec.args
+            self.filter_spec = FilterSpec("neighbourhood", (mapping.get(center, center), k, direction))
+        self.id_allocator.reset(len(mapping))
+        self._mark_graph_changed()
+        return mapping
+
+    @profiled("scene.set_node_radius_all")
     def set_node_radius_all(self, new_radius: int):
         """Cambia el radio de todos los nodos existentes"""
         from utils import DEFAULT_NODE_RADIUS
@@ -852,15 +1880,97 @@ class GraphScene(QGraphicsScene):
         utils.DEFAULT_NODE_RADIUS = new_radius
         for n in self.node_items.values():
             n.update_radius(new_radius)
+        self._refresh_edge_layer()
+
+    def edge_values(self) -> Dict[Tuple[int, int], float]:
+        """Pesos numéricos en caché de las aristas que la matriz muestra con valor distinto de 0"""
+        return {(a, b): d["value"] for a, b, d in self._matrix_edges() if str(d.get("weight", "1")) != "0"}
+
+    def _matrix_edges(self):
+        """Aristas (origen, destino, datos) de la matriz: todas, o solo las del filtro activo"""
+        if self.filter_result is None:
+            return self.G.edges(data=True)
+        G = self.G
+        return ((a, b, G[a][b]) for a, b in self.filter_result.edges if G.has_edge(a, b))
+
+    @profiled("scene.apply_hierarchical_layout")
+    def apply_hierarchical_layout(self) -> bool:
+        """Acomoda los nodos en capas siguiendo la dirección de las aristas"""
+        if not self.node_items:
+            return False
+        max_r = max(n.radius for n in self.node_items.values())
+        positions = hierarchical_layout(self.G, layer_spacing=2 * max_r + 110, node_spacing=2 * max_r + 40)
+        self._apply_positions(positions)
+        self.graph_changed.emit()  # Solo cambian posiciones: no invalida la versión del grafo
+        return True
+
+    def _apply_positions(self, positions: Dict[int, Tuple[float, float]]):
+        """Mueve los nodos a las posiciones calculadas, centradas en el grafo actual y dentro del lienzo"""
+        if not positions:
+            return
+        # Centrar el nuevo acomodo donde estaba el grafo para no perderlo de vista
+        cx = sum(n.x() for n in self.node_items.values()) / len(self.node_items)
+        cy = sum(n.y() for n in self.node_items.values()) / len(self.node_items)
+        xs = [p[0] for p in positions.values()]
+        ys = [p[1] for p in positions.values()]
+        mid_x, mid_y = (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        # Comprimir si el acomodo no cabe en el área de trabajo
+        max_r = max(n.radius for n in self.node_items.values())
+        rect = self.sceneRect().adjusted(max_r, max_r, -max_r, -max_r)
+        sx = min(1.0, rect.width() / (max(xs) - min(xs))) if max(xs) > min(xs) else 1.0
+        sy = min(1.0, rect.height() / (max(ys) - min(ys))) if max(ys) > min(ys) else 1.0
+        cx = max(rect.left() + (mid_x - min(xs)) * sx, min(cx, rect.right() - (max(xs) - mid_x) * sx))
+        cy = max(rect.top() + (mid_y - min(ys)) * sy, min(cy, rect.bottom() - (max(ys) - mid_y) * sy))
+
+        # Se mueve todo el grafo: sin índice, que se reconstruye una vez al terminar
+        with self.index_suspended():
+            self.moving_nodes = True  # Las aristas se recalculan una sola vez al final
+            try:
+                for nid, (x, y) in positions.items():
+                    node = self.node_items.get(nid)
+                    if node is not None:
+                        node.setPos(cx + (x - mid_x) * sx, cy + (y - mid_y) * sy)
+                # Los meta-nodos pasan al centro de sus miembros en el nuevo acomodo
+                for gid, item in self.group_items.items():
+                    group = self.groups[gid]
+                    group.center = self._members_center(group)
+                    item.setPos(*group.center)
+            finally:
+                self.moving_nodes = False
+            # Recalcular aristas con las posiciones definitivas (incluye bucles y curvas de aristas inversas)
+            EdgeItem.update_positions(chain(self.edge_items, self.meta_edges.values()))
+        self._refresh_edge_layer()
+        self.schedule_edge_bundling()
+
+    @profiled("scene.render_to_image")
+    def render_to_image(self, padding: float = 50.0) -> QImage:
+        """Renderiza todos los elementos de la escena a una imagen con fondo blanco"""
+        # Calcular área a renderizar con padding
+        rect = self.itemsBoundingRect()
+        rect.adjust(-padding, -padding, padding, padding)
+
+        # Crear imagen y pintor
+        image = QImage(rect.size().toSize(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.white)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+
+        # Renderizar escena a imagen
+        self.render(painter, QRectF(image.rect()), rect)
+        painter.end()
+        return image
 
     def to_matrix(self) -> Tuple[List[int], List[List[str]]]:
-        """Convierte el grafo a una matriz de adyacencia"""
-        nodes = sorted(self.G.nodes())
+        """Convierte el grafo (o el subgrafo filtrado) a una matriz de adyacencia"""
+        nodes = sorted(self.G.nodes() if self.filter_result is None else self.filter_result.nodes)
         n = len(nodes)
         mat: List[List[str]] = [["0" for _ in range(n)] for _ in range(n)]
         idx = {node: i for i, node in enumerate(nodes)}
         # Llenar matriz con los pesos de las aristas
-        for a, b, data in self.G.edges(data=True):
+        for a, b, data in self._matrix_edges():
             if a in idx and b in idx:
                 i, j = idx[a], idx[b]
                 w_str = str(data.get("weight", "1"))
@@ -914,17 +2024,163 @@ class GraphView(QGraphicsView):
         
         self._current_node = None
         self._position_info_panel()
+
+        # El panel se actualiza una vez por ráfaga de cambios de selección (selección en lote, rectángulo)
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(0)
+        self._selection_timer.timeout.connect(self._update_info_panel)
+        scene.selectionChanged.connect(self._selection_timer.start)
+
+        self.analytics = None  # Servicio de métricas opcional (GraphAnalytics)
+
+        # Panel de rendimiento (esquina superior derecha), oculto por defecto
+        self._perf_panel = QLabel(self)
+        self._perf_panel.setStyleSheet("""
+            QLabel {
+                background-color: rgba(44, 62, 80, 220);
+                border-radius: 8px;
+                padding: 8px;
+                color: #ecf0f1;
+                font-family: Consolas, 'Courier New', monospace;
+                font-size: 11px;
+            }
+        """)
+        self._perf_panel.setTextFormat(Qt.RichText)
+        self._perf_panel.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._perf_panel.hide()
+        self._frame_times = deque(maxlen=120)  # Instantes de los últimos cuadros pintados
+        self.frame_telemetry = FrameTelemetry()  # Buffer circular con la medición de cada cuadro
+        self._background_ms = 0.0  # Tiempo de fondo acumulado en el cuadro en curso
+        self._perf_timer = QTimer(self)
+        self._perf_timer.setInterval(500)
+        self._perf_timer.timeout.connect(self._update_perf_panel)
+
+        # La cuadrícula solo se vuelve a dibujar al cambiar el zoom o al invalidarla
+        self.setCacheMode(QGraphicsView.CacheBackground)
+        self.viewport_update_mode = "minimal"
+        self.opengl_enabled = False
+
+    def set_analytics(self, analytics):
+        """Conecta el servicio de métricas para mostrarlas en el panel de información"""
+        self.analytics = analytics
+        analytics.result_ready.connect(self._on_analytics_ready)
+
+    def _on_analytics_ready(self, metric: str, arg):
+        """Actualiza el panel si llegó una métrica del nodo mostrado"""
+        node = self._current_node
+        if node is None or not self._info_panel.isVisible():
+            return
+        if metric == "pagerank" or (metric == "reachability" and arg == node.id):
+            self.show_node_info_panel(node)
         
+    def set_viewport_update_mode_name(self, name: str):
+        """Cambia la estrategia de actualización del viewport (ver VIEWPORT_UPDATE_MODES)"""
+        if name not in VIEWPORT_UPDATE_MODES: name = "minimal"
+        self.viewport_update_mode = name
+        self.setViewportUpdateMode(VIEWPORT_UPDATE_MODES[name][1])
+
+    def set_opengl_enabled(self, enabled: bool) -> bool:
+        """
+        Usa un viewport OpenGL (o vuelve al raster); retorna si quedó activo
+        Si el sistema no ofrece un contexto OpenGL válido se mantiene el viewport raster
+        """
+        if enabled == self.opengl_enabled:
+            return enabled
+        if enabled and not QOpenGLContext().create():
+            show_warning("OpenGL", "No se pudo crear un contexto OpenGL. Se mantiene el dibujo por software.")
+            return False
+        self.setViewport(QOpenGLWidget() if enabled else QWidget())
+        self.opengl_enabled = enabled
+        self.resetCachedContent()
+        return enabled
+
     def resizeEvent(self, event):
         """Reposiciona el panel cuando cambia el tamaño de la vista"""
         super().resizeEvent(event)
         self._position_info_panel()
+        self._position_perf_panel()
         
     def _position_info_panel(self):
         """Posiciona el panel en la esquina superior izquierda con margen"""
         margin = 15
         self._info_panel.move(margin, margin)
         
+    def _position_perf_panel(self):
+        """Posiciona el panel de rendimiento en la esquina superior derecha"""
+        margin = 15
+        self._perf_panel.adjustSize()
+        self._perf_panel.move(max(margin, self.viewport().width() - self._perf_panel.width() - margin), margin)
+
+    def set_perf_overlay_visible(self, visible: bool):
+        """Muestra u oculta el panel de rendimiento (activa la instrumentación mientras está visible)"""
+        PROFILER.set_enabled(visible)
+        self._frame_times.clear()
+        self.frame_telemetry.clear()
+        if visible:
+            self._update_perf_panel()
+            self._perf_panel.show()
+            self._perf_panel.raise_()
+            self._perf_timer.start()
+        else:
+            self._perf_timer.stop()
+            self._perf_panel.hide()
+
+    def paintEvent(self, event):
+        """Pinta la vista; con la instrumentación activa mide el cuadro y cuenta los elementos pintados"""
+        if not PROFILER.enabled:
+            super().paintEvent(event)
+            return
+        counters = PROFILER.counters
+        nodes_before, edges_before = counters.get("paint.nodes", 0), counters.get("paint.edges", 0)
+        self._background_ms = 0.0
+        start = time.perf_counter()
+        super().paintEvent(event)
+        end = time.perf_counter()
+        PROFILER.record("view.paint", end - start)
+        self._frame_times.append(end)
+        exposed = sum(r.width() * r.height() for r in event.region().rects())
+        self.frame_telemetry.add(FrameSample(
+            time.time(), (end - start) * 1000, self._background_ms,
+            counters.get("paint.nodes", 0) - nodes_before, counters.get("paint.edges", 0) - edges_before, exposed,
+        ))
+
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        """Dibuja el fondo de la escena midiendo su parte del cuadro"""
+        if not PROFILER.enabled:
+            super().drawBackground(painter, rect)
+            return
+        start = time.perf_counter()
+        super().drawBackground(painter, rect)
+        self._background_ms += (time.perf_counter() - start) * 1000
+
+    def export_frame_telemetry(self, path: str):
+        """Guarda los cuadros medidos en CSV"""
+        self.frame_telemetry.to_csv(path)
+
+    def frames_per_second(self) -> float:
+        """Cuadros pintados por segundo durante el último segundo"""
+        now = time.perf_counter()
+        return float(sum(1 for t in self._frame_times if now - t <= 1.0))
+
+    def _update_perf_panel(self):
+        """Refresca el texto del panel de rendimiento"""
+        last = self.frame_telemetry.last()
+        lines = [
+            "<b>Rendimiento</b>",
+            f"FPS: {self.frames_per_second():.0f}",
+            f"Último cuadro: {last.frame_ms:.1f} ms (fondo {last.background_ms:.1f} ms)",
+            f"Cuadro p95: {self.frame_telemetry.p95_frame_ms():.1f} ms",
+            f"Pintados: {last.nodes} nodos, {last.edges} aristas",
+            f"Área expuesta: {last.exposed_px} px",
+            f"Índice: {self.scene().index_description()}",
+            "<br><b>Más lentas (recientes)</b>",
+        ]
+        slowest = PROFILER.slowest_recent(5)
+        lines += [f"{name}: {sec * 1000:.1f} ms" for name, sec in slowest] or ["—"]
+        self._perf_panel.setText("<br>".join(lines))
+        self._position_perf_panel()
+
     def show_node_info_panel(self, node: NodeItem):
         """Muestra el panel con información del nodo seleccionado"""
         self._current_node = node
@@ -942,6 +2198,58 @@ class GraphView(QGraphicsView):
         """Oculta el panel de información"""
         self._info_panel.hide()
         self._current_node = None
+
+    def _update_info_panel(self):
+        """Detalle si hay un solo nodo seleccionado, resumen si hay varios elementos (o un grupo), nada si no hay selección"""
+        selected = self.scene().selectedItems()
+        if len(selected) == 1 and type(selected[0]) is NodeItem:
+            self.show_node_info_panel(selected[0])
+        elif selected:
+            self.show_selection_summary(selected)
+        else:
+            self.hide_node_info_panel()
+
+    def show_selection_summary(self, items: List[QGraphicsItem]):
+        """Muestra en el panel un resumen de una selección múltiple"""
+        self._current_node = None
+        self._info_text.setText(self._build_selection_text(items))
+        self._info_text.adjustSize()
+        self._info_panel.adjustSize()
+        self._info_panel.show()
+        self._info_panel.raise_()
+
+    def _build_selection_text(self, items: List[QGraphicsItem]) -> str:
+        """Texto HTML del resumen de selección; el costo depende solo de la selección y del grado de sus nodos"""
+        G = self.scene().G
+        nodes = [i for i in items if isinstance(i, NodeItem) and not isinstance(i, MetaNodeItem)]
+        groups = [i for i in items if isinstance(i, MetaNodeItem)]
+        edges = [i for i in items if isinstance(i, EdgeItem) and not isinstance(i, MetaEdgeItem)]
+        lines = [f"<div style='font-size: 13px; margin-bottom: 8px;'><b>Selección:</b> {len(items)} elementos</div>"]
+
+        if nodes:
+            ids = {n.id for n in nodes}
+            internal = sum(1 for nid in ids for b in G.succ[nid] if b in ids)
+            out_degree = sum(len(G.succ[nid]) for nid in ids)
+            in_degree = sum(len(G.pred[nid]) for nid in ids)
+            shown = ", ".join(f"{n.id} ({n.label})" for n in nodes[:SUMMARY_MAX_NODES])
+            more = f" y {len(nodes) - SUMMARY_MAX_NODES} más" if len(nodes) > SUMMARY_MAX_NODES else ""
+            lines.append(f"<div><b>Nodos:</b> {len(nodes)}</div>")
+            lines.append(f"<div style='margin-left: 8px;'>{shown}{more}</div>")
+            lines.append(f"<div style='margin-top: 6px;'><b>Aristas entre ellos:</b> {internal}</div>")
+            lines.append(f"<div style='margin-left: 8px;'>→ hacia afuera: {out_degree - internal}</div>")
+            lines.append(f"<div style='margin-left: 8px;'>← desde afuera: {in_degree - internal}</div>")
+
+        if edges:
+            values = [e.weight_value for e in edges]
+            lines.append(f"<div style='margin-top: 6px;'><b>Aristas:</b> {len(edges)}</div>")
+            lines.append(f"<div style='margin-left: 8px;'>Peso total: {sum(values):g} — mín. {min(values):g}, máx. {max(values):g}</div>")
+
+        if groups:
+            members = sum(len(g.group.members) for g in groups)
+            lines.append(f"<div style='margin-top: 6px;'><b>Grupos contraídos:</b> {len(groups)} ({members} nodos)</div>")
+            lines.append("<div style='margin-left: 8px;'>Doble clic o Ctrl+E para expandir</div>")
+
+        return "".join(lines)
         
     def _build_node_info_text(self, node: NodeItem) -> str:
         """Construye el texto HTML con información del nodo y sus conexiones"""
@@ -978,6 +2286,18 @@ class GraphView(QGraphicsView):
         else:
             lines.append("<div style='margin-top: 6px;'><b>Entrantes:</b> (ninguno)</div>")
 
+        # Métricas en caché; si faltan se calculan en segundo plano
+        if self.analytics is not None and nid in scene.G.nodes:
+            def pending(metric, arg=None):
+                return "<i>calculando...</i>" if self.analytics.error(metric, arg) is None else "<i>error al calcular</i>"
+            pr = self.analytics.request("pagerank")
+            reach = self.analytics.request("reachability", nid)
+            pr_text = f"{pr[nid]:.4f}" if pr is not None and nid in pr else pending("pagerank")
+            reach_text = str(len(reach)) if reach is not None else pending("reachability", nid)
+            lines.append("<div style='margin-top: 6px;'><b>Análisis:</b></div>")
+            lines.append(f"<div style='margin-left: 8px;'>PageRank: {pr_text}</div>")
+            lines.append(f"<div style='margin-left: 8px;'>Nodos alcanzables: {reach_text}</div>")
+
         return "".join(lines)
 
     def mousePressEvent(self, event):
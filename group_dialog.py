@@ -0,0 +1,59 @@
+"""
+Diálogo para agrupar nodos: la selección actual o las comunidades detectadas
+"""
+from PyQt5.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QComboBox,
+    QSpinBox,
+    QLineEdit,
+    QCheckBox,
+)
+
+from node_groups import AGGREGATIONS, COMMUNITY_METHODS, MIN_COMMUNITY_SIZE
+
+
+# -----------------------
+# GroupDialog
+# -----------------------
+class GroupDialog(QDialog):
+    """Pide el nombre del grupo (o el algoritmo de comunidades), cómo combinar los pesos y si contraerlo"""
+
+    def __init__(self, communities: bool = False, parent=None):
+        super().__init__(parent)
+        self.communities = communities
+        self.setWindowTitle("Detectar Comunidades" if communities else "Agrupar Selección")
+        form = QFormLayout(self)
+
+        if communities:
+            self.method_combo = QComboBox()
+            for name, (text, _) in COMMUNITY_METHODS.items(): self.method_combo.addItem(text, name)
+            form.addRow("Algoritmo:", self.method_combo)
+            self.min_size_spin = QSpinBox(); self.min_size_spin.setRange(2, 100000); self.min_size_spin.setValue(MIN_COMMUNITY_SIZE)
+            self.min_size_spin.setToolTip("Las comunidades más pequeñas quedan como nodos sueltos")
+            form.addRow("Tamaño mínimo:", self.min_size_spin)
+        else:
+            self.label_edit = QLineEdit(); self.label_edit.setPlaceholderText("Automático")
+            form.addRow("Nombre:", self.label_edit)
+
+        self.aggregation_combo = QComboBox()
+        for name, text in AGGREGATIONS.items(): self.aggregation_combo.addItem(text, name)
+        self.aggregation_combo.setToolTip("Cómo se combinan los pesos de las aristas que se funden en una arista agregada")
+        form.addRow("Pesos agregados:", self.aggregation_combo)
+
+        self.collapse_check = QCheckBox("Contraer al crear"); self.collapse_check.setChecked(True)
+        form.addRow(self.collapse_check)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+
+    def options(self) -> dict:
+        """Argumentos para GraphScene.group_communities o GraphScene.create_group según lo elegido"""
+        options = {"aggregation": self.aggregation_combo.currentData(), "collapse": self.collapse_check.isChecked()}
+        if self.communities:
+            options.update(method=self.method_combo.currentData(), min_size=self.min_size_spin.value())
+        else:
+            options["label"] = self.label_edit.text().strip() or None
+        return options
@@ -0,0 +1,80 @@
+"""
+Asignación de identificadores de nodos en tiempo constante
+"""
+from typing import Iterable, List, Optional
+
+# Máximo de huecos que load_data agrega a la lista libre (evita listas enormes con IDs muy dispersos)
+MAX_SEEDED_FREE_IDS = 1_000_000
+
+
+# -----------------------
+# IdAllocator
+# -----------------------
+class IdAllocator:
+    """
+    Entrega IDs de nodo en O(1): primero reutiliza los liberados (lista libre)
+    y si no hay, usa el siguiente al máximo entregado (marca de agua alta)
+    """
+
+    def __init__(self):
+        self.next_id = 0  # Marca de agua alta: ningún ID >= next_id está en uso
+        self._free: List[int] = []  # Pila de IDs liberados
+        self._free_set = set()  # Evita duplicados en la pila
+
+    def allocate(self) -> int:
+        """Retorna un ID libre"""
+        if self._free:
+            nid = self._free.pop()
+            self._free_set.discard(nid)
+            return nid
+        nid = self.next_id
+        self.next_id += 1
+        return nid
+
+    def release(self, nid: int):
+        """Devuelve un ID a la lista libre para reutilizarlo"""
+        if nid == self.next_id - 1 and not self._free:
+            # Liberar el último ID simplemente baja la marca de agua
+            self.next_id -= 1
+        elif 0 <= nid < self.next_id and nid not in self._free_set:
+            self._free.append(nid)
+            self._free_set.add(nid)
+
+    def reset(self, next_id: int = 0):
+        """Reinicia el asignador (por ejemplo al limpiar o compactar el grafo)"""
+        self.next_id = next_id
+        self._free = []
+        self._free_set = set()
+
+    @property
+    def free_ids(self) -> List[int]:
+        """IDs liberados pendientes de reutilizar"""
+        return list(self._free)
+
+    def to_data(self) -> dict:
+        """Serializa el estado para guardarlo en el archivo"""
+        return {"next_id": self.next_id, "free_ids": list(self._free)}
+
+    def load_data(self, data: Optional[dict], used_ids: Iterable[int]):
+        """
+        Restaura el estado guardado respetando los IDs realmente usados
+        Todo ID libre por debajo de la marca de agua queda en la lista libre, también en archivos
+        sin este dato o con huecos que la lista guardada no registra (se reutilizan primero los menores)
+        """
+        used = set(used_ids)
+        next_id = max(used) + 1 if used else 0
+        saved: List[int] = []
+        if isinstance(data, dict):
+            next_id = max(next_id, int(data.get("next_id", next_id)))
+            saved = [int(x) for x in data.get("free_ids", []) if int(x) not in used and 0 <= int(x) < next_id]
+        self.reset(next_id)
+        gaps = next_id - len(used)
+        if gaps > MAX_SEEDED_FREE_IDS:
+            # IDs muy dispersos (por ejemplo un único nodo con ID enorme): no vale la pena recordar cada hueco
+            gaps_ids: List[int] = []
+        else:
+            gaps_ids = sorted(set(range(next_id)) - used - set(saved), reverse=True)
+        for nid in gaps_ids + saved:
+            if nid not in self._free_set:
+                self._free.append(nid)
+                self._free_set.add(nid)
@@ -0,0 +1,300 @@
+"""
+Algoritmos de acomodo (layout) para los nodos del grafo
+"""
+import heapq
+from collections import deque
+from typing import Dict, Hashable, List, Tuple
+
+import networkx as nx
+
+
+# -----------------------
+# Diseño jerárquico (Sugiyama)
+# -----------------------
+def hierarchical_layout(
+    G: nx.DiGraph,
+    layer_spacing: float = 150.0,
+    node_spacing: float = 120.0,
+    sweeps: int = 4,
+) -> Dict[Hashable, Tuple[float, float]]:
+    """
+    Calcula posiciones por capas para un grafo dirigido (método de Sugiyama)
+    Fases: eliminación de ciclos, asignación de capas, reducción de cruces y coordenadas
+    Retorna un diccionario id -> (x, y) con las capas de arriba hacia abajo
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+    index = {v: i for i, v in enumerate(nodes)}
+
+    # Aristas en espacio de índices, sin bucles ni duplicados
+    succ: List[List[int]] = [[] for _ in range(n)]
+    for a, b in G.edges():
+        if a != b:
+            succ[index[a]].append(index[b])
+
+    dag_edges = _remove_cycles(n, succ)
+    layer = _assign_layers(n, dag_edges)
+    up, down, node_layer, layers, is_dummy = _insert_dummies(n, dag_edges, layer)
+    _minimize_crossings(layers, node_layer, up, down, sweeps)
+    xs = _assign_coordinates(layers, up, down, is_dummy, node_spacing)
+
+    positions: Dict[Hashable, Tuple[float, float]] = {}
+    for i, v in enumerate(nodes):
+        positions[v] = (xs[i], layer[i] * layer_spacing)
+    return positions
+
+
+def _remove_cycles(n: int, succ: List[List[int]]) -> List[Tuple[int, int]]:
+    """
+    Elimina ciclos con la heurística voraz de Eades-Lin-Smyth
+    Retira sumideros y fuentes; si no hay, el nodo con mayor (salientes - entrantes)
+    Las aristas que quedan en contra del orden resultante se invierten
+    """
+    pred: List[List[int]] = [[] for _ in range(n)]
+    for v in range(n):
+        for w in succ[v]:
+            pred[w].append(v)
+    out_deg = [len(s) for s in succ]
+    in_deg = [len(p) for p in pred]
+    removed = [False] * n
+    head: List[int] = []  # Fuentes y nodos elegidos, de izquierda a derecha
+    tail: List[int] = []  # Sumideros, de derecha a izquierda
+
+    sinks = deque(v for v in range(n) if out_deg[v] == 0)
+    sources = deque(v for v in range(n) if in_deg[v] == 0 and out_deg[v] > 0)
+    # Montículo con claves perezosas: se descartan entradas obsoletas al sacarlas
+    heap = [(in_deg[v] - out_deg[v], v) for v in range(n)]
+    heapq.heapify(heap)
+
+    for _ in range(n):
+        while True:
+            if sinks:
+                v = sinks.popleft()
+                if not removed[v]:
+                    tail.append(v)
+                    break
+            elif sources:
+                v = sources.popleft()
+                if not removed[v] and out_deg[v] > 0:
+                    head.append(v)
+                    break
+            else:
+                key, v = heapq.heappop(heap)
+                if not removed[v] and key == in_deg[v] - out_deg[v]:
+                    head.append(v)
+                    break
+        removed[v] = True
+        for w in succ[v]:
+            if not removed[w]:
+                in_deg[w] -= 1
+                if in_deg[w] == 0 and out_deg[w] > 0:
+                    sources.append(w)
+                heapq.heappush(heap, (in_deg[w] - out_deg[w], w))
+        for u in pred[v]:
+            if not removed[u]:
+                out_deg[u] -= 1
+                if out_deg[u] == 0:
+                    sinks.append(u)
+                heapq.heappush(heap, (in_deg[u] - out_deg[u], u))
+
+    rank = [0] * n
+    for i, v in enumerate(head + tail[::-1]):
+        rank[v] = i
+    edges = set()
+    for v in range(n):
+        for w in succ[v]:
+            edges.add((v, w) if rank[v] < rank[w] else (w, v))
+    # Una arista invertida puede coincidir con su gemela en sentido contrario
+    return list(edges)
+
+
+def _assign_layers(n: int, edges: List[Tuple[int, int]]) -> List[int]:
+    """Asigna a cada nodo la capa del camino más largo desde una fuente (orden topológico)"""
+    out: List[List[int]] = [[] for _ in range(n)]
+    indeg = [0] * n
+    for a, b in edges:
+        out[a].append(b)
+        indeg[b] += 1
+    layer = [0] * n
+    queue = deque(v for v in range(n) if indeg[v] == 0)
+    while queue:
+        v = queue.popleft()
+        for w in out[v]:
+            if layer[v] + 1 > layer[w]:
+                layer[w] = layer[v] + 1
+            indeg[w] -= 1
+            if indeg[w] == 0:
+                queue.append(w)
+    return layer
+
+
+def _insert_dummies(n: int, edges: List[Tuple[int, int]], layer: List[int]):
+    """
+    Divide las aristas que saltan varias capas con nodos ficticios
+    Para acotar el costo, las aristas más largas fuera del presupuesto se conectan directo
+    Retorna vecinos superiores/inferiores, capa de cada nodo, nodos por capa y la marca de ficticio
+    """
+    up: List[List[int]] = [[] for _ in range(n)]
+    down: List[List[int]] = [[] for _ in range(n)]
+    node_layer = list(layer)
+    is_dummy = [False] * n
+    budget = n + len(edges)
+
+    for a, b in sorted(edges, key=lambda e: layer[e[1]] - layer[e[0]]):
+        span = layer[b] - layer[a]
+        prev = a
+        if 1 < span <= budget + 1:
+            budget -= span - 1
+            for lvl in range(layer[a] + 1, layer[b]):
+                d = len(node_layer)
+                node_layer.append(lvl)
+                is_dummy.append(True)
+                up.append([])
+                down.append([])
+                down[prev].append(d)
+                up[d].append(prev)
+                prev = d
+        down[prev].append(b)
+        up[b].append(prev)
+
+    layers: List[List[int]] = [[] for _ in range(max(node_layer) + 1)]
+    # Orden inicial: recorrido en anchura desde las fuentes, mantiene juntos a los vecinos
+    seen = [False] * len(node_layer)
+    for root in range(n):
+        if seen[root] or up[root]:
+            continue
+        seen[root] = True
+        queue = deque([root])
+        while queue:
+            v = queue.popleft()
+            layers[node_layer[v]].append(v)
+            for w in down[v]:
+                if not seen[w]:
+                    seen[w] = True
+                    queue.append(w)
+    return up, down, node_layer, layers, is_dummy
+
+
+def _minimize_crossings(
+    layers: List[List[int]],
+    node_layer: List[int],
+    up: List[List[int]],
+    down: List[List[int]],
+    sweeps: int,
+):
+    """
+    Reduce cruces con barridos de baricentro (cada iteración baja y luego sube)
+    Las posiciones se normalizan por el tamaño de la capa para aceptar aristas largas directas
+    """
+    pos = [0.0] * len(node_layer)
+
+    def renumber(lay: List[int]):
+        step = 1.0 / len(lay)
+        for i, v in enumerate(lay):
+            pos[v] = (i + 0.5) * step
+
+    def reorder(lay: List[int], neighbors: List[List[int]]):
+        keys = {}
+        for v in lay:
+            nb = neighbors[v]
+            # Sin vecinos: conservar su posición actual
+            keys[v] = sum(pos[u] for u in nb) / len(nb) if nb else pos[v]
+        lay.sort(key=keys.__getitem__)
+        renumber(lay)
+
+    for lay in layers:
+        if lay:
+            renumber(lay)
+    best = [list(lay) for lay in layers]
+    best_crossings = _count_crossings(layers, node_layer, down)
+    for _ in range(sweeps // 2):
+        if best_crossings == 0:
+            break
+        for lay in layers[1:]:
+            reorder(lay, up)
+        for lay in reversed(layers[:-1]):
+            reorder(lay, down)
+        crossings = _count_crossings(layers, node_layer, down)
+        if crossings < best_crossings:
+            best_crossings = crossings
+            best = [list(lay) for lay in layers]
+
+    layers[:] = best
+
+
+def _count_crossings(layers: List[List[int]], node_layer: List[int], down: List[List[int]]) -> int:
+    """Cuenta cruces entre capas consecutivas con un árbol de Fenwick (O(E log V))"""
+    total = 0
+    for k in range(len(layers) - 1):
+        size = len(layers[k + 1])
+        if size == 0:
+            continue
+        index = {v: i for i, v in enumerate(layers[k + 1])}
+        targets = []
+        for v in layers[k]:
+            targets.extend(sorted(index[w] for w in down[v] if node_layer[w] == k + 1))
+        tree = [0] * (size + 1)
+        for seen, t in enumerate(targets):
+            # Aristas ya vistas que terminan más a la derecha cruzan a esta
+            i, le = t + 1, 0
+            while i > 0:
+                le += tree[i]
+                i -= i & -i
+            total += seen - le
+            i = t + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+    return total
+
+
+def _assign_coordinates(
+    layers: List[List[int]],
+    up: List[List[int]],
+    down: List[List[int]],
+    is_dummy: List[bool],
+    node_spacing: float,
+) -> List[float]:
+    """
+    Asigna coordenadas x respetando el orden de cada capa y una separación mínima
+    Cada nodo se acerca a la mediana de sus vecinos con pasadas hacia abajo y hacia arriba
+    """
+    width = [node_spacing * (0.3 if d else 1.0) for d in is_dummy]
+    x = [0.0] * len(is_dummy)
+    for lay in layers:
+        offset = 0.0
+        for i, v in enumerate(lay):
+            if i:
+                offset += (width[lay[i - 1]] + width[v]) / 2
+            x[v] = offset
+        shift = offset / 2
+        for v in lay:
+            x[v] -= shift
+
+    def place(lay: List[int], neighbors: List[List[int]]):
+        if not lay:
+            return
+        desired = []
+        for v in lay:
+            nb = sorted(x[u] for u in neighbors[v])
+            desired.append(nb[len(nb) // 2] if nb else x[v])
+        # Empaquetar a la izquierda y a la derecha; el promedio mantiene la separación
+        left = list(desired)
+        for i in range(1, len(lay)):
+            gap = (width[lay[i - 1]] + width[lay[i]]) / 2
+            left[i] = max(left[i], left[i - 1] + gap)
+        right = list(desired)
+        for i in range(len(lay) - 2, -1, -1):
+            gap = (width[lay[i]] + width[lay[i + 1]]) / 2
+            right[i] = min(right[i], right[i + 1] - gap)
+        for i, v in enumerate(lay):
+            x[v] = (left[i] + right[i]) / 2
+
+    for _ in range(2):
+        for lay in layers[1:]:
+            place(lay, up)
+        for lay in reversed(layers[:-1]):
+            place(lay, down)
+    return x
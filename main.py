@@ -3,11 +3,13 @@ Aplicación principal de Grafo Drawer
 """
 import sys
 import json
+import time
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from PyQt5.QtCore import Qt, QSettings, QRectF
-from PyQt5.QtGui import QPainter, QKeySequence, QIcon, QImage
+from PyQt5.QtCore import Qt, QSettings
+from PyQt5.QtGui import QPainter, QKeySequence, QIcon
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -20,6 +22,9 @@ from PyQt5.QtWidgets import (
     QTabWidget,
     QActionGroup,
     QMenuBar,
+    QProgressBar,
+    QPushButton,
+    QDialog,
 )
 
 from utils import (
@@ -33,8 +38,19 @@ from utils import (
     show_warning,
     show_info,
 )
-from graph_widgets import GraphScene, GraphView
+from graph_widgets import GraphScene, GraphView, MetaNodeItem, NodeItem, VIEWPORT_UPDATE_MODES
 from matrix_view import MatrixWidget
+from graph_analytics import GraphAnalytics
+from analytics_view import AnalyticsWidget
+from profiling import PROFILER
+from graph_loader import ProgressiveGraphLoader, prepare_graph_data
+from graph_generators import generate_graph_data
+from generator_dialog import GenerateGraphDialog
+from graph_formats import FORMATS, file_filter, format_for_path, write_graph
+from search_view import SearchBar
+from filter_dialog import FilterDialog
+from graph_filter import describe as describe_filter
+from group_dialog import GroupDialog
 
 
 # -----------------------
@@ -58,24 +74,44 @@ class MainWindow(QMainWindow):
         self.view.setDragMode(QGraphicsView.RubberBandDrag)
         self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.view.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        self._restore_view_settings()
 
         # Control de archivo y modificaciones
         self.current_file_path: Optional[str] = None
         self.is_modified = False
+        self._loader: Optional[ProgressiveGraphLoader] = None  # Apertura de archivo en curso
+        self._load_started = 0.0
         self.scene.graph_changed.connect(self.set_modified)
+        self.scene.path_computed.connect(self.show_path_result)
+        self.scene.filter_changed.connect(self._on_filter_changed)
+        self.scene.groups_changed.connect(self._on_groups_changed)
 
-        # Sistema de pestañas: Dibujo y Matriz
+        # Servicio de métricas con caché por versión del grafo
+        self.analytics = GraphAnalytics(self.scene, parent=self)
+        self.view.set_analytics(self.analytics)
+
+        # Sistema de pestañas: Dibujo, Matriz y Análisis
         self.tabs = QTabWidget()
         self.matrix_widget = MatrixWidget(self.scene)
+        self.analytics_widget = AnalyticsWidget(self.scene, self.analytics)
         self.tabs.addTab(self.view, "Dibujo")
         self.tabs.addTab(self.matrix_widget, "Matriz de Adyacencia")
+        self.tabs.addTab(self.analytics_widget, "Análisis")
         self.setCentralWidget(self.tabs)
 
         # Crear interfaz
         self._create_vertical_toolbar()
+        self._create_search_toolbar()
         self._create_menu_bar()
         self._create_actions_shortcuts()
         
+        # Progreso y cancelación de la apertura de archivos
+        self.load_progress = QProgressBar(); self.load_progress.setMaximumWidth(220); self.load_progress.hide()
+        self.load_cancel_button = QPushButton("Cancelar"); self.load_cancel_button.hide()
+        self.load_cancel_button.clicked.connect(self.cancel_loading)
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.statusBar().addPermanentWidget(self.load_cancel_button)
+
         # Iniciar en modo mover
         self.set_mode("move")
         self._apply_style()
@@ -101,6 +137,7 @@ class MainWindow(QMainWindow):
             ("edge", load_icon("edge"), "Aristas (E)\nClic en origen y destino para conectar."),
             ("edit", load_icon("edit"), "Editar (T)\nEdita etiquetas de nodos o pesos de aristas."),
             ("delete", load_icon("delete"), "Borrar (X)\nElimina nodos o aristas con un clic."),
+            ("path", load_icon("path"), "Camino (R)\nClic en origen y destino para resaltar el camino más corto."),
         ]
         
         # Crear acción para cada modo
@@ -127,6 +164,15 @@ class MainWindow(QMainWindow):
         self.zoom_out_action.triggered.connect(self.zoom_out)
         v_tb.addAction(self.zoom_out_action)
 
+    def _create_search_toolbar(self):
+        """Crea la barra superior con el buscador de nodos y aristas"""
+        search_tb = QToolBar("Búsqueda", self)
+        search_tb.setObjectName("search_toolbar")
+        search_tb.setMovable(False)
+        self.search_bar = SearchBar(self.scene, self.view)
+        search_tb.addWidget(self.search_bar)
+        self.addToolBar(Qt.TopToolBarArea, search_tb)
+
     def _create_menu_bar(self):
         """Crea la barra de menú con todas las opciones"""
         menu_bar = self.menuBar()
@@ -137,6 +183,7 @@ class MainWindow(QMainWindow):
         file_menu.addAction("Abrir...", self.open_file, "Ctrl+O")
         self.recent_files_menu = file_menu.addMenu("Abrir Recientes")
         self._update_recent_files_menu()
+        file_menu.addAction("Generar Grafo...", self.generate_graph, "Ctrl+G")
         file_menu.addSeparator()
         file_menu.addAction("Guardar", self.save_file, "Ctrl+S")
         file_menu.addAction("Guardar Como...", self.save_file_as, "Ctrl+Shift+S")
@@ -145,6 +192,8 @@ class MainWindow(QMainWindow):
         # Submenú de exportación
         export_menu = file_menu.addMenu("Exportar")
         export_menu.addAction("Grafo a JSON...", self.export_graph_to_json)
+        for name, text in (("graphml", "GraphML"), ("gexf", "GEXF"), ("dot", "DOT"), ("edgelist", "Lista de Aristas")):
+            export_menu.addAction(f"Grafo a {text}...", lambda n=name: self.export_graph_to_format(n))
         export_menu.addAction("Dibujo a Imagen (PNG/JPG)...", self.export_scene_to_image)
         export_menu.addAction("Matriz a CSV...", self.matrix_widget.export_csv)
         export_menu.addAction("Matriz a JSON...", self.matrix_widget.export_json)
@@ -153,12 +202,32 @@ class MainWindow(QMainWindow):
 
         # Menú Editar
         edit_menu = menu_bar.addMenu("&Editar")
-        edit_menu.addAction("Borrar Selección", self.scene.delete_selected_items, "Del")
+        delete_action = edit_menu.addAction("Borrar Selección", self.scene.delete_selected_items, "Del")
         edit_menu.addAction("Seleccionar Todo", self.scene.select_all_items, "Ctrl+A")
+        edit_menu.addAction("Buscar...", self.focus_search, "Ctrl+F")
+        edit_menu.addSeparator()
+        size_actions = [edit_menu.addAction("Cambiar Tamaño de Nodos...", self.change_node_size_dialog),
+                        edit_menu.addAction("Aumentar Tamaño de Nodos", lambda: self._adjust_node_size(5), "Ctrl+Up"),
+                        edit_menu.addAction("Disminuir Tamaño de Nodos", lambda: self._adjust_node_size(-5), "Ctrl+Down")]
         edit_menu.addSeparator()
-        edit_menu.addAction("Cambiar Tamaño de Nodos...", self.change_node_size_dialog)
-        edit_menu.addAction("Aumentar Tamaño de Nodos", lambda: self._adjust_node_size(5), "Ctrl+Up")
-        edit_menu.addAction("Disminuir Tamaño de Nodos", lambda: self._adjust_node_size(-5), "Ctrl+Down")
+        arrange_menu = edit_menu.addMenu("Organizar Selección")
+        arrange_menu.addAction("Escalar...", self.scale_selection)
+        arrange_menu.addAction("Rotar...", self.rotate_selection)
+        arrange_menu.addSeparator()
+        for side, text in (("left", "Izquierda"), ("hcenter", "Centro Horizontal"), ("right", "Derecha"),
+                           ("top", "Arriba"), ("vcenter", "Centro Vertical"), ("bottom", "Abajo")):
+            arrange_menu.addAction(f"Alinear: {text}", lambda s=side, t=text: self._arrange_selection(
+                f"Alinear ({t.lower()})", lambda nodes: self.scene.align_nodes(nodes, s)))
+        arrange_menu.addSeparator()
+        arrange_menu.addAction("Distribuir Horizontalmente", lambda: self._arrange_selection(
+            "Distribuir horizontalmente", lambda nodes: self.scene.distribute_nodes(nodes, 0), minimum=3))
+        arrange_menu.addAction("Distribuir Verticalmente", lambda: self._arrange_selection(
+            "Distribuir verticalmente", lambda nodes: self.scene.distribute_nodes(nodes, 1), minimum=3))
+        arrange_menu.addSeparator()
+        arrange_menu.addAction("Ajustar a la Cuadrícula", lambda: self._arrange_selection(
+            "Ajustar a la cuadrícula", self.scene.snap_nodes_to_grid, minimum=1))
+        edit_menu.addSeparator()
+        compact_action = edit_menu.addAction("Compactar IDs de Nodos", self.compact_node_ids)
         
         # Menú Ver
         view_menu = menu_bar.addMenu("&Ver")
@@ -189,6 +258,31 @@ class MainWindow(QMainWindow):
         self.toggle_weights_action.triggered.connect(self.toggle_edge_weights_visibility)
         view_menu.addAction(self.toggle_weights_action)
 
+        self.toggle_bundling_action = QAction("Agrupar Aristas", self, checkable=True, shortcut="Ctrl+B")
+        self.toggle_bundling_action.triggered.connect(self.set_edge_bundling)
+        view_menu.addAction(self.toggle_bundling_action)
+
+        self.toggle_edge_layer_action = QAction("Capa de Aristas Rápida", self, checkable=True, shortcut="Ctrl+Shift+B")
+        self.toggle_edge_layer_action.triggered.connect(self.set_edge_layer)
+        view_menu.addAction(self.toggle_edge_layer_action)
+
+        # Estrategia de dibujo de la vista
+        render_menu = view_menu.addMenu("Actualización del Viewport")
+        update_group = QActionGroup(self); update_group.setExclusive(True)
+        for name, (text, _) in VIEWPORT_UPDATE_MODES.items():
+            act = QAction(text, self, checkable=True, triggered=lambda _, n=name: self.set_viewport_update_mode(n))
+            act.setChecked(name == self.view.viewport_update_mode)
+            update_group.addAction(act); render_menu.addAction(act)
+        render_menu.addSeparator()
+        self.toggle_opengl_action = QAction("Usar OpenGL", self, checkable=True)
+        self.toggle_opengl_action.setChecked(self.view.opengl_enabled)
+        self.toggle_opengl_action.triggered.connect(self.set_opengl_enabled)
+        render_menu.addAction(self.toggle_opengl_action)
+
+        self.toggle_perf_action = QAction("Panel de Rendimiento", self, checkable=True, shortcut="Ctrl+Shift+P")
+        self.toggle_perf_action.triggered.connect(self.view.set_perf_overlay_visible)
+        view_menu.addAction(self.toggle_perf_action)
+
         view_menu.addSeparator()
         
         # Cambio entre pestañas
@@ -196,11 +290,38 @@ class MainWindow(QMainWindow):
         show_draw_action = QAction("Vista de Dibujo", self, checkable=True, triggered=lambda: self.tabs.setCurrentIndex(0))
         show_draw_action.setChecked(True)
         show_matrix_action = QAction("Vista de Matriz", self, checkable=True, triggered=self.show_matrix_tab, shortcut="M")
-        view_menu.addAction(show_draw_action); view_menu.addAction(show_matrix_action)
-        tabs_group.addAction(show_draw_action); tabs_group.addAction(show_matrix_action)
+        show_analytics_action = QAction("Vista de Análisis", self, checkable=True, triggered=lambda: self.tabs.setCurrentIndex(2))
+        view_menu.addAction(show_draw_action); view_menu.addAction(show_matrix_action); view_menu.addAction(show_analytics_action)
+        tabs_group.addAction(show_draw_action); tabs_group.addAction(show_matrix_action); tabs_group.addAction(show_analytics_action)
         
+        # Menú Grafo
+        graph_menu = menu_bar.addMenu("&Grafo")
+        graph_menu.addAction("Diseño Jerárquico (Capas)", self.apply_hierarchical_layout, "Ctrl+L")
+        graph_menu.addSeparator()
+        graph_menu.addAction("Filtrar...", self.filter_graph, "Ctrl+Shift+F")
+        graph_menu.addAction("Quitar Filtro", self.scene.clear_filter, "Ctrl+Alt+F")
+        graph_menu.addSeparator()
+        groups_menu = graph_menu.addMenu("Grupos")
+        groups_menu.addAction("Agrupar Selección...", self.group_selection, "Ctrl+Shift+G")
+        groups_menu.addAction("Detectar Comunidades...", self.detect_communities)
+        groups_menu.addSeparator()
+        groups_menu.addAction("Contraer/Expandir Selección", self.toggle_selected_groups, "Ctrl+E")
+        groups_menu.addAction("Contraer Todos", self.scene.collapse_all_groups)
+        groups_menu.addAction("Expandir Todos", self.scene.expand_all_groups)
+        groups_menu.addSeparator()
+        groups_menu.addAction("Deshacer Grupos de la Selección", self.ungroup_selection)
+        groups_menu.addAction("Deshacer Todos los Grupos", self.scene.remove_all_groups)
+
+        # Ediciones de la escena desde el menú: se desactivan mientras se inserta un grafo por lotes
+        self.scene_edit_actions = ([delete_action, compact_action] + size_actions + arrange_menu.actions()
+                                   + graph_menu.actions() + groups_menu.actions())
+
         # Menú Ayuda
-        help_menu = menu_bar.addMenu("&Ayuda"); help_menu.addAction("Acerca de...", self.show_about_dialog)
+        help_menu = menu_bar.addMenu("&Ayuda")
+        help_menu.addAction("Guardar Informe de Rendimiento...", self.save_performance_report)
+        help_menu.addAction("Exportar Tiempos de Cuadro a CSV...", self.export_frame_telemetry)
+        help_menu.addSeparator()
+        help_menu.addAction("Acerca de...", self.show_about_dialog)
 
     def _create_actions_shortcuts(self):
         """Asigna atajos de teclado a los modos"""
@@ -209,7 +330,13 @@ class MainWindow(QMainWindow):
         self.act_edge.setShortcut("E")
         self.act_edit.setShortcut("T")
         self.act_delete.setShortcut("X")
+        self.act_path.setShortcut("R")
     
+    def focus_search(self):
+        """Muestra la pestaña de dibujo y lleva el foco al buscador"""
+        self.tabs.setCurrentIndex(0)
+        self.search_bar.focus_search()
+
     def zoom_in(self):
         """Aumenta el zoom respetando el límite máximo"""
         current_scale = self.view.transform().m11()
@@ -227,14 +354,15 @@ class MainWindow(QMainWindow):
         self.scene.set_mode(mode)
         mode_text = {"move": "Mover: Arrastra el lienzo y los nodos.", "draw": "Dibujo: Clic para crear nodos.",
                      "edge": "Aristas: Clic en origen y destino para conectar.", "edit": "Edición: Clic para editar.",
-                     "delete": "Borrar: Clic para eliminar un elemento."}
+                     "delete": "Borrar: Clic para eliminar un elemento.",
+                     "path": "Camino: Clic en origen y destino para buscar el camino más corto."}
         self.statusBar().showMessage(f"Modo: {mode_text.get(mode, mode)}")
         
         # Marcar acción correspondiente como activa
         action_map = {
             "move": self.act_move, "draw": self.act_draw,
             "edge": self.act_edge, "edit": self.act_edit,
-            "delete": self.act_delete
+            "delete": self.act_delete, "path": self.act_path
         }
         if mode in action_map:
             action_map[mode].setChecked(True)
@@ -263,30 +391,133 @@ class MainWindow(QMainWindow):
     def new_file(self):
         """Crea un nuevo grafo vacío"""
         if self._maybe_save():
+            self.cancel_loading()
             self.scene.clear_scene(keep_background=False)
             self.current_file_path = None
             self.set_modified(False)
 
     def open_file(self, path: Optional[str] = None):
-        """Abre un archivo de grafo desde JSON"""
+        """Abre un archivo de grafo (JSON, GraphML, GEXF, DOT o lista de aristas)"""
         if not self._maybe_save(): return
         if not path:
-            path, _ = QFileDialog.getOpenFileName(self, "Abrir grafo", "", "JSON Files (*.json)")
+            path, _ = QFileDialog.getOpenFileName(self, "Abrir grafo", "", file_filter())
         if not path: return
-        try:
-            with open(path, "r", encoding="utf-8") as f: self.scene.load_graph_from_data(json.load(f), view=self.view)
-            self.current_file_path = path
+        self.cancel_loading()
+
+        # Lectura en segundo plano e inserción por lotes: la vista se puede navegar mientras carga
+        loader = ProgressiveGraphLoader(self.scene, path, view=self.view, parent=self)
+        loader.finished.connect(lambda: self._on_load_finished(path))
+        loader.failed.connect(lambda msg: self._on_load_failed(path, msg))
+        self._start_loading(loader, f"Leyendo {Path(path).name}...")
+
+    def generate_graph(self):
+        """Reemplaza el grafo por uno sintético (generado en segundo plano e insertado por lotes)"""
+        if not self._maybe_save(): return
+        dialog = GenerateGraphDialog(self)
+        if dialog.exec_() != QDialog.Accepted: return
+        options = dialog.options()
+        self.cancel_loading()
+        loader = ProgressiveGraphLoader(self.scene, None, view=self.view, parent=self,
+                                        source=lambda: prepare_graph_data(generate_graph_data(**options)))
+        loader.finished.connect(self._on_generate_finished)
+        loader.failed.connect(self._on_generate_failed)
+        self._start_loading(loader, "Generando grafo...")
+
+    def _set_scene_edits_enabled(self, enabled: bool):
+        """Activa o desactiva las ediciones de la escena del menú (acomodos, grupos, filtros, IDs)"""
+        for action in self.scene_edit_actions: action.setEnabled(enabled)
+
+    def _start_loading(self, loader: ProgressiveGraphLoader, message: str):
+        """Conecta el progreso del cargador a la barra de estado y lo inicia"""
+        loader.parsed.connect(self._on_load_parsed)
+        loader.progress.connect(self._on_load_progress)
+        loader.cancelled.connect(self._on_load_cancelled)
+        self._loader = loader
+        self._load_started = time.perf_counter()
+        self.load_progress.setRange(0, 0)  # Indeterminado mientras se lee o genera el grafo
+        self.load_progress.show(); self.load_cancel_button.show()
+        self.statusBar().showMessage(message)
+        loader.start()
+
+    def cancel_loading(self):
+        """Cancela la apertura de archivo en curso (si la hay)"""
+        if self._loader is not None: self._loader.cancel()
+
+    def _finish_loading(self):
+        """Oculta los controles de progreso y libera el cargador"""
+        self.load_progress.hide(); self.load_cancel_button.hide()
+        self._set_scene_edits_enabled(True)
+        if self._loader is not None: self._loader.deleteLater()
+        self._loader = None
+
+    def _on_load_parsed(self, graph):
+        """Encuadra la vista en el área del grafo antes de que aparezcan los elementos"""
+        # Recién aquí se reemplaza la escena: si la lectura falla, el grafo anterior conserva su archivo
+        self.current_file_path = None
+        self._set_scene_edits_enabled(False)
+        self.load_progress.setRange(0, max(1, len(graph.nodes) + len(graph.edges)))
+        if graph.bounds is not None: self.view.fitInView(graph.bounds.adjusted(-50, -50, 50, 50), Qt.KeepAspectRatio)
+
+    def _on_load_progress(self, done: int, total: int):
+        """Actualiza la barra de progreso"""
+        self.load_progress.setValue(done)
+        self.statusBar().showMessage(f"Cargando grafo... {done}/{total} elementos")
+
+    def _on_load_finished(self, path: str):
+        """Termina la apertura: registra el archivo y ajusta la vista"""
+        PROFILER.record("io.open", time.perf_counter() - self._load_started)
+        self._finish_loading()
+        # Los formatos importados no guardan fondo ni IDs libres: Guardar pide un archivo JSON nuevo
+        imported = format_for_path(path) != "json"
+        self.current_file_path = None if imported else path
+        self.set_modified(imported)
+        self.update_window_title()
+        self.statusBar().showMessage(f"Grafo {'importado' if imported else 'cargado'}: {path}")
+        self.fit_view_to_scene()
+        self._add_to_recent_files(path)
+
+    def _on_generate_finished(self):
+        """Termina la generación: el grafo queda como nuevo, sin archivo asociado"""
+        PROFILER.record("io.generate", time.perf_counter() - self._load_started)
+        self._finish_loading()
+        self.set_modified(True)
+        self.update_window_title()
+        self.statusBar().showMessage(f"Grafo generado: {len(self.scene.node_items)} nodos, {len(self.scene.edge_items)} aristas")
+        self.fit_view_to_scene()
+
+    def _on_generate_failed(self, message: str):
+        """Informa un error al generar el grafo"""
+        self._finish_loading()
+        self.update_window_title()
+        show_warning("Generar grafo", message)
+
+    def _on_load_cancelled(self, replaced: bool):
+        """
+        La carga se canceló: si ya se había empezado a insertar, la escena quedó vacía;
+        si se canceló durante la lectura, el grafo anterior sigue con su archivo y sus cambios
+        """
+        self._finish_loading()
+        if replaced:
+            self.current_file_path = None
             self.set_modified(False)
-            self.statusBar().showMessage(f"Grafo cargado: {path}")
-            self.fit_view_to_scene()
-            self._add_to_recent_files(path)
-        except Exception as exc: show_warning("Error al abrir archivo", str(exc))
+        self.update_window_title()
+        self.statusBar().showMessage("Carga cancelada")
+
+    def _on_load_failed(self, path: str, message: str):
+        """Informa un error de lectura del archivo"""
+        self._finish_loading()
+        self.update_window_title()
+        show_warning("Error al abrir archivo", f"{path}\n{message}")
 
     def save_file(self) -> bool:
         """Guarda el grafo en el archivo actual"""
+        if self._loader is not None:
+            show_info("Guardar", "Espere a que termine de cargarse el archivo o cancele la carga.")
+            return False
         if self.current_file_path is None: return self.save_file_as()
         try:
-            with open(self.current_file_path, "w", encoding="utf-8") as f: json.dump(self.scene.get_graph_data(), f, indent=2)
+            with PROFILER.measure("io.save"), open(self.current_file_path, "w", encoding="utf-8") as f:
+                json.dump(self.scene.get_graph_data(), f, indent=2)
             self.set_modified(False)
             self.statusBar().showMessage(f"Grafo guardado en: {self.current_file_path}")
             self._add_to_recent_files(self.current_file_path)
@@ -318,26 +549,11 @@ class MainWindow(QMainWindow):
         if not path:
             return
 
-        # Calcular área a renderizar con padding
-        rect = self.scene.itemsBoundingRect()
-        padding = 50.0
-        rect.adjust(-padding, -padding, padding, padding)
-
-        # Crear imagen y pintor
-        image = QImage(rect.size().toSize(), QImage.Format_ARGB32_Premultiplied)
-        image.fill(Qt.white)
-
-        painter = QPainter(image)
-        painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.TextAntialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
-
-        # Renderizar escena a imagen
-        self.scene.render(painter, QRectF(image.rect()), rect)
-        painter.end()
+        image = self.scene.render_to_image(padding=50.0)
 
         try:
-            if image.save(path):
+            with PROFILER.measure("io.export_image"): saved = image.save(path)
+            if saved:
                 self.statusBar().showMessage(f"Dibujo exportado con éxito a: {path}")
             else:
                 show_warning("Error al Exportar", f"No se pudo guardar la imagen en la ruta: {path}")
@@ -349,19 +565,87 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Exportar grafo a JSON", "export_dirigido.json", "JSON Files (*.json)")
         if not path: return
         try:
-            with open(path, "w", encoding="utf-8") as f: json.dump(self.scene.get_graph_data(), f, indent=2)
+            with PROFILER.measure("io.export_json"), open(path, "w", encoding="utf-8") as f:
+                json.dump(self.scene.get_graph_data(), f, indent=2)
             self.statusBar().showMessage(f"Grafo exportado a: {path}")
         except Exception as exc: show_warning("Error al exportar", str(exc))
 
+    def export_graph_to_format(self, name: str):
+        """Exporta el grafo a uno de los formatos estándar (ver graph_formats)"""
+        default = "export_dirigido" + FORMATS[name][1][0]
+        path, _ = QFileDialog.getSaveFileName(self, f"Exportar grafo a {FORMATS[name][0]}", default, file_filter(name))
+        if not path: return
+        try:
+            with PROFILER.measure(f"io.export_{name}"):
+                write_graph(self.scene.get_graph_data(), path, name)
+            self.statusBar().showMessage(f"Grafo exportado a: {path}")
+        except Exception as exc: show_warning("Error al exportar", str(exc))
+
+    def save_performance_report(self):
+        """Guarda las mediciones de rendimiento en JSON para adjuntarlas a un reporte de error"""
+        if not PROFILER.stats:
+            show_info("Informe de Rendimiento", "No hay mediciones. Active Ver > Panel de Rendimiento y use la aplicación antes de guardar el informe.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar informe de rendimiento", "rendimiento.json", "JSON Files (*.json)")
+        if not path: return
+        extra = {"graph": {"nodes": self.scene.G.number_of_nodes(), "edges": self.scene.G.number_of_edges()},
+                 "index": self.scene.index_description()}
+        try:
+            PROFILER.dump(path, extra)
+            self.statusBar().showMessage(f"Informe de rendimiento guardado en: {path}")
+        except Exception as exc: show_warning("Error al guardar", str(exc))
+
+    def export_frame_telemetry(self):
+        """Exporta a CSV la duración y el contenido de los últimos cuadros pintados"""
+        if not self.view.frame_telemetry.samples:
+            show_info("Tiempos de Cuadro", "No hay cuadros medidos. Active Ver > Panel de Rendimiento y navegue el grafo antes de exportar.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar tiempos de cuadro", "cuadros.csv", "CSV Files (*.csv)")
+        if not path: return
+        try:
+            self.view.export_frame_telemetry(path)
+            self.statusBar().showMessage(f"Tiempos de cuadro exportados a: {path}")
+        except Exception as exc: show_warning("Error al exportar", str(exc))
+
     def closeEvent(self, event):
         """Maneja el cierre de la aplicación"""
-        if self._maybe_save(): event.accept()
+        if self._maybe_save():
+            self.cancel_loading()
+            event.accept()
         else: event.ignore()
 
     def _get_settings(self) -> QSettings:
         """Retorna objeto de configuración para persistir preferencias"""
         return QSettings(SETTINGS_ORGANIZATION, SETTINGS_APPLICATION)
 
+    def _restore_view_settings(self):
+        """Aplica la estrategia de dibujo guardada en las preferencias"""
+        settings = self._get_settings()
+        self.view.set_viewport_update_mode_name(settings.value("view/update_mode", "minimal", type=str))
+        if settings.value("view/opengl", False, type=bool): self.view.set_opengl_enabled(True)
+
+    def set_viewport_update_mode(self, name: str):
+        """Cambia y guarda el modo de actualización del viewport"""
+        self.view.set_viewport_update_mode_name(name)
+        self._get_settings().setValue("view/update_mode", name)
+        self.statusBar().showMessage(f"Actualización del viewport: {VIEWPORT_UPDATE_MODES[name][0]}")
+
+    def set_opengl_enabled(self, enabled: bool):
+        """Activa o desactiva el viewport OpenGL y guarda la preferencia"""
+        enabled = self.view.set_opengl_enabled(enabled)
+        self.toggle_opengl_action.setChecked(enabled)
+        self._get_settings().setValue("view/opengl", enabled)
+
+    def set_edge_bundling(self, enabled: bool):
+        """Activa el agrupamiento de aristas (desactiva la capa rápida)"""
+        self.scene.set_edge_bundling(enabled)
+        self.toggle_edge_layer_action.setChecked(self.scene.edge_layer is not None)
+
+    def set_edge_layer(self, enabled: bool):
+        """Activa la capa de aristas rápida (desactiva el agrupamiento)"""
+        self.scene.set_edge_layer(enabled)
+        self.toggle_bundling_action.setChecked(self.scene.edge_bundling)
+
     def _add_to_recent_files(self, file_path: str):
         """Agrega archivo a la lista de recientes"""
         settings = self._get_settings()
@@ -409,6 +693,111 @@ class MainWindow(QMainWindow):
         new_r = max(10, min(200, DEFAULT_NODE_RADIUS + delta))
         if new_r != DEFAULT_NODE_RADIUS: self.scene.set_node_radius_all(new_r); self.set_modified()
 
+    def _nodes_to_arrange(self, name: str, minimum: int = 2) -> Optional[List[NodeItem]]:
+        """Nodos seleccionados, o None (con aviso en la barra de estado) si no alcanzan para la operación"""
+        nodes = self.scene.selected_nodes()
+        if len(nodes) < minimum:
+            self.statusBar().showMessage(f"{name}: seleccione al menos {minimum} nodo{'s' if minimum != 1 else ''}")
+            return None
+        return nodes
+
+    def _arrange_selection(self, name: str, arrange, minimum: int = 2, nodes: Optional[List[NodeItem]] = None):
+        """Aplica arrange(nodos) a los nodos seleccionados e informa el resultado en la barra de estado"""
+        nodes = nodes if nodes is not None else self._nodes_to_arrange(name, minimum)
+        if nodes is None: return
+        start = time.perf_counter()
+        arrange(nodes)
+        self.statusBar().showMessage(f"{name}: {len(nodes)} nodos ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def scale_selection(self):
+        """Escala las distancias entre los nodos seleccionados"""
+        nodes = self._nodes_to_arrange("Escalar")
+        if nodes is None: return
+        val, ok = QInputDialog.getDouble(self, "Escalar Selección", "Factor (%):", 150.0, 1.0, 1000.0, 0)
+        if ok: self._arrange_selection("Escalar", lambda ns: self.scene.scale_nodes(ns, val / 100), nodes=nodes)
+
+    def rotate_selection(self):
+        """Gira los nodos seleccionados alrededor de su centro"""
+        nodes = self._nodes_to_arrange("Rotar")
+        if nodes is None: return
+        val, ok = QInputDialog.getDouble(self, "Rotar Selección", "Ángulo (grados, sentido horario):", 90.0, -360.0, 360.0, 1)
+        if ok: self._arrange_selection("Rotar", lambda ns: self.scene.rotate_nodes(ns, val), nodes=nodes)
+
+    def compact_node_ids(self):
+        """Renumera los IDs de los nodos de forma consecutiva"""
+        if not self.scene.node_items: return
+        mapping = self.scene.compact_node_ids()
+        changed = sum(1 for old, new in mapping.items() if old != new)
+        self.statusBar().showMessage(f"IDs compactados: {changed} nodos renumerados (0 a {len(mapping) - 1})")
+
+    def filter_graph(self):
+        """Muestra solo un subgrafo (vecindario, etiqueta o rango de peso) sin quitar elementos de la escena"""
+        dialog = FilterDialog(self.scene, self)
+        if dialog.exec_() != QDialog.Accepted: return
+        spec = dialog.spec()
+        if spec is None:
+            show_warning("Filtrar grafo", "Indique un ID de nodo o un texto para filtrar.")
+            return
+        if spec.kind == "neighbourhood" and spec.args[0] not in self.scene.node_items:
+            show_warning("Filtrar grafo", f"No existe un nodo con ID {spec.args[0]}.")
+            return
+        self.scene.set_filter(spec, dialog.mode())
+
+    def group_selection(self):
+        """Agrupa los nodos seleccionados (y los contrae en un meta-nodo si se elige)"""
+        ids = [item.id for item in self.scene.selectedItems() if isinstance(item, NodeItem) and not isinstance(item, MetaNodeItem)]
+        if len(ids) < 2:
+            show_warning("Agrupar selección", "Seleccione al menos dos nodos para agruparlos.")
+            return
+        dialog = GroupDialog(parent=self)
+        if dialog.exec_() != QDialog.Accepted: return
+        self.scene.create_group(ids, **dialog.options())
+
+    def detect_communities(self):
+        """Reemplaza los grupos por las comunidades que detecta networkx"""
+        if not self.scene.node_items: return
+        dialog = GroupDialog(communities=True, parent=self)
+        if dialog.exec_() != QDialog.Accepted: return
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            start = time.perf_counter()
+            groups = self.scene.group_communities(**dialog.options())
+            elapsed = time.perf_counter() - start
+        finally:
+            QApplication.restoreOverrideCursor()
+        grouped = sum(len(g.members) for g in groups)
+        self.statusBar().showMessage(f"Comunidades: {len(groups)} grupos con {grouped} de {len(self.scene.node_items)} nodos ({elapsed:.2f} s)")
+
+    def toggle_selected_groups(self):
+        """Expande los meta-nodos seleccionados y contrae los grupos de los nodos seleccionados"""
+        collapsed, expanded = self.scene.selected_groups()
+        if collapsed: self.scene.expand_groups(collapsed)
+        if expanded: self.scene.collapse_groups(expanded)
+
+    def ungroup_selection(self):
+        """Deshace los grupos de la selección"""
+        collapsed, expanded = self.scene.selected_groups()
+        for gid in collapsed | expanded: self.scene.ungroup(gid)
+
+    def _on_groups_changed(self):
+        """Los grupos se guardan con el archivo; informa cuántos elementos dibuja la escena"""
+        self.set_modified()
+        groups = self.scene.groups
+        if groups:
+            collapsed = sum(1 for g in groups.values() if g.collapsed)
+            self.statusBar().showMessage(f"Grupos: {len(groups)} ({collapsed} contraídos) — "
+                                         f"{len(self.scene.items())} elementos en la escena", 3000)
+
+    def _on_filter_changed(self):
+        """Informa en la barra de estado el filtro activo y cuánto del grafo muestra"""
+        result = self.scene.filter_result
+        if result is None:
+            self.statusBar().showMessage("Filtro quitado: se muestra todo el grafo", 3000)
+            return
+        self.statusBar().showMessage(
+            f"Filtro: {describe_filter(self.scene.filter_spec)} — {len(result.nodes)} de {len(self.scene.node_items)} nodos, "
+            f"{len(result.edges)} de {len(self.scene.edge_items)} aristas")
+
     def fit_view_to_scene(self):
         """Ajusta el zoom para que todos los elementos sean visibles"""
         if not self.scene.items(): 
@@ -419,6 +808,26 @@ class MainWindow(QMainWindow):
         if self.scene.background_image_item: items_rect = items_rect.united(self.scene.background_image_item.sceneBoundingRect())
         self.view.fitInView(items_rect.adjusted(-50, -50, 50, 50), Qt.KeepAspectRatio)
 
+    def apply_hierarchical_layout(self):
+        """Acomoda el grafo por capas y ajusta la vista al resultado"""
+        if not self.scene.node_items:
+            show_info("Diseño Jerárquico", "El grafo está vacío.")
+            return
+        start = time.perf_counter()
+        self.scene.apply_hierarchical_layout()
+        elapsed = time.perf_counter() - start
+        self.fit_view_to_scene()
+        self.statusBar().showMessage(f"Diseño jerárquico aplicado a {len(self.scene.node_items)} nodos en {elapsed:.2f} s")
+
+    def show_path_result(self, source: int, target: int, result):
+        """Muestra en la barra de estado el resultado de una búsqueda de camino"""
+        if result is None:
+            self.statusBar().showMessage(f"Camino: el nodo {target} no es alcanzable desde {source}")
+            return
+        dist, path = result
+        self.statusBar().showMessage(f"Camino más corto {source} → {target}: {' → '.join(map(str, path))} "
+                                     f"(distancia = {dist:g}, {len(path) - 1} aristas)")
+
     def show_matrix_tab(self):
         """Cambia a la pestaña de matriz de adyacencia"""
         self.tabs.setCurrentIndex(1)
@@ -431,8 +840,9 @@ class MainWindow(QMainWindow):
     
     def toggle_edge_weights_visibility(self, visible: bool):
         """Muestra u oculta los pesos de todas las aristas"""
-        for edge in self.scene.edge_items:
+        for edge in chain(self.scene.edge_items, self.scene.meta_edges.values()):
             edge.set_text_visibility(visible)
+        if self.scene.edge_layer is not None: self.scene.edge_layer.update()
 
     def wheelEvent(self, event):
         """Maneja zoom con Ctrl+rueda del mouse"""
@@ -4,7 +4,7 @@ Widget de visualización de matriz de adyacencia
 import math
 import json
 import statistics
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from collections import Counter
 
 from PyQt5.QtCore import Qt
@@ -23,6 +23,7 @@ from PyQt5.QtWidgets import (
 )
 
 from utils import show_warning, show_info, _mix_color
+from profiling import profiled
 
 
 # -----------------------
@@ -76,21 +77,28 @@ class MatrixWidget(QWidget):
         self.chk_labels.stateChanged.connect(self.refresh_matrix)
         self.chk_heatmap.stateChanged.connect(self.refresh_matrix)
         self.table.cellDoubleClicked.connect(self.copy_cell_to_clipboard)
-        scene.graph_changed.connect(self.refresh_matrix)  # Actualizar cuando el grafo cambie
+        scene.graph_changed.connect(self._on_graph_changed)  # Actualizar cuando el grafo cambie
+        scene.filter_changed.connect(self._on_graph_changed)  # Con filtro se muestra solo la submatriz
+        self._stale = False  # El grafo cambió mientras la pestaña estaba oculta
 
         self.refresh_matrix()
 
+    def _on_graph_changed(self):
+        """Regenera la tabla solo si está visible; si no, la marca para hacerlo al mostrarla"""
+        if self.isVisible(): self.refresh_matrix()
+        else: self._stale = True
+
+    def showEvent(self, event):
+        """Pone al día la tabla si el grafo cambió mientras estaba oculta"""
+        super().showEvent(event)
+        if self._stale: self.refresh_matrix()
+
     def _make_header_labels(self, nodes: List[int]) -> List[str]:
         """Genera las etiquetas para los encabezados de filas/columnas"""
         if not self.chk_labels.isChecked(): return [str(x) for x in nodes]
         # Formato "id:etiqueta" si está activada la opción
         return [f"{n}:{self.scene.node_items.get(n).label}" if n in self.scene.node_items else str(n) for n in nodes]
 
-    def _parse_weight(self, w: str) -> float:
-        """Convierte un peso de texto a número flotante"""
-        try: return float(str(w).strip().replace(",", "."))
-        except (ValueError, TypeError): return 1.0  # Peso por defecto si falla la conversión
-
     def _update_legend(self, vmin: float, vmax: float, color_low: QColor, color_high: QColor):
         """Actualiza la leyenda visual del gradiente de colores del heatmap"""
         width, height = 240, 18
@@ -105,10 +113,10 @@ class MatrixWidget(QWidget):
         self.legend_pix_label.setIcon(QIcon(pix)); self.legend_pix_label.setIconSize(pix.size())
         self.legend_label_widget.setText(f"Rango de pesos: {vmin:.2f} → {vmax:.2f}")
 
-    def _calculate_statistics(self, mat: List[List[str]]) -> Dict[str, float]:
+    def _calculate_statistics(self, values: Dict[Tuple[int, int], float]) -> Dict[str, float]:
         """Calcula estadísticas (media, mediana, moda) de los pesos de las aristas"""
-        # Extraer todos los pesos no cero
-        weights = [self._parse_weight(mat[i][j]) for i in range(len(mat)) for j in range(len(mat)) if mat[i][j] != "0"]
+        # Pesos numéricos ya calculados por la escena (sin celdas en cero)
+        weights = list(values.values())
         if not weights: return {"mean": 0, "median": 0, "mode": 0, "count": 0}
         try:
             counter = Counter(weights)
@@ -124,14 +132,19 @@ class MatrixWidget(QWidget):
                                       f"Mediana = {stats['median']}, Moda = {stats['mode']}, "
                                       f"Total aristas = {stats['count']}")
     
+    @profiled("matrix.refresh")
     def refresh_matrix(self):
         """Regenera y actualiza la visualización de la matriz de adyacencia"""
+        self._stale = False
         # Obtener matriz desde la escena
         nodes, mat = self.scene.to_matrix()
+        values = self.scene.edge_values()
         n = len(nodes)
         
         # Actualizar estadísticas
-        self._update_statistics_display(self._calculate_statistics(mat))
+        self._update_statistics_display(self._calculate_statistics(values))
+        if self.scene.filter_result is not None:
+            self.stats_label.setText(f"{self.stats_label.text()}  |  🔍 Filtro activo: {n} de {len(self.scene.node_items)} nodos")
         
         # Configurar dimensiones de la tabla
         self.table.clear()
@@ -140,7 +153,7 @@ class MatrixWidget(QWidget):
         self.table.setHorizontalHeaderLabels(headers); self.table.setVerticalHeaderLabels(headers)
 
         # Calcular rango de valores para el heatmap
-        numeric_values = [self._parse_weight(mat[i][j]) for i in range(n) for j in range(n) if mat[i][j] != "0"]
+        numeric_values = list(values.values())
         vmin, vmax = (min(numeric_values), max(numeric_values)) if numeric_values else (0.0, 1.0)
         if math.isclose(vmin, vmax): vmax = vmin + 1.0  # Evitar división por cero
 
@@ -162,8 +175,8 @@ class MatrixWidget(QWidget):
                 item.setToolTip(f"Arista: ({lbl_i}) → ({lbl_j})\nPeso: {w}")
 
                 # Aplicar color de heatmap si está activado
-                if self.chk_heatmap.isChecked() and w != "0":
-                    val = self._parse_weight(w)
+                val = values.get((nodes[i], nodes[j])) if w != "0" else None
+                if self.chk_heatmap.isChecked() and val is not None:
                     t = (val - vmin) / (vmax - vmin) if vmax > vmin else 0.0  # Normalizar entre 0 y 1
                     bg = _mix_color(QColor(245, 245, 250), QColor(85, 65, 118), t)
                     item.setBackground(bg)
@@ -181,7 +194,7 @@ class MatrixWidget(QWidget):
         try:
             with open(fn, "w", encoding="utf-8-sig") as f:
                 # Escribir metadatos como comentario
-                stats = self._calculate_statistics(mat)
+                stats = self._calculate_statistics(self.scene.edge_values())
                 f.write(f"# Matriz de Adyacencia Dirigida (Nodos: {len(nodes)}, Aristas: {stats['count']})\n")
                 # Escribir encabezados
                 header_labels = self._make_header_labels(nodes)
@@ -0,0 +1,123 @@
+"""
+Grupos de nodos: detección de comunidades con networkx y aristas agregadas de los grupos contraídos
+"""
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+# Formas de combinar los pesos de las aristas que se funden en una arista agregada: nombre -> texto para la interfaz
+AGGREGATIONS = {"sum": "Suma", "mean": "Promedio"}
+
+# Tamaño mínimo por defecto de una comunidad para convertirla en grupo
+MIN_COMMUNITY_SIZE = 3
+
+EdgeKey = Tuple[int, int]
+
+
+def _louvain(U: nx.Graph, seed: Optional[int]) -> Iterable[Set[int]]:
+    # networkx < 2.8 no trae Louvain: se usa la propagación de etiquetas
+    louvain = getattr(nx.community, "louvain_communities", None)
+    return louvain(U, weight=None, seed=seed) if louvain is not None else _label_propagation(U, seed)
+
+
+def _label_propagation(U: nx.Graph, seed: Optional[int]) -> Iterable[Set[int]]:
+    return nx.community.asyn_lpa_communities(U, weight=None, seed=seed)
+
+
+def _greedy_modularity(U: nx.Graph, seed: Optional[int]) -> Iterable[Set[int]]:
+    return nx.community.greedy_modularity_communities(U)
+
+
+# Algoritmos de comunidades disponibles: nombre -> (texto para la interfaz, función(grafo no dirigido, semilla))
+COMMUNITY_METHODS = {
+    "louvain": ("Louvain", _louvain),
+    "label_propagation": ("Propagación de etiquetas (rápido)", _label_propagation),
+    "greedy_modularity": ("Modularidad voraz (lento en grafos grandes)", _greedy_modularity),
+}
+
+
+class NodeGroup:
+    """
+    Conjunto de nodos que se dibuja como un solo meta-nodo mientras está contraído
+    Los IDs de grupo son negativos para no confundirse con los de los nodos
+    """
+    __slots__ = ("id", "label", "members", "aggregation", "collapsed", "pos", "center")
+
+    def __init__(self, group_id: int, label: str, members: Iterable[int], aggregation: str = "sum",
+                 collapsed: bool = False, pos: Optional[Tuple[float, float]] = None):
+        self.id = group_id
+        self.label = label
+        self.members: Set[int] = set(members)
+        self.aggregation = aggregation if aggregation in AGGREGATIONS else "sum"
+        self.collapsed = collapsed
+        self.pos = pos  # Posición del meta-nodo (None: centro de los miembros)
+        self.center: Optional[Tuple[float, float]] = None  # Centro de los miembros al contraer
+
+    def to_data(self) -> dict:
+        """Formato de archivo del grupo"""
+        data = {"id": self.id, "label": self.label, "members": sorted(self.members),
+                "aggregation": self.aggregation, "collapsed": self.collapsed}
+        if self.pos is not None: data["x"], data["y"] = self.pos
+        return data
+
+
+def groups_from_data(raw: Optional[list], node_ids: Set[int]) -> List[NodeGroup]:
+    """
+    Valida los grupos de un archivo: descarta miembros inexistentes o repetidos en otro grupo
+    y grupos vacíos; los IDs se renumeran -1, -2, ...
+    """
+    groups: List[NodeGroup] = []
+    taken: Set[int] = set()
+    for g_data in raw or []:
+        members = {int(m) for m in g_data.get("members", [])} & (node_ids - taken)
+        if not members:
+            continue
+        taken |= members
+        pos = (float(g_data["x"]), float(g_data["y"])) if "x" in g_data and "y" in g_data else None
+        gid = -(len(groups) + 1)
+        groups.append(NodeGroup(gid, str(g_data.get("label", f"Grupo {-gid}")), members,
+                                g_data.get("aggregation", "sum"), bool(g_data.get("collapsed", False)), pos))
+    return groups
+
+
+def detect_communities(G: nx.DiGraph, method: str = "louvain", min_size: int = MIN_COMMUNITY_SIZE,
+                       seed: Optional[int] = None) -> List[Set[int]]:
+    """Comunidades del grafo (ignorando la dirección de las aristas) con al menos min_size nodos, de mayor a menor"""
+    if G.number_of_nodes() == 0:
+        return []
+    _, detect = COMMUNITY_METHODS[method]
+    communities = [set(c) for c in detect(G.to_undirected(as_view=True), seed) if len(c) >= min_size]
+    return sorted(communities, key=len, reverse=True)
+
+
+def aggregate_edges(G: nx.DiGraph, owner: Dict[int, int], groups: Dict[int, Iterable[int]],
+                    aggregation: Dict[int, str]) -> Dict[EdgeKey, Tuple[float, int]]:
+    """
+    Aristas agregadas de los grupos contraídos indicados
+    Cada arista real que toca a un miembro se asigna a (grupo o nodo, grupo o nodo) según owner
+    (nodo -> grupo contraído que lo contiene); las internas a un grupo se descartan
+    Retorna (extremo, extremo) -> (peso combinado, cantidad de aristas); los pesos se suman o
+    se promedian según la agregación del grupo de origen (o del destino si el origen es un nodo)
+    """
+    totals: Dict[EdgeKey, List[float]] = {}
+    seen: Set[EdgeKey] = set()
+    succ, pred = G.succ, G.pred
+    for members in groups.values():
+        for m in members:
+            incident = chain((((m, v), d) for v, d in succ[m].items()), (((u, m), d) for u, d in pred[m].items()))
+            for (a, b), data in incident:
+                if (a, b) in seen:
+                    continue
+                seen.add((a, b))
+                key = (owner.get(a, a), owner.get(b, b))
+                if key[0] == key[1]:
+                    continue
+                total = totals.setdefault(key, [0.0, 0])
+                total[0] += data.get("value", 0.0)
+                total[1] += 1
+    result = {}
+    for key, (value, count) in totals.items():
+        mode = aggregation.get(key[0] if key[0] < 0 else key[1], "sum")
+        result[key] = (value / count if mode == "mean" else value, count)
+    return result
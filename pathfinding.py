@@ -0,0 +1,127 @@
+"""
+Búsqueda de caminos más cortos sobre una copia numérica del grafo
+"""
+import heapq
+from array import array
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+
+from utils import parse_weight
+
+
+def edge_value(data: dict) -> float:
+    """Peso numérico de una arista: usa el valor en caché y solo convierte el texto si falta"""
+    value = data.get("value")
+    return value if value is not None else parse_weight(data.get("weight", "1"))
+
+
+# -----------------------
+# WeightedAdjacency
+# -----------------------
+class WeightedAdjacency:
+    """
+    Listas de adyacencia compactas (formato CSR) con los pesos numéricos de cada arista
+    Guarda aristas salientes y entrantes para la búsqueda bidireccional
+    """
+
+    def __init__(self, G: nx.DiGraph):
+        self.nodes: List[Hashable] = list(G.nodes())
+        self.index: Dict[Hashable, int] = {v: i for i, v in enumerate(self.nodes)}
+        n = len(self.nodes)
+        index = self.index
+
+        edges = [(index[a], index[b], edge_value(d)) for a, b, d in G.edges(data=True)]
+        self.has_negative = any(w < 0 for _, _, w in edges)
+        self.out_ptr, self.out_idx, self.out_w = self._build(n, edges, 0, 1)
+        self.in_ptr, self.in_idx, self.in_w = self._build(n, edges, 1, 0)
+
+    @staticmethod
+    def _build(n: int, edges: List[Tuple[int, int, float]], src: int, dst: int):
+        """Agrupa las aristas por nodo de origen (conteo + prefijos, O(n + m))"""
+        ptr = array("l", [0] * (n + 1))
+        for e in edges:
+            ptr[e[src] + 1] += 1
+        for i in range(n):
+            ptr[i + 1] += ptr[i]
+        fill = array("l", ptr[:-1]) if n else array("l")
+        idx = array("l", [0] * len(edges))
+        w = array("d", [0.0] * len(edges))
+        for e in edges:
+            k = fill[e[src]]
+            idx[k] = e[dst]
+            w[k] = e[2]
+            fill[e[src]] += 1
+        return ptr, idx, w
+
+
+def bidirectional_dijkstra(adj: WeightedAdjacency, source: Hashable, target: Hashable) -> Optional[Tuple[float, List[Hashable]]]:
+    """
+    Camino más corto con Dijkstra bidireccional (requiere pesos no negativos)
+    Retorna (distancia, lista de nodos) o None si el destino no es alcanzable
+    """
+    if source not in adj.index or target not in adj.index:
+        return None
+    s, t = adj.index[source], adj.index[target]
+    if s == t:
+        return 0.0, [source]
+
+    dist = ({s: 0.0}, {t: 0.0})
+    parent = ({s: -1}, {t: -1})
+    done = (set(), set())
+    heaps = ([(0.0, s)], [(0.0, t)])
+    graph = ((adj.out_ptr, adj.out_idx, adj.out_w), (adj.in_ptr, adj.in_idx, adj.in_w))
+    best, meet = float("inf"), -1
+
+    while heaps[0] and heaps[1]:
+        # Se detiene cuando ningún camino restante puede mejorar al mejor encontrado
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, v = heapq.heappop(heaps[side])
+        if v in done[side]:
+            continue
+        done[side].add(v)
+        ptr, idx, wts = graph[side]
+        my_dist, other_dist = dist[side], dist[1 - side]
+        for k in range(ptr[v], ptr[v + 1]):
+            u = idx[k]
+            nd = d + wts[k]
+            if nd < my_dist.get(u, float("inf")):
+                my_dist[u] = nd
+                parent[side][u] = v
+                heapq.heappush(heaps[side], (nd, u))
+            if u in other_dist and nd + other_dist[u] < best:
+                best, meet = nd + other_dist[u], u
+
+    if meet < 0:
+        return None
+    # Reconstruir: origen -> punto de encuentro -> destino
+    path = []
+    v = meet
+    while v != -1:
+        path.append(v)
+        v = parent[0][v]
+    path.reverse()
+    v = parent[1][meet]
+    while v != -1:
+        path.append(v)
+        v = parent[1][v]
+    return best, [adj.nodes[i] for i in path]
+
+
+def shortest_path(adj: WeightedAdjacency, G: nx.DiGraph, source: Hashable, target: Hashable) -> Optional[Tuple[float, List[Hashable]]]:
+    """
+    Camino más corto ponderado entre dos nodos
+    Con pesos negativos se usa Bellman-Ford de NetworkX (más lento pero correcto)
+    """
+    if not adj.has_negative:
+        return bidirectional_dijkstra(adj, source, target)
+    weight = lambda a, b, d: edge_value(d)
+    try:
+        path = nx.bellman_ford_path(G, source, target, weight=weight)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return None
+    except nx.NetworkXUnbounded:
+        raise ValueError("El grafo tiene un ciclo de peso negativo: no existe camino más corto.")
+    return sum(weight(a, b, G[a][b]) for a, b in zip(path, path[1:])), path
@@ -0,0 +1,199 @@
+"""
+Instrumentación opcional de rutas críticas (conteos, tiempos acumulados y p95)
+"""
+import csv
+import json
+import platform
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Deque, Dict, List, NamedTuple, Tuple
+
+# Cantidad de muestras recientes por operación usadas para calcular el p95
+SAMPLE_WINDOW = 256
+
+# Cantidad de operaciones recientes recordadas para listar las más lentas
+RECENT_OPERATIONS = 200
+
+# Cantidad de cuadros guardados en el buffer circular de telemetría
+FRAME_CAPACITY = 1000
+
+_NULL_CONTEXT = nullcontext()
+
+
+# -----------------------
+# OperationStats
+# -----------------------
+class OperationStats:
+    """Estadísticas acumuladas de una operación instrumentada"""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float):
+        """Agrega una medición"""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def p95(self) -> float:
+        """Percentil 95 de las muestras recientes"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+# -----------------------
+# Profiler
+# -----------------------
+class Profiler:
+    """
+    Registro global de tiempos y contadores
+    Desactivado por defecto: en ese estado cada punto instrumentado solo revisa una bandera
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.stats: Dict[str, OperationStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.recent: Deque[Tuple[float, str, float]] = deque(maxlen=RECENT_OPERATIONS)  # (instante, nombre, segundos)
+
+    def set_enabled(self, enabled: bool):
+        """Activa o desactiva la instrumentación"""
+        self.enabled = enabled
+
+    def record(self, name: str, seconds: float):
+        """Registra la duración de una operación"""
+        st = self.stats.get(name)
+        if st is None:
+            st = self.stats[name] = OperationStats()
+        st.add(seconds)
+        self.recent.append((time.time(), name, seconds))
+
+    def count(self, name: str, amount: int = 1):
+        """Incrementa un contador (por ejemplo, elementos pintados)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def measure(self, name: str):
+        """Context manager que mide el bloque si la instrumentación está activa"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def slowest_recent(self, limit: int = 5) -> List[Tuple[str, float]]:
+        """Operaciones recientes más lentas como (nombre, segundos)"""
+        return [(name, sec) for _, name, sec in sorted(self.recent, key=lambda r: r[2], reverse=True)[:limit]]
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Resumen por operación: conteo, total, promedio, p95 y máximo (en segundos)"""
+        return {
+            name: {"count": st.count, "total": st.total, "mean": st.total / st.count if st.count else 0.0,
+                   "p95": st.p95(), "max": st.max}
+            for name, st in sorted(self.stats.items(), key=lambda kv: kv[1].total, reverse=True)
+        }
+
+    def reset(self):
+        """Descarta todas las mediciones"""
+        self.stats.clear()
+        self.counters.clear()
+        self.recent.clear()
+
+    def dump(self, path: str, extra: Dict = None):
+        """Guarda un informe JSON para adjuntar a reportes de errores"""
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "operations": self.snapshot(),
+            "counters": dict(self.counters),
+            "slowest_recent": [{"name": n, "seconds": s} for n, s in self.slowest_recent(20)],
+        }
+        if extra:
+            report.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+# Instancia global usada por toda la aplicación
+PROFILER = Profiler()
+
+
+# -----------------------
+# FrameTelemetry
+# -----------------------
+class FrameSample(NamedTuple):
+    """Medición de un cuadro pintado por la vista"""
+    timestamp: float  # Instante (time.time) al terminar el cuadro
+    frame_ms: float  # Duración total del paintEvent
+    background_ms: float  # Parte dedicada al fondo (cuadrícula o imagen)
+    nodes: int  # Llamadas a NodeItem.paint
+    edges: int  # Llamadas a EdgeItem.paint
+    exposed_px: int  # Área de la región expuesta en píxeles del viewport
+
+
+class FrameTelemetry:
+    """Buffer circular de tamaño fijo con las mediciones de los últimos cuadros"""
+
+    def __init__(self, capacity: int = FRAME_CAPACITY):
+        self.samples: Deque[FrameSample] = deque(maxlen=capacity)
+
+    def add(self, sample: FrameSample):
+        """Agrega un cuadro; el más antiguo se descarta cuando el buffer está lleno"""
+        self.samples.append(sample)
+
+    def clear(self):
+        """Descarta todos los cuadros"""
+        self.samples.clear()
+
+    def last(self) -> FrameSample:
+        """Último cuadro medido (o uno vacío)"""
+        return self.samples[-1] if self.samples else FrameSample(0.0, 0.0, 0.0, 0, 0, 0)
+
+    def p95_frame_ms(self) -> float:
+        """Percentil 95 de la duración de cuadro"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(s.frame_ms for s in self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def to_csv(self, path: str):
+        """Exporta los cuadros a CSV (una fila por cuadro)"""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(FrameSample._fields)
+            for s in self.samples:
+                writer.writerow([f"{s.timestamp:.6f}", f"{s.frame_ms:.3f}", f"{s.background_ms:.3f}", s.nodes, s.edges, s.exposed_px])
+
+
+def profiled(name: str) -> Callable:
+    """Decorador que mide la función con PROFILER cuando está activo"""
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
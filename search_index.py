@@ -0,0 +1,244 @@
+"""
+Índice de búsqueda sobre etiquetas e IDs de nodos (trie de prefijos + n-gramas) y pesos de aristas
+"""
+import re
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Largo máximo de los n-gramas indexados (consultas más largas se filtran por sus trigramas)
+NGRAM_SIZE = 3
+
+# Cantidad máxima de resultados que se devuelven por consulta
+MAX_SEARCH_RESULTS = 200
+
+EdgeKey = Tuple[int, int]
+
+# Consultas de peso: w>5, w>=5, w<5, w<=5, w=5, w:5..10 (también "peso" en lugar de "w")
+_WEIGHT_QUERY = re.compile(
+    r"^\s*(?:w|peso)\s*(?:(?P<op>>=|<=|>|<|=)\s*(?P<value>[-+]?[\d.]+(?:e[-+]?\d+)?)"
+    r"|:\s*(?P<lo>[-+]?[\d.]+(?:e[-+]?\d+)?)\s*\.\.\s*(?P<hi>[-+]?[\d.]+(?:e[-+]?\d+)?))\s*$",
+    re.IGNORECASE,
+)
+
+
+class SearchResult(NamedTuple):
+    """
+    Resultado de una consulta: nodos o aristas coincidentes (hasta el límite) y total encontrado
+    Con estimated el total es una cota superior (no se verificaron todos los candidatos)
+    """
+    nodes: List[int]
+    edges: List[EdgeKey]
+    total: int
+    estimated: bool = False
+
+
+class _TrieNode:
+    """Nodo del trie: hijos por carácter e IDs de todos los nodos cuyo texto pasa por aquí"""
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+def parse_weight_query(text: str) -> Optional[Tuple[float, float, bool, bool]]:
+    """Interpreta una consulta de peso; retorna (mínimo, máximo, incluye_mínimo, incluye_máximo) o None"""
+    match = _WEIGHT_QUERY.match(text)
+    if match is None:
+        return None
+    try:
+        if match.group("op"):
+            value, op = float(match.group("value")), match.group("op")
+            inf = float("inf")
+            return {
+                ">": (value, inf, False, True), ">=": (value, inf, True, True),
+                "<": (-inf, value, True, False), "<=": (-inf, value, True, True),
+                "=": (value, value, True, True),
+            }[op]
+        lo, hi = float(match.group("lo")), float(match.group("hi"))
+    except ValueError:
+        return None
+    return min(lo, hi), max(lo, hi), True, True
+
+
+# -----------------------
+# SearchIndex
+# -----------------------
+class SearchIndex:
+    """
+    Índice incremental para buscar mientras se escribe
+    - Nodos: cada nodo se indexa por su etiqueta y su ID (en minúsculas) en un trie de prefijos,
+      donde cada nodo del trie guarda los IDs que pasan por él, y en un índice de n-gramas
+      (largo 1 a NGRAM_SIZE) para coincidencias en cualquier parte del texto
+    - Aristas: valor numérico del peso; la lista ordenada para rangos (bisect) se construye
+      en la primera consulta y desde entonces se mantiene con cada cambio
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Vacía el índice"""
+        self._root = _TrieNode()
+        self._grams: Dict[str, Set[int]] = {}
+        self._keys: Dict[int, Tuple[str, ...]] = {}  # ID -> textos indexados (etiqueta, ID)
+        self._exact: Dict[str, Set[int]] = {}
+        self._weights: Dict[EdgeKey, float] = {}
+        self._sorted_weights: Optional[List[Tuple[float, EdgeKey]]] = None
+
+    # -----------------------
+    # Nodos
+    # -----------------------
+    @staticmethod
+    def _texts(node_id: int, label: str) -> Tuple[str, ...]:
+        label = str(label).lower()
+        return (label, str(node_id)) if label != str(node_id) else (label,)
+
+    @staticmethod
+    def _ngrams(texts: Iterable[str]) -> Set[str]:
+        return {text[i:i + n] for text in texts for n in range(1, NGRAM_SIZE + 1) for i in range(len(text) - n + 1)}
+
+    def add_node(self, node_id: int, label: str):
+        """Indexa un nodo (reemplaza su entrada si ya existía)"""
+        if node_id in self._keys:
+            self.remove_node(node_id)
+        texts = self._texts(node_id, label)
+        self._keys[node_id] = texts
+        for text in texts:
+            self._exact.setdefault(text, set()).add(node_id)
+            trie = self._root
+            for ch in text:
+                trie = trie.children.setdefault(ch, _TrieNode())
+                trie.ids.add(node_id)
+        for gram in self._ngrams(texts):
+            self._grams.setdefault(gram, set()).add(node_id)
+
+    def remove_node(self, node_id: int):
+        """Quita un nodo del índice"""
+        texts = self._keys.pop(node_id, None)
+        if texts is None:
+            return
+        for text in texts:
+            ids = self._exact.get(text)
+            if ids is not None:
+                ids.discard(node_id)
+                if not ids: del self._exact[text]
+            # Recorrer el camino del trie y podar las ramas que quedan vacías
+            path = [self._root]
+            for ch in text:
+                child = path[-1].children.get(ch)
+                if child is None: break
+                child.ids.discard(node_id)
+                path.append(child)
+            for parent, ch, child in zip(reversed(path[:-1]), reversed(text[:len(path) - 1]), reversed(path[1:])):
+                if not child.ids and not child.children: del parent.children[ch]
+        for gram in self._ngrams(texts):
+            ids = self._grams.get(gram)
+            if ids is not None:
+                ids.discard(node_id)
+                if not ids: del self._grams[gram]
+
+    def set_label(self, node_id: int, label: str):
+        """Actualiza la etiqueta indexada de un nodo"""
+        self.add_node(node_id, label)
+
+    def _prefix_ids(self, text: str) -> Set[int]:
+        trie = self._root
+        for ch in text:
+            trie = trie.children.get(ch)
+            if trie is None: return set()
+        return trie.ids
+
+    def _substring_ids(self, text: str) -> Tuple[Iterable[int], int, bool]:
+        """
+        IDs cuyo texto contiene la consulta, con su total y si el total es exacto
+        Directo si es un n-grama indexado; si no, se recorre el trigrama menos frecuente y cada candidato
+        se comprueba contra los demás trigramas y su texto recién al iterarlo (el total es una cota superior)
+        """
+        if len(text) <= NGRAM_SIZE:
+            ids = self._grams.get(text, set())
+            return ids, len(ids), True
+        grams = sorted((self._grams.get(text[i:i + NGRAM_SIZE], set()) for i in range(len(text) - NGRAM_SIZE + 1)), key=len)
+        rarest, others = grams[0], grams[1:]
+        matches = (nid for nid in rarest
+                   if all(nid in ids for ids in others) and any(text in key for key in self._keys[nid]))
+        return matches, len(rarest), False
+
+    def match_nodes(self, text: str) -> Set[int]:
+        """Todos los nodos cuya etiqueta o ID contiene el texto (copia, sin límite ni orden)"""
+        text = text.strip().lower()
+        return set(self._substring_ids(text)[0]) if text else set()
+
+    def search_nodes(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> Tuple[List[int], int, bool]:
+        """
+        Nodos cuya etiqueta o ID contiene el texto (sin distinguir mayúsculas)
+        Orden: coincidencia exacta, luego prefijo, luego en cualquier parte; retorna (IDs, total, total exacto)
+        Los candidatos se verifican solo hasta completar limit: si quedan sin verificar, el total es una cota superior
+        """
+        text = text.strip().lower()
+        if not text:
+            return [], 0, True
+        matches, total, exact = self._substring_ids(text)
+        result: List[int] = []
+        seen: Set[int] = set()
+        for group in (self._exact.get(text, ()), self._prefix_ids(text)):
+            for nid in islice((n for n in group if n not in seen), limit - len(result)):
+                result.append(nid); seen.add(nid)
+        verified, exhausted = 0, True
+        for nid in matches:
+            verified += 1
+            if nid in seen:
+                continue
+            if len(result) >= limit:
+                exhausted = False
+                break
+            result.append(nid); seen.add(nid)
+        if not exact and exhausted:
+            total, exact = verified, True
+        return result, total, exact
+
+    # -----------------------
+    # Aristas
+    # -----------------------
+    def set_edge_weight(self, key: EdgeKey, value: float):
+        """Indexa (o actualiza) el peso numérico de una arista"""
+        if key in self._weights:
+            self.remove_edge(key)
+        self._weights[key] = value
+        if self._sorted_weights is not None:
+            insort(self._sorted_weights, (value, key))
+
+    def remove_edge(self, key: EdgeKey):
+        """Quita una arista del índice de pesos"""
+        value = self._weights.pop(key, None)
+        if value is None or self._sorted_weights is None:
+            return
+        i = bisect_left(self._sorted_weights, (value, key))
+        if i < len(self._sorted_weights) and self._sorted_weights[i] == (value, key):
+            del self._sorted_weights[i]
+
+    def search_edges(self, lo: float, hi: float, include_lo: bool = True, include_hi: bool = True,
+                     limit: Optional[int] = MAX_SEARCH_RESULTS) -> Tuple[List[EdgeKey], int]:
+        """Aristas con peso en el rango indicado, ordenadas por peso (limit=None: todas); retorna (claves, total)"""
+        if self._sorted_weights is None:
+            self._sorted_weights = sorted((v, k) for k, v in self._weights.items())
+        weights = self._sorted_weights
+        # Las claves (a, b) acotan las tuplas: (v, (-inf,)) va antes y (v, (inf,)) después de todo peso v
+        start = (bisect_left if include_lo else bisect_right)(weights, (lo, (float("-inf"),) if include_lo else (float("inf"),)))
+        end = (bisect_right if include_hi else bisect_left)(weights, (hi, (float("inf"),) if include_hi else (float("-inf"),)))
+        end = max(start, end)
+        stop = end if limit is None else min(end, start + limit)
+        return [key for _, key in weights[start:stop]], end - start
+
+    # -----------------------
+    # Consultas
+    # -----------------------
+    def query(self, text: str, limit: int = MAX_SEARCH_RESULTS) -> SearchResult:
+        """Consulta del buscador: rango de pesos (w>5, w:1..10) o texto de etiqueta/ID"""
+        weight_range = parse_weight_query(text)
+        if weight_range is not None:
+            edges, total = self.search_edges(*weight_range, limit=limit)
+            return SearchResult([], edges, total)
+        nodes, total, exact = self.search_nodes(text, limit)
+        return SearchResult(nodes, [], total, not exact)
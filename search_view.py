@@ -0,0 +1,179 @@
+"""
+Barra de búsqueda de nodos (etiqueta o ID) y aristas (rango de peso) con resultados mientras se escribe
+"""
+from typing import List
+
+from PyQt5.QtCore import Qt, QModelIndex, QStringListModel, QTimer
+from PyQt5.QtWidgets import (
+    QWidget,
+    QHBoxLayout,
+    QLineEdit,
+    QLabel,
+    QToolButton,
+    QCompleter,
+    QApplication,
+)
+
+# Cantidad de resultados que se listan en la ventana de sugerencias
+MAX_SUGGESTIONS = 20
+
+# Pausa al escribir antes de consultar el índice (una búsqueda por ráfaga de teclas)
+TYPING_DELAY_MS = 150
+
+
+# -----------------------
+# SearchBar
+# -----------------------
+class SearchBar(QWidget):
+    """
+    Campo de búsqueda sobre el índice de la escena
+    Al escribir se marcan los resultados y se centra la vista en el primero;
+    Enter / flechas recorren los resultados seleccionando cada uno
+    """
+
+    def __init__(self, scene, view, parent=None):
+        super().__init__(parent)
+        self.scene = scene  # Escena con el índice de búsqueda
+        self.view = view  # Vista que se centra en los resultados
+        self.matches: List = []  # NodeItem y EdgeItem marcados, en orden de relevancia
+        self.current = -1  # Resultado seleccionado
+        self.total = 0  # Coincidencias en el índice (puede superar a las marcadas)
+        self.total_estimated = False  # El total es una cota superior (ver SearchResult.estimated)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 0, 4, 0)
+        self.line_edit = QLineEdit()
+        self.line_edit.setPlaceholderText("Buscar nodo (etiqueta o ID) o peso: w>5, w<=3, w:1..10")
+        self.line_edit.setClearButtonEnabled(True)
+        self.line_edit.setMinimumWidth(320)
+        self.count_label = QLabel()
+        self.count_label.setMinimumWidth(90)
+        self.prev_button = QToolButton(); self.prev_button.setArrowType(Qt.UpArrow); self.prev_button.setToolTip("Resultado anterior (Shift+Enter)")
+        self.next_button = QToolButton(); self.next_button.setArrowType(Qt.DownArrow); self.next_button.setToolTip("Resultado siguiente (Enter)")
+        layout.addWidget(self.line_edit); layout.addWidget(self.count_label)
+        layout.addWidget(self.prev_button); layout.addWidget(self.next_button)
+
+        # Sugerencias: se muestran tal cual (el filtrado lo hace el índice, no el completer)
+        self.suggestions = QStringListModel(self)
+        self.completer = QCompleter(self.suggestions, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setWidget(self.line_edit)
+        self.completer.activated[QModelIndex].connect(lambda index: self.go_to(index.row()))
+
+        # Repetir la búsqueda (sin mover la vista) cuando cambia el grafo
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(lambda: self.run_search(center=False))
+
+        # Buscar al dejar de escribir, no en cada tecla
+        self._typing_timer = QTimer(self)
+        self._typing_timer.setSingleShot(True)
+        self._typing_timer.setInterval(TYPING_DELAY_MS)
+        self._typing_timer.timeout.connect(self.run_search)
+
+        self.line_edit.textEdited.connect(lambda _: self._typing_timer.start())
+        self.line_edit.textChanged.connect(lambda text: self.clear() if not text else None)
+        self.line_edit.returnPressed.connect(self._on_return)
+        self.prev_button.clicked.connect(self.previous_match)
+        self.next_button.clicked.connect(self.next_match)
+        scene.graph_changed.connect(self._schedule_refresh)
+        self._update_count()
+
+    def focus_search(self):
+        """Lleva el foco al campo de búsqueda con el texto seleccionado"""
+        self.line_edit.setFocus(Qt.ShortcutFocusReason)
+        self.line_edit.selectAll()
+
+    def keyPressEvent(self, event):
+        """Escape limpia la búsqueda y devuelve el foco al lienzo"""
+        if event.key() == Qt.Key_Escape:
+            self.line_edit.clear()
+            self.view.setFocus()
+        else:
+            super().keyPressEvent(event)
+
+    def _on_return(self):
+        """Enter va al resultado siguiente; Shift+Enter al anterior"""
+        if self._typing_timer.isActive():
+            self._typing_timer.stop()
+            self.run_search()
+        if QApplication.keyboardModifiers() & Qt.ShiftModifier: self.previous_match()
+        else: self.next_match()
+
+    def _schedule_refresh(self):
+        """Programa repetir la búsqueda si hay una activa"""
+        if self.line_edit.text().strip():
+            self._refresh_timer.start()
+
+    def run_search(self, center: bool = True):
+        """Consulta el índice, marca los resultados y actualiza las sugerencias"""
+        self._typing_timer.stop()
+        text = self.line_edit.text()
+        if not text.strip():
+            self.clear()
+            return
+        result = self.scene.search(text)
+        nodes, edges = self.scene.highlight_search(result)
+        self.matches = nodes + edges
+        self.current, self.total, self.total_estimated = -1, result.total, result.estimated
+        self._update_count()
+        self.suggestions.setStringList([self._describe(item) for item in self.matches[:MAX_SUGGESTIONS]])
+        if center and self.matches:
+            self.view.centerOn(self._center_of(self.matches[0]))
+            if self.line_edit.hasFocus(): self.completer.complete()
+
+    def clear(self):
+        """Quita los resultados y la marca de la escena"""
+        self.scene.clear_search_highlight()
+        self._typing_timer.stop()
+        self.matches, self.current, self.total, self.total_estimated = [], -1, 0, False
+        self.suggestions.setStringList([])
+        self._update_count()
+
+    def go_to(self, index: int):
+        """Centra la vista en un resultado y lo selecciona"""
+        if not self.matches:
+            return
+        self.current = index % len(self.matches)
+        item = self.matches[self.current]
+        # Un resultado dentro de un grupo contraído no está en la escena: se expande su grupo
+        self.scene.expand_groups_of([item.id] if hasattr(item, "label") else [item.source.id, item.dest.id])
+        self.scene.clearSelection()
+        item.setSelected(True)
+        self.view.centerOn(self._center_of(item))
+        self._update_count()
+
+    def next_match(self):
+        """Va al resultado siguiente"""
+        self.go_to(self.current + 1)
+
+    def previous_match(self):
+        """Va al resultado anterior"""
+        self.go_to(self.current - 1)
+
+    def _update_count(self):
+        """Muestra la posición actual y el total de coincidencias"""
+        total = f"~{self.total}" if self.total_estimated else self.total
+        if not self.line_edit.text().strip():
+            self.count_label.setText("")
+        elif not self.total:
+            self.count_label.setText("Sin resultados")
+        elif self.current >= 0:
+            self.count_label.setText(f"{self.current + 1} de {total}")
+        else:
+            self.count_label.setText(f"{total} resultado{'s' if self.total != 1 else ''}")
+
+    @staticmethod
+    def _describe(item) -> str:
+        """Texto de un resultado en la lista de sugerencias"""
+        if hasattr(item, "label"):
+            return f"{item.label}  (ID {item.id})"
+        return f"{item.source.label} → {item.dest.label}  (peso {item.weight})"
+
+    @staticmethod
+    def _center_of(item):
+        """Punto de la escena en el que centrar la vista para un nodo o arista"""
+        if hasattr(item, "label"):
+            return item.scenePos()
+        return (item.source.scenePos() + item.dest.scenePos()) / 2
@@ -1,10 +1,12 @@
 """
 Utilidades y constantes para Grafo Drawer
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
-from PyQt5.QtCore import QRectF
-from PyQt5.QtGui import QBrush, QFont, QRadialGradient, QColor, QIcon
+import numpy as np
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QBrush, QFont, QRadialGradient, QColor, QIcon, QPolygonF, QStaticText
 from PyQt5.QtWidgets import QMessageBox
 
 # -----------------------
@@ -34,6 +36,9 @@ ARROW_SIZE = 20
 MIN_ZOOM_LEVEL = 0.1  # 10%
 MAX_ZOOM_LEVEL = 10.0  # 1000%
 
+# Máximo de textos distintos (etiquetas y pesos) con diseño en caché
+LABEL_CACHE_SIZE = 50000
+
 # Directorio donde se encuentran los iconos SVG de la aplicación
 ICONS_DIR = Path(__file__).parent / "icons"
 
@@ -70,6 +75,18 @@ def make_radial_brush(radius: float, center_colors: Tuple[QColor, ...]) -> QBrus
     return QBrush(grad)
 
 
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def static_label(text: str, font: QFont) -> QStaticText:
+    """
+    Texto ya diseñado para dibujar etiquetas en paint() con drawStaticText
+    Se comparte por (texto, fuente): nodos y aristas con el mismo texto reutilizan diseño y medidas (size())
+    """
+    label = QStaticText(text)
+    label.setTextFormat(Qt.PlainText)
+    label.prepare(font=font)
+    return label
+
+
 def show_warning(title: str, text: str):
     """Muestra un cuadro de diálogo de advertencia."""
     QMessageBox.warning(None, title, text)
@@ -80,6 +97,29 @@ def show_info(title: str, text: str):
     QMessageBox.information(None, title, text)
 
 
+def parse_weight(w) -> float:
+    """
+    Convierte un peso de texto a número flotante (acepta coma decimal)
+    Si el texto no es numérico se usa 1.0 como peso por defecto
+    """
+    try: return float(str(w).strip().replace(",", "."))
+    except (ValueError, TypeError): return 1.0
+
+
+def array_to_polygon(points: np.ndarray) -> QPolygonF:
+    """
+    Copia un arreglo (k, 2) de NumPy directamente en la memoria de un QPolygonF
+    Evita crear un QPointF por punto (asume qreal = double, como en las compilaciones de escritorio)
+    """
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    poly = QPolygonF(len(points))
+    if len(points):
+        ptr = poly.data()
+        ptr.setsize(points.size * 8)
+        np.frombuffer(ptr, dtype=np.float64).reshape(points.shape)[:] = points
+    return poly
+
+
 def _mix_color(c1: QColor, c2: QColor, t: float) -> QColor:
     """
     Interpola dos colores según el parámetro t (0.0 a 1.0)